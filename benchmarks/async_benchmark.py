@@ -0,0 +1,132 @@
+"""Per-turn latency of the sync and async orchestrators against a fake LLM
+
+Plays the same turns (always the first action, restarting at the end of a
+path) through GameOrchestrator without and with its thread-pool prefetcher
+and through AsyncGameOrchestrator, all backed by StubLLMClient with the
+given completion delay and a retriever that sleeps for the given retrieval
+delay. A turn is the player's action plus moving to the next scene, and
+each mode prints the mean and p50/p99 of its turn times. Action choices are
+cached in memory per mode, so revisited scenes skip action generation.
+
+Usage:
+    python -m benchmarks.async_benchmark
+    python -m benchmarks.async_benchmark --delay 0.5 --retrieval-delay 0.05 --turns 40
+"""
+import sys
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List, Optional
+
+from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.async_agent import AsyncLLMCharacterAgent
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.orchestrator.async_orchestrator import AsyncGameOrchestrator
+from rpg_game.orchestrator.scene_graph import load_scene_graph
+from rpg_game.telemetry.telemetry import percentile
+
+MODES = ("sync", "sync_prefetch", "async")
+
+
+class SleepingRetriever:
+    """Retriever that returns nothing after a fixed delay, standing in for a vector search"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def retrieve(self, query: str, top_k: int = 3, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        time.sleep(self.delay)
+        return []
+
+
+def play_sync(game: GameOrchestrator, turns: int) -> List[float]:
+    """Play turns through a sync orchestrator, returning each turn's seconds"""
+    game.start_game("Benchmark")
+    durations = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        result = game.process_player_action(0)
+        if result.get("has_next_scene"):
+            game.advance_to_next_scene()
+        else:
+            game.start_game("Benchmark")
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def play_async(game: AsyncGameOrchestrator, turns: int) -> List[float]:
+    """Play turns through an async orchestrator, returning each turn's seconds"""
+    await game.start_game("Benchmark")
+    durations = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        result = await game.process_player_action(0)
+        if result.get("has_next_scene"):
+            await game.advance_to_next_scene()
+        else:
+            await game.start_game("Benchmark")
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def run_mode(mode: str, delay: float, retrieval_delay: float, turns: int,
+             game_data_path: str) -> Dict[str, Any]:
+    """Play one mode and summarize its turn times
+
+    Args:
+        mode: "sync", "sync_prefetch" or "async"
+        delay: Stub LLM seconds per completion
+        retrieval_delay: Seconds per retrieval
+        turns: Turns to play
+        game_data_path: Game data to play
+
+    Returns:
+        Mean, p50 and p99 turn seconds
+    """
+    game_data = load_scene_graph(game_data_path)
+    retriever = SleepingRetriever(retrieval_delay)
+    if mode == "async":
+        agent = AsyncLLMCharacterAgent(api_key="benchmark", completion_cache=CompletionCache(path=None),
+                                       client=StubLLMClient(latency=delay, token_latency=0, asynchronous=True))
+        game = AsyncGameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                                     speculative_prefetch=True)
+        durations = asyncio.run(play_async(game, turns))
+    else:
+        agent = LLMCharacterAgent(api_key="benchmark", completion_cache=CompletionCache(path=None),
+                                  client=StubLLMClient(latency=delay, token_latency=0))
+        game = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                                speculative_prefetch=mode == "sync_prefetch")
+        durations = play_sync(game, turns)
+        if game.prefetcher is not None:
+            game.prefetcher.shutdown()
+    return {
+        "mode": mode,
+        "mean": sum(durations) / len(durations),
+        "p50": percentile(durations, 50),
+        "p99": percentile(durations, 99)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Compare per-turn latency of the sync and async orchestrators")
+    parser.add_argument("--delay", type=float, default=0.2, help="Fake LLM seconds per completion")
+    parser.add_argument("--retrieval-delay", type=float, default=0.02, help="Seconds per retrieval")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--game-data", default="./data/game_data.json")
+    args = parser.parse_args(argv)
+
+    print(f"{args.turns} turns, {args.delay * 1000:.0f} ms per completion, "
+          f"{args.retrieval_delay * 1000:.0f} ms per retrieval")
+    print(f"{'mode':>13} {'mean_s':>8} {'p50_s':>8} {'p99_s':>8}")
+    for mode in args.modes:
+        point = run_mode(mode, args.delay, args.retrieval_delay, args.turns, args.game_data)
+        print(f"{point['mode']:>13} {point['mean']:>8.3f} {point['p50']:>8.3f} {point['p99']:>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Query latency and memory of the numpy and chroma retriever backends
+
+Each backend runs in its own child process, so its peak RSS covers only
+its own imports, model and index. A child builds the backend over the
+historical data plus synthetic filler documents, runs every scene query
+(with its tags) repeatedly and reports startup time, p50/p99 query latency
+and peak RSS. A backend whose dependencies are missing is reported as
+unavailable.
+
+Usage:
+    python -m benchmarks.backend_benchmark
+    python -m benchmarks.backend_benchmark --backends numpy --documents 20000
+    python -m benchmarks.backend_benchmark --backends numpy --encoder synthetic   # no sentence-transformers
+"""
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional
+
+from rpg_game.config import RAG_TOP_K
+from rpg_game.telemetry.telemetry import percentile
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def measure_backend(backend: str, documents: int, queries: int, game_data_path: str,
+                    encoder: str = "model") -> Dict[str, Any]:
+    """Build one backend in this process and time its scene queries
+
+    Args:
+        backend: "numpy" or "chroma"
+        documents: Filler documents added to the historical data
+        queries: Scene queries run in total
+        game_data_path: Game data whose scene queries are run
+        encoder: "model" or "synthetic" (numpy backend only)
+
+    Returns:
+        Startup seconds, latency percentiles and peak RSS
+    """
+    from rpg_game.rag.factory import create_retriever
+    from benchmarks.filter_benchmark import filler_documents, scene_queries
+
+    scenes = scene_queries(game_data_path)
+    with tempfile.TemporaryDirectory(prefix="backend_benchmark_") as index_path:
+        start = time.perf_counter()
+        if backend == "numpy":
+            kwargs: Dict[str, Any] = {}
+            if encoder == "synthetic":
+                from benchmarks.batch_benchmark import SyntheticEncoder
+                kwargs.update(encoder=SyntheticEncoder(), embedding_model="synthetic", embedding_cache_dir=None)
+            retriever = create_retriever(backend, coalesce=False, index_path=index_path, batch_window=0, **kwargs)
+        else:
+            retriever = create_retriever(backend, coalesce=False, vector_db_path=index_path)
+        if documents:
+            retriever.add_documents(filler_documents(documents), source="backend_benchmark")
+        startup = time.perf_counter() - start
+
+        latencies = []
+        for i in range(queries):
+            scene = scenes[i % len(scenes)]
+            start = time.perf_counter()
+            retriever.retrieve(f"{scene['query']} ({i})", top_k=RAG_TOP_K, filter_tags=scene["filter_tags"])
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "startup_seconds": startup,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+
+def run_child(backend: str, documents: int, queries: int, game_data_path: str,
+              encoder: str = "model") -> Optional[Dict[str, Any]]:
+    """Measure a backend in a fresh interpreter (None if it fails, e.g. missing dependencies)"""
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.backend_benchmark", "--child", backend, "--encoder", encoder,
+         "--documents", str(documents), "--queries", str(queries), "--game-data", game_data_path],
+        capture_output=True, text=True
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        print(f"{backend} backend unavailable: {(completed.stderr.strip().splitlines() or ['no output'])[-1]}")
+        return None
+    return json.loads(lines[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Compare latency and memory of the retriever backends")
+    parser.add_argument("--backends", nargs="+", choices=("numpy", "chroma"), default=["numpy", "chroma"])
+    parser.add_argument("--documents", type=int, default=2000, help="Filler documents added to the corpus")
+    parser.add_argument("--queries", type=int, default=200, help="Scene queries run per backend")
+    parser.add_argument("--encoder", choices=("model", "synthetic"), default="model",
+                        help="Embedding model of the numpy backend")
+    parser.add_argument("--game-data", default="./data/game_data.json")
+    parser.add_argument("--child", choices=("numpy", "chroma"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_backend(args.child, args.documents, args.queries, args.game_data, args.encoder)))
+        return 0
+
+    results = [result for result in (run_child(backend, args.documents, args.queries, args.game_data, args.encoder)
+                                     for backend in args.backends) if result is not None]
+    print(f"{'backend':>8} {'startup_s':>9} {'p50_ms':>8} {'p99_ms':>8} {'peak_rss_mb':>11}")
+    for result in results:
+        print(f"{result['backend']:>8} {result['startup_seconds']:>9.2f} {result['p50_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['peak_rss_mb']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Throughput versus latency of micro-batched retrieval
+
+Runs closed-loop retrieval load (each thread issues its next query as soon
+as the last returns) against a NumpyRetriever for every combination of
+batch window and concurrency, and prints one row per point of the curve:
+queries per second, mean batch size and latency percentiles. Every query
+is distinct, so the embedding cache never short-circuits the model.
+
+Usage:
+    python -m benchmarks.batch_benchmark
+    python -m benchmarks.batch_benchmark --windows 0 0.002 0.005 0.01 --concurrency 1 16 64
+    python -m benchmarks.batch_benchmark --encoder synthetic   # no sentence-transformers needed
+"""
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from rpg_game.config import EMBEDDING_MODEL, HISTORICAL_DATA_PATH, RAG_BATCH_MAX
+from rpg_game.concurrency.micro_batcher import MicroBatcher
+from rpg_game.rag.numpy_retriever import NumpyRetriever, SentenceEncoder
+from rpg_game.telemetry.telemetry import percentile
+
+
+class SyntheticEncoder:
+    """Encoder with the cost profile of a CPU transformer: fixed cost per call plus a smaller cost per text
+
+    A forward pass already uses every core, so calls run one at a time.
+    Vectors are derived from a hash of the text, so they are stable but
+    carry no meaning; use it to measure batching, not retrieval quality.
+    """
+
+    def __init__(self, dim: int = 384, call_seconds: float = 0.008, text_seconds: float = 0.0005):
+        self.dim = dim
+        self.call_seconds = call_seconds
+        self.text_seconds = text_seconds
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            time.sleep(self.call_seconds + self.text_seconds * len(texts))
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            vectors.append(np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _scene_queries(game_data_path: str) -> List[Dict[str, Any]]:
+    """rag_context_query and rag_filter_tags of every scene that retrieves"""
+    with open(game_data_path, 'r', encoding='utf-8') as f:
+        scenes = json.load(f)["scenes"]
+    return [{"query": scene["rag_context_query"], "filter_tags": scene.get("rag_filter_tags")}
+            for scene in scenes.values() if "rag_context_query" in scene]
+
+
+def build_retriever(encoder_name: str, documents: int, index_path: str) -> NumpyRetriever:
+    """NumpyRetriever over the historical data plus synthetic filler documents
+
+    Args:
+        encoder_name: "model" (sentence-transformers) or "synthetic"
+        documents: Filler documents added to the historical data
+        index_path: Directory for the throwaway index
+
+    Returns:
+        Retriever with an index but no on-disk embedding cache
+    """
+    if encoder_name == "synthetic":
+        encoder, model_name = SyntheticEncoder(), "synthetic"
+    else:
+        encoder, model_name = SentenceEncoder(EMBEDDING_MODEL), EMBEDDING_MODEL
+    retriever = NumpyRetriever(index_path=index_path, embedding_model=model_name, encoder=encoder,
+                               embedding_cache_dir=None)
+
+    with open(HISTORICAL_DATA_PATH, 'r', encoding='utf-8') as f:
+        tags = sorted({tag for doc in json.load(f) for tag in doc.get("tags", [])})
+    filler = [{"title": f"Chronicle {i}", "text": f"Entry {i} of the parish chronicle.",
+               "tags": [tags[i % len(tags)], tags[(i * 7) % len(tags)]]} for i in range(documents)]
+    if filler:
+        retriever.add_documents(filler, source="batch_benchmark")
+    return retriever
+
+
+def run_point(retriever: NumpyRetriever, scenes: List[Dict[str, Any]], window: float, max_batch: int,
+              concurrency: int, queries_per_thread: int) -> Dict[str, Any]:
+    """Measure one point of the curve
+
+    Args:
+        retriever: Retriever under test (its batcher is replaced)
+        scenes: Scene queries and tags to draw from
+        window: Batch window in seconds
+        max_batch: Largest batch
+        concurrency: Threads issuing queries
+        queries_per_thread: Queries each thread issues
+
+    Returns:
+        Throughput, mean batch size and latency percentiles
+    """
+    retriever.batcher = MicroBatcher(retriever.retrieve_many, max_batch=max_batch, window=window, name="rag")
+
+    def worker(thread: int) -> List[float]:
+        latencies = []
+        for i in range(queries_per_thread):
+            scene = scenes[(thread + i) % len(scenes)]
+            start = time.perf_counter()
+            retriever.retrieve(f"{scene['query']} ({window}, {concurrency}, {thread}, {i})",
+                               filter_tags=scene["filter_tags"])
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = [latency for thread_latencies in pool.map(worker, range(concurrency))
+                     for latency in thread_latencies]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "window_ms": window * 1000,
+        "concurrency": concurrency,
+        "queries_per_second": len(latencies) / elapsed,
+        "mean_batch": retriever.batcher.stats()["mean_batch_size"],
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark throughput versus latency of batched retrieval")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0.0, 0.001, 0.002, 0.005, 0.01],
+                        help="Batch windows in seconds (0 disables batching)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--max-batch", type=int, default=RAG_BATCH_MAX)
+    parser.add_argument("--queries", type=int, default=20, help="Queries per thread")
+    parser.add_argument("--documents", type=int, default=2000, help="Filler documents added to the corpus")
+    parser.add_argument("--encoder", choices=("model", "synthetic"), default="model")
+    parser.add_argument("--game-data", default="./data/game_data.json")
+    args = parser.parse_args(argv)
+
+    scenes = _scene_queries(args.game_data)
+    with tempfile.TemporaryDirectory(prefix="batch_benchmark_") as index_path:
+        retriever = build_retriever(args.encoder, args.documents, index_path)
+        print(f"{'window_ms':>9} {'threads':>7} {'queries/s':>10} {'batch':>6} {'p50_ms':>8} {'p99_ms':>8}")
+        for concurrency in args.concurrency:
+            for window in args.windows:
+                point = run_point(retriever, scenes, window, args.max_batch, concurrency, args.queries)
+                print(f"{point['window_ms']:>9.1f} {point['concurrency']:>7} {point['queries_per_second']:>10.1f} "
+                      f"{point['mean_batch']:>6.1f} {point['p50_ms']:>8.1f} {point['p99_ms']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Latency of tag-filtered versus unfiltered retrieval for every scene
+
+Runs each scene's rag_context_query with and without its rag_filter_tags
+against the configured backend, over the historical data plus synthetic
+filler documents. For each scene it prints the number of candidates the
+tags resolve to, the mean latency of both searches, and whether every
+filtered result carries one of the tags (no fallback to an unfiltered
+search).
+
+Usage:
+    python -m benchmarks.filter_benchmark --backend numpy --encoder synthetic
+    python -m benchmarks.filter_benchmark --backend chroma --documents 5000
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from rpg_game.config import HISTORICAL_DATA_PATH, RAG_BACKEND, RAG_TOP_K
+from rpg_game.rag.factory import create_retriever
+
+
+def filler_documents(count: int, data_path: str = HISTORICAL_DATA_PATH) -> List[Dict[str, Any]]:
+    """Synthetic documents spread over the tags of the historical data"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        tags = sorted({tag for doc in json.load(f) for tag in doc.get("tags", [])})
+    return [{"title": f"Chronicle {i}", "text": f"Entry {i} of the parish chronicle.",
+             "tags": [tags[i % len(tags)], tags[(i * 7) % len(tags)]]} for i in range(count)]
+
+
+def scene_queries(game_data_path: str) -> List[Dict[str, Any]]:
+    """Scene id, rag_context_query and rag_filter_tags of every scene that retrieves"""
+    with open(game_data_path, 'r', encoding='utf-8') as f:
+        scenes = json.load(f)["scenes"]
+    return [{"scene_id": scene_id, "query": scene["rag_context_query"], "filter_tags": scene.get("rag_filter_tags")}
+            for scene_id, scene in scenes.items() if "rag_context_query" in scene]
+
+
+def _mean_seconds(retriever: Any, query: str, filter_tags: Optional[List[str]], repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        retriever.retrieve(query, top_k=RAG_TOP_K, filter_tags=filter_tags)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_scenes(retriever: Any, scenes: List[Dict[str, Any]], repeats: int) -> List[Dict[str, Any]]:
+    """Time every scene's retrieval with and without its tag filter
+
+    Args:
+        retriever: Retriever under test
+        scenes: Scene queries and tags
+        repeats: Searches averaged per measurement
+
+    Returns:
+        Candidates, filtered and unfiltered latency and whether the filter was honoured, per scene
+    """
+    rows = []
+    for scene in scenes:
+        tags = scene["filter_tags"] or []
+        results = retriever.retrieve(scene["query"], top_k=RAG_TOP_K, filter_tags=tags)
+        rows.append({
+            "scene_id": scene["scene_id"],
+            "candidates": len(retriever.tag_index.candidates(tags)),
+            "filtered_ms": _mean_seconds(retriever, scene["query"], tags, repeats) * 1000,
+            "unfiltered_ms": _mean_seconds(retriever, scene["query"], None, repeats) * 1000,
+            "tags_matched": bool(results) and all(set(result["tags"]) & set(tags) for result in results)
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark tag-filtered against unfiltered retrieval")
+    parser.add_argument("--backend", choices=("numpy", "chroma"), default=RAG_BACKEND)
+    parser.add_argument("--documents", type=int, default=2000, help="Filler documents added to the corpus")
+    parser.add_argument("--repeats", type=int, default=20, help="Searches averaged per measurement")
+    parser.add_argument("--encoder", choices=("model", "synthetic"), default="model",
+                        help="Embedding model of the numpy backend")
+    parser.add_argument("--game-data", default="./data/game_data.json")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="filter_benchmark_") as index_path:
+        kwargs: Dict[str, Any] = {"vector_db_path": index_path}
+        if args.backend == "numpy":
+            kwargs = {"index_path": index_path, "embedding_cache_dir": None, "batch_window": 0}
+            if args.encoder == "synthetic":
+                from benchmarks.batch_benchmark import SyntheticEncoder
+                kwargs.update(encoder=SyntheticEncoder(), embedding_model="synthetic")
+        retriever = create_retriever(args.backend, coalesce=False, **kwargs)
+        if args.documents:
+            retriever.add_documents(filler_documents(args.documents), source="filter_benchmark")
+
+        print(f"{'scene':>18} {'candidates':>10} {'filtered_ms':>11} {'unfiltered_ms':>13} {'tags_matched':>12}")
+        for row in run_scenes(retriever, scene_queries(args.game_data), args.repeats):
+            print(f"{row['scene_id']:>18} {row['candidates']:>10} {row['filtered_ms']:>11.2f} "
+                  f"{row['unfiltered_ms']:>13.2f} {str(row['tags_matched']):>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Thundering-herd benchmark for cross-session request coalescing
+
+Releases waves of players into the same scene at the same instant, each
+wave on a fresh SessionManager (so its completion cache is cold), and
+counts the retrievals and LLM calls that reach the upstream services, with
+single-flight coalescing on and off. The starting scene's predefined
+actions are dropped so every player also asks the LLM for action choices.
+
+Usage:
+    python -m benchmarks.herd_benchmark --players 200 --waves 5
+    python -m benchmarks.herd_benchmark --llm-latency 0.5 --rag-latency 0.05
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.concurrency.single_flight import SingleFlight
+from rpg_game.rag.coalescing import CoalescingRetriever
+from rpg_game.telemetry.telemetry import percentile
+from rpg_game.server.session_manager import SessionManager
+
+
+class SlowRetriever:
+    """Retriever that takes a fixed time per search and counts the searches"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def retrieve(self, query: str, top_k: int = 3, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return [{"title": "Chronicle", "text": f"Passage about {query}.", "tags": list(filter_tags or [])}]
+
+
+def _herd_game_data(game_data_path: str) -> str:
+    """Copy of the game data whose starting scene has no predefined actions"""
+    with open(game_data_path, 'r', encoding='utf-8') as f:
+        game_data = json.load(f)
+    game_data["scenes"][game_data["starting_scene"]]["actions"] = []
+    fd, path = tempfile.mkstemp(prefix="herd_game_data_", suffix=".json")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(game_data, f)
+    return path
+
+
+def run_herd(players: int, waves: int, llm_latency: float, rag_latency: float, coalesce: bool,
+             game_data_path: str = "./data/game_data.json") -> Dict[str, Any]:
+    """Start waves of players on the same scene at once
+
+    Args:
+        players: Players joining per wave, all released together
+        waves: Number of waves, each on a fresh server with a cold completion cache
+        llm_latency: Stub LLM latency per completion in seconds
+        rag_latency: Retriever latency per search in seconds
+        coalesce: Share concurrent identical calls between sessions
+        game_data_path: Path to the game data JSON file
+
+    Returns:
+        Dictionary of results
+    """
+    herd_data_path = _herd_game_data(game_data_path)
+    client = StubLLMClient(latency=llm_latency)
+    retriever = SlowRetriever(rag_latency)
+    latencies: List[float] = []
+    elapsed = 0.0
+    try:
+        for _ in range(waves):
+            manager = SessionManager(
+                game_data_path=herd_data_path,
+                llm_client=client,
+                rag_retriever=CoalescingRetriever(retriever, SingleFlight()) if coalesce else retriever,
+                completion_cache=CompletionCache(path=None),
+                max_sessions=players,
+                coalesce=coalesce
+            )
+            barrier = threading.Barrier(players)
+
+            def join(_: int) -> float:
+                barrier.wait()
+                start = time.perf_counter()
+                manager.create_session()
+                return time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=players) as pool:
+                latencies.extend(pool.map(join, range(players)))
+            elapsed += time.perf_counter() - start
+    finally:
+        os.remove(herd_data_path)
+
+    upstream = client.calls + retriever.calls
+    return {
+        "requests": players * waves,
+        "llm_calls": client.calls,
+        "rag_calls": retriever.calls,
+        "upstream_calls_per_request": upstream / (players * waves),
+        "upstream_calls_per_second": upstream / elapsed if elapsed else 0.0,
+        "elapsed_seconds": elapsed,
+        "p50_join_ms": percentile(latencies, 50) * 1000,
+        "p99_join_ms": percentile(latencies, 99) * 1000
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Measure upstream calls when many players enter a scene at once")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--waves", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM latency per completion (seconds)")
+    parser.add_argument("--rag-latency", type=float, default=0.02, help="Retriever latency per search (seconds)")
+    args = parser.parse_args(argv)
+
+    for coalesce in (False, True):
+        results = run_herd(args.players, args.waves, args.llm_latency, args.rag_latency, coalesce)
+        print(f"coalescing {'on' if coalesce else 'off'}:")
+        for name, value in results.items():
+            print(f"  {name}: {value:.2f}" if isinstance(value, float) else f"  {name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Recall@k and latency of vector, hybrid and lexical retrieval
+
+Builds a NumpyRetriever over the historical data plus synthetic filler
+documents and runs the same known-item queries in each retrieval mode: the
+title of every historical document and every sentence of its text, each
+expected to return its own document. Prints recall@k and per-query latency
+percentiles for each mode. Batching is off so latencies are those of a
+single retrieval.
+
+Usage:
+    python -m benchmarks.hybrid_benchmark
+    python -m benchmarks.hybrid_benchmark --k 1 3 5 --documents 5000
+    python -m benchmarks.hybrid_benchmark --encoder synthetic   # latency only, vector recall is meaningless
+"""
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from rpg_game.config import HISTORICAL_DATA_PATH
+from rpg_game.concurrency.micro_batcher import MicroBatcher
+from benchmarks.batch_benchmark import build_retriever
+from rpg_game.rag.bm25_index import RETRIEVAL_MODES
+from rpg_game.rag.numpy_retriever import NumpyRetriever
+from rpg_game.telemetry.telemetry import percentile
+
+
+def known_item_queries(data_path: str = HISTORICAL_DATA_PATH) -> List[Tuple[str, str]]:
+    """(query, expected title) pairs: each document's title and each sentence of its text"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        documents = json.load(f)
+    queries = []
+    for doc in documents:
+        queries.append((doc["title"], doc["title"]))
+        for sentence in re.split(r"(?<=[.!?])\s+", doc["text"]):
+            if sentence.strip():
+                queries.append((sentence.strip(), doc["title"]))
+    return queries
+
+
+def run_mode(retriever: NumpyRetriever, mode: str, queries: List[Tuple[str, str]],
+             ks: List[int]) -> Dict[str, Any]:
+    """Run every query in one retrieval mode
+
+    Args:
+        retriever: Retriever under test (its mode and batcher are replaced)
+        mode: "vector", "hybrid" or "lexical"
+        queries: (query, expected title) pairs
+        ks: Cutoffs to report recall at
+
+    Returns:
+        Recall per cutoff and latency percentiles
+    """
+    retriever.mode = mode
+    retriever.batcher = MicroBatcher(retriever.retrieve_many, max_batch=1, window=0, name="rag")
+    top_k = max(ks)
+    # First query outside the timings, so the vector modes don't count model loading
+    retriever.retrieve(queries[0][0], top_k=top_k)
+
+    hits = {k: 0 for k in ks}
+    latencies = []
+    for query, expected in queries:
+        start = time.perf_counter()
+        results = retriever.retrieve(query, top_k=top_k)
+        latencies.append(time.perf_counter() - start)
+        titles = [result["title"] for result in results]
+        for k in ks:
+            hits[k] += expected in titles[:k]
+
+    return {
+        "mode": mode,
+        "recall": {k: hits[k] / len(queries) for k in ks},
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark recall and latency of the retrieval modes")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5], help="Recall cutoffs")
+    parser.add_argument("--modes", nargs="+", choices=RETRIEVAL_MODES, default=list(RETRIEVAL_MODES))
+    parser.add_argument("--documents", type=int, default=2000, help="Filler documents added to the corpus")
+    parser.add_argument("--encoder", choices=("model", "synthetic"), default="model")
+    args = parser.parse_args(argv)
+
+    queries = known_item_queries()
+    with tempfile.TemporaryDirectory(prefix="hybrid_benchmark_") as index_path:
+        retriever = build_retriever(args.encoder, args.documents, index_path)
+        # Skip the embedding cache so every mode pays for its own query embeddings
+        retriever.embeddings = retriever.embeddings.embeddings
+        print(f"{len(queries)} known-item queries over {len(retriever.documents)} documents")
+        recall_headers = " ".join(f"{f'recall@{k}':>9}" for k in args.k)
+        print(f"{'mode':>8} {recall_headers} {'p50_ms':>8} {'p99_ms':>8}")
+        for mode in args.modes:
+            point = run_mode(retriever, mode, queries, args.k)
+            recalls = " ".join(f"{point['recall'][k]:>9.2f}" for k in args.k)
+            print(f"{point['mode']:>8} {recalls} {point['p50_ms']:>8.2f} {point['p99_ms']:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
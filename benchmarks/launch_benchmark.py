@@ -0,0 +1,165 @@
+"""Import time and time-to-first-scene of a game launch
+
+Each launch runs in a fresh interpreter, as starting the game does. The
+child imports the orchestrator, builds it with the configured retriever
+backend over a shared index directory, warms the retriever up and renders
+the first scene with a stub LLM client, reporting the seconds to the
+import and to the first scene and which heavy dependencies the import
+pulled in. The first launch builds the index; later launches reuse it.
+The import is also profiled with python -X importtime to list the
+slowest modules.
+
+Exits with status 1 when the import or the last launch's first scene takes
+longer than its budget (STARTUP_IMPORT_BUDGET, STARTUP_FIRST_SCENE_BUDGET),
+or when importing the orchestrator loads a heavy dependency.
+
+Usage:
+    python -m benchmarks.launch_benchmark
+    python -m benchmarks.launch_benchmark --backend numpy --encoder synthetic --launches 3
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+from rpg_game.config import RAG_BACKEND, STARTUP_IMPORT_BUDGET, STARTUP_FIRST_SCENE_BUDGET
+
+ORCHESTRATOR_MODULE = "rpg_game.orchestrator.game_orchestrator"
+
+# Dependencies that must only be imported on first use, not by importing the orchestrator
+HEAVY_MODULES = ("chromadb", "langchain", "langchain_community", "sentence_transformers", "torch", "ai21")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self microseconds, cumulative microseconds) from python -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def profile_import(module: str = ORCHESTRATOR_MODULE) -> Dict[str, Any]:
+    """Import a module in a fresh interpreter under python -X importtime
+
+    Returns:
+        Cumulative import seconds of the module and its five slowest imports by self time
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True)
+    modules = parse_importtime(completed.stderr)
+    cumulative = next(us for name, _, us in reversed(modules) if name == module)
+    slowest = sorted(modules, key=lambda entry: entry[1], reverse=True)[:5]
+    return {
+        "import_seconds": cumulative / 1e6,
+        "slowest": [{"module": name, "self_ms": self_us / 1000} for name, self_us, _ in slowest]
+    }
+
+
+def measure_launch(backend: str, encoder: str, index_path: str, game_data_path: str) -> Dict[str, Any]:
+    """Launch the game in this (fresh) interpreter and time the first scene
+
+    Args:
+        backend: "numpy" or "chroma"
+        encoder: "model" or "synthetic" (numpy backend only)
+        index_path: Index directory shared by the launches
+        game_data_path: Game data to load
+
+    Returns:
+        Seconds to the import and to the first scene, and the heavy modules the import loaded
+    """
+    start = time.perf_counter()
+    from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+    import_seconds = time.perf_counter() - start
+    heavy = sorted(name for name in HEAVY_MODULES if name in sys.modules)
+
+    from rpg_game.agent.llm_agent import LLMCharacterAgent
+    from rpg_game.agent.stub_client import StubLLMClient
+    from rpg_game.agent.completion_cache import CompletionCache
+    from rpg_game.rag.factory import create_retriever
+
+    agent = LLMCharacterAgent(api_key="benchmark", client=StubLLMClient(latency=0, token_latency=0),
+                              completion_cache=CompletionCache(path=None))
+    game = GameOrchestrator(game_data_path, llm_agent=agent, speculative_prefetch=False)
+    if backend == "numpy":
+        kwargs: Dict[str, Any] = {"index_path": index_path}
+        if encoder == "synthetic":
+            from benchmarks.batch_benchmark import SyntheticEncoder
+            kwargs.update(encoder=SyntheticEncoder(), embedding_model="synthetic", embedding_cache_dir=None)
+        game.rag_retriever = create_retriever(backend, **kwargs)
+    else:
+        game.rag_retriever = create_retriever(backend, vector_db_path=index_path)
+    game.warm_up()
+    game.start_game("Benchmark")
+    return {
+        "import_seconds": import_seconds,
+        "first_scene_seconds": time.perf_counter() - start,
+        "heavy_imports": heavy
+    }
+
+
+def run_child(backend: str, encoder: str, index_path: str, game_data_path: str) -> Dict[str, Any]:
+    """Measure one launch in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.launch_benchmark", "--child", "--backend", backend,
+         "--encoder", encoder, "--index-path", index_path, "--game-data", game_data_path],
+        capture_output=True, text=True
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"Launch failed: {(completed.stderr.strip().splitlines() or ['no output'])[-1]}")
+    return json.loads(lines[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Time game startup and check it against its budgets")
+    parser.add_argument("--backend", choices=("numpy", "chroma"), default=RAG_BACKEND)
+    parser.add_argument("--encoder", choices=("model", "synthetic"), default="model",
+                        help="Embedding model of the numpy backend")
+    parser.add_argument("--launches", type=int, default=2, help="Launches over one index (the first builds it)")
+    parser.add_argument("--game-data", default="./data/game_data.json")
+    parser.add_argument("--import-budget", type=float, default=STARTUP_IMPORT_BUDGET)
+    parser.add_argument("--first-scene-budget", type=float, default=STARTUP_FIRST_SCENE_BUDGET)
+    parser.add_argument("--index-path", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_launch(args.backend, args.encoder, args.index_path, args.game_data)))
+        return 0
+
+    profile = profile_import()
+    print(f"Importing {ORCHESTRATOR_MODULE}: {profile['import_seconds'] * 1000:.1f} ms (-X importtime)")
+    for entry in profile["slowest"]:
+        print(f"  {entry['self_ms']:>8.1f} ms  {entry['module']}")
+
+    with tempfile.TemporaryDirectory(prefix="launch_benchmark_") as index_path:
+        launches = [run_child(args.backend, args.encoder, index_path, args.game_data)
+                    for _ in range(args.launches)]
+    print(f"{'launch':>6} {'import_s':>8} {'first_scene_s':>13}  heavy_imports")
+    for i, launch in enumerate(launches):
+        print(f"{i + 1:>6} {launch['import_seconds']:>8.3f} {launch['first_scene_seconds']:>13.3f}  "
+              f"{', '.join(launch['heavy_imports']) or '-'}")
+
+    failures = []
+    if profile["import_seconds"] > args.import_budget:
+        failures.append(f"import took {profile['import_seconds']:.3f}s (budget {args.import_budget}s)")
+    if launches[-1]["first_scene_seconds"] > args.first_scene_budget:
+        failures.append(f"first scene took {launches[-1]['first_scene_seconds']:.3f}s "
+                        f"(budget {args.first_scene_budget}s)")
+    heavy = sorted({name for launch in launches for name in launch["heavy_imports"]})
+    if heavy:
+        failures.append(f"importing the orchestrator loaded {', '.join(heavy)}")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""In-process load test for the multi-session game server
+
+Creates many sessions on one SessionManager backed by the offline stub LLM
+client, plays turns from a pool of worker threads and reports memory per
+session and turn latency.
+
+Usage:
+    python -m benchmarks.load_test --sessions 1000 --turns 5 --concurrency 32
+    python -m benchmarks.load_test --no-rag   # skip loading the embedding model
+"""
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.server.session_manager import SessionManager
+from rpg_game.simulation.simulator import NullRetriever
+from rpg_game.telemetry.telemetry import percentile
+
+
+def run_load_test(sessions: int, turns: int, concurrency: int, latency: float,
+                  use_rag: bool = True, seed: int = 0) -> Dict[str, Any]:
+    """Create sessions and play turns concurrently
+
+    Args:
+        sessions: Number of sessions to create
+        turns: Turns to play per session
+        concurrency: Worker threads issuing requests
+        latency: Stub LLM latency per completion in seconds
+        use_rag: Use the real retriever (otherwise a NullRetriever)
+        seed: Seed for picking actions
+
+    Returns:
+        Dictionary of results
+    """
+    manager = SessionManager(
+        llm_client=StubLLMClient(latency=latency),
+        rag_retriever=None if use_rag else NullRetriever(),
+        completion_cache=CompletionCache(path=None),
+        max_sessions=sessions
+    )
+    # Load the shared resources before measuring per-session memory
+    manager.warm_up()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        session_ids = [created["session_id"] for created in pool.map(lambda _: manager.create_session(), range(sessions))]
+    session_memory, _ = tracemalloc.get_traced_memory()
+
+    rng = random.Random(seed)
+    choices = {session_id: [rng.randrange(4) for _ in range(turns)] for session_id in session_ids}
+
+    def play(session_id: str) -> List[float]:
+        latencies = []
+        for action_index in choices[session_id]:
+            start = time.perf_counter()
+            outcome = manager.take_action(session_id, action_index)
+            latencies.append(time.perf_counter() - start)
+            if outcome["scene"] is None:
+                break
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = [latency for session_latencies in pool.map(play, session_ids) for latency in session_latencies]
+    elapsed = time.perf_counter() - start
+
+    final_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    bytes_per_session = max(1, final_memory - baseline) / sessions
+    return {
+        "sessions": sessions,
+        "turns_played": len(latencies),
+        "elapsed_seconds": elapsed,
+        "turns_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "kb_per_session_created": (session_memory - baseline) / sessions / 1024,
+        "kb_per_session_after_turns": bytes_per_session / 1024,
+        "sessions_per_gb": int(1024 ** 3 / bytes_per_session),
+        "peak_traced_mb": (peak_memory - baseline) / 1024 ** 2,
+        "p50_turn_ms": percentile(latencies, 50) * 1000,
+        "p99_turn_ms": percentile(latencies, 99) * 1000,
+        "stub_llm_calls": manager.llm_client.calls
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Load test the multi-session game server")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub LLM latency per completion (seconds)")
+    parser.add_argument("--no-rag", action="store_true", help="Use an empty retriever instead of the real one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_load_test(args.sessions, args.turns, args.concurrency, args.latency,
+                            use_rag=not args.no_rag, seed=args.seed)
+    for name, value in results.items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
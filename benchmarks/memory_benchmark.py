@@ -0,0 +1,113 @@
+"""Prompt size benchmark for the companion's conversation memory
+
+Plays a long simulated conversation against the offline stub LLM and
+records the prompt tokens of every companion reply and the messages held
+in memory, with the rolling summary memory and with the previous
+behaviour (unbounded history, no token budget).
+
+Usage:
+    python -m benchmarks.memory_benchmark --turns 500
+    python -m benchmarks.memory_benchmark --turns 500 --summarizer extractive
+"""
+import sys
+import json
+import random
+import argparse
+from typing import Dict, Any, List, Optional
+
+from rpg_game.config import HISTORICAL_DATA_PATH, RAG_TOP_K
+from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.agent.conversation_memory import ConversationMemory
+from rpg_game.agent.prompt_builder import PromptBuilder, estimate_tokens
+from rpg_game.behavior.controller import BehaviorController
+
+CHECKPOINTS = (1, 10, 50, 100, 250, 500)
+
+_PLAYER_MESSAGES = (
+    "I help the farmer drag the cart out of the mud.",
+    "I demand that the toll keeper let us pass without payment.",
+    "I share our bread with the hungry children by the well.",
+    "I search the abandoned chapel for anything of value.",
+    "I ask the innkeeper what he knows of the missing knights."
+)
+
+
+def _unbounded_agent(client: StubLLMClient) -> LLMCharacterAgent:
+    """Agent behaving as before: every message kept, ten sent, no token budget"""
+    agent = LLMCharacterAgent(api_key="offline", completion_cache=CompletionCache(path=None), client=client,
+                              prompt_builder=PromptBuilder(budget=10 ** 9, action_budget=10 ** 9))
+    agent.memory = ConversationMemory(max_messages=10 ** 9)
+    return agent
+
+
+def benchmark(turns: int, summarizer: str = "llm", seed: int = 0) -> Dict[str, Any]:
+    """Play a conversation with the summary memory and without it
+
+    Args:
+        turns: Number of companion replies
+        summarizer: "llm" (stub summarization calls) or "extractive"
+        seed: Random seed for the player's messages
+
+    Returns:
+        Prompt tokens and messages held at each checkpoint, per variant
+    """
+    with open(HISTORICAL_DATA_PATH, 'r', encoding='utf-8') as f:
+        historical_context = json.load(f)[:RAG_TOP_K]
+    agent_context = BehaviorController().get_prompt_context()
+    scene_context = {"description": "A muddy crossroads at dusk, where a burned waystone marks the old border."}
+
+    results = {}
+    for variant in ("summary", "unbounded"):
+        client = StubLLMClient(latency=0.0)
+        if variant == "summary":
+            agent = LLMCharacterAgent(api_key="offline", completion_cache=CompletionCache(path=None), client=client)
+            if summarizer != "llm":
+                agent.memory = ConversationMemory()
+        else:
+            agent = _unbounded_agent(client)
+
+        rng = random.Random(seed)
+        prompt_tokens = []
+        held = []
+        for _ in range(turns):
+            player_message = rng.choice(_PLAYER_MESSAGES)
+            messages = agent._build_response_messages(agent_context, scene_context, historical_context, player_message)
+            prompt_tokens.append(sum(estimate_tokens(str(message.content)) for message in messages))
+            agent.generate_response(agent_context, scene_context, historical_context, player_message)
+            agent.memory.wait()
+            held.append(len(agent.memory.unsummarized()))
+
+        results[variant] = {
+            "prompt_tokens": {turn: prompt_tokens[turn - 1] for turn in CHECKPOINTS if turn <= turns},
+            "messages_held": {turn: held[turn - 1] for turn in CHECKPOINTS if turn <= turns},
+            "max_prompt_tokens": max(prompt_tokens),
+            "total_prompt_tokens": sum(prompt_tokens),
+            "summary_tokens": estimate_tokens(agent.memory.summary),
+            "folds": agent.memory.folds,
+            "llm_calls": client.calls
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark prompt size over a long companion conversation")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--summarizer", choices=("llm", "extractive"), default="llm")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.turns, args.summarizer, args.seed)
+    for variant, figures in results.items():
+        print(f"{variant}:")
+        for turn, tokens in figures.pop("prompt_tokens").items():
+            print(f"  turn {turn:<5} prompt_tokens={tokens:<6} messages_held={figures['messages_held'][turn]}")
+        del figures["messages_held"]
+        print("  " + ", ".join(f"{name}={value}" for name, value in figures.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Save/load latency benchmark for event-sourced saves
+
+Plays synthetic turns (score effects, companion messages, scene changes)
+through GameOrchestrator's event path, saving after every turn, then times
+one more incremental save, a load, and the full pretty-printed rewrite that
+save_game used to do.
+
+Usage:
+    python -m benchmarks.save_benchmark --turns 10 1000 100000
+"""
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import tempfile
+from typing import Dict, Any, List, Optional
+
+from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+
+
+def _play_turn(game: GameOrchestrator, rng: random.Random) -> None:
+    scene_ids = list(game.scenes)
+    scene_id = game.current_scene_id
+    action_index = rng.randrange(4)
+    description = f"Action {action_index} in {scene_id}"
+    game._emit("scene_entered", scene_id=scene_id, location=game.scenes[scene_id].get("location", ""))
+    game._emit(
+        "action_chosen",
+        action_id=f"{scene_id}_{action_index}",
+        effects={"law": rng.randint(-10, 10), "good": rng.randint(-10, 10), "trust": rng.randint(-5, 5), "xp": 5},
+        description=description
+    )
+    response = "Aye, the road ahead is long and the night grows cold, friend."
+    game.llm_agent._record_exchange(f"I {description}", response)
+    game.event_log.record({"type": "agent_message", "player_message": f"I {description}", "response": response})
+    game._emit("turn_ended", next_scene_id=rng.choice(scene_ids))
+
+
+def benchmark(turns: int, save_dir: str, seed: int = 0) -> Dict[str, Any]:
+    """Play turns with a save after each, then time save and load
+
+    Args:
+        turns: Number of turns to play
+        save_dir: Directory for the save files
+        seed: Random seed for the synthetic turns
+
+    Returns:
+        Dictionary of timings in milliseconds and file sizes in bytes
+    """
+    rng = random.Random(seed)
+    save_path = os.path.join(save_dir, f"save_{turns}.json")
+    game = GameOrchestrator(rag_retriever=object(),
+                            llm_agent=LLMCharacterAgent(api_key="offline", client=StubLLMClient(latency=0.0)),
+                            speculative_prefetch=False)
+    game._reset_game("Benchmark")
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        _play_turn(game, rng)
+        game.save_game(save_path)
+    play_seconds = time.perf_counter() - start
+
+    _play_turn(game, rng)
+    start = time.perf_counter()
+    game.save_game(save_path)
+    save_ms = (time.perf_counter() - start) * 1000
+
+    # What save_game used to write: every record with a full alignment snapshot, indented
+    legacy = dict(game._snapshot(), action_history=game.scoring_engine.get_action_history(turns))
+    del legacy["conversation_history"]
+    start = time.perf_counter()
+    with open(save_path + ".legacy", 'w', encoding='utf-8') as f:
+        json.dump(legacy, f, indent=2)
+    legacy_save_ms = (time.perf_counter() - start) * 1000
+
+    loaded = GameOrchestrator(rag_retriever=object(),
+                              llm_agent=LLMCharacterAgent(api_key="offline", client=StubLLMClient(latency=0.0)),
+                              speculative_prefetch=False)
+    start = time.perf_counter()
+    assert loaded.load_game(save_path)
+    load_ms = (time.perf_counter() - start) * 1000
+    # Let both companions finish folding old messages into their conversation summaries
+    game.llm_agent.memory.wait()
+    loaded.llm_agent.memory.wait()
+    assert loaded._snapshot() == game._snapshot(), "Loaded state differs from saved state"
+
+    log_path = game.event_log.log_path(save_path, game.event_log.generation)
+    return {
+        "turns": turns,
+        "avg_save_during_play_ms": play_seconds * 1000 / max(1, turns),
+        "incremental_save_ms": save_ms,
+        "legacy_full_save_ms": legacy_save_ms,
+        "load_ms": load_ms,
+        "replayed_events": game.event_log.logged_events,
+        "snapshot_bytes": os.path.getsize(save_path),
+        "log_bytes": os.path.getsize(log_path),
+        "legacy_bytes": os.path.getsize(save_path + ".legacy")
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark save/load latency")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        for turns in args.turns:
+            results = benchmark(turns, save_dir, args.seed)
+            print(", ".join(
+                f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in results.items()
+            ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Startup cost of historical data ingestion across repeated launches
+
+Constructs the configured retriever several times over the same index
+directory, as repeated game launches do, and prints per launch the time
+taken, the number of stored documents and the number of texts sent to the
+embedding layer. Ingestion is idempotent, so after the first launch the
+collection size stays flat and no text is embedded.
+
+Usage:
+    python -m benchmarks.startup_benchmark --backend numpy --encoder synthetic
+    python -m benchmarks.startup_benchmark --backend chroma --launches 5
+"""
+import sys
+import time
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from rpg_game.config import RAG_BACKEND
+from rpg_game.rag.factory import create_retriever
+
+
+def _document_count(retriever: Any) -> int:
+    if hasattr(retriever, "vectordb"):
+        return retriever.vectordb._collection.count()
+    return len(retriever.documents)
+
+
+def _embedded_texts(retriever: Any) -> int:
+    """Texts the retriever has asked its embedding layer for, cached or not"""
+    stats = retriever.embedding_cache_stats()
+    return stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+
+
+def run_launches(backend: str, launches: int, index_path: str, encoder: str = "model") -> List[Dict[str, Any]]:
+    """Construct the retriever repeatedly over one index directory
+
+    Args:
+        backend: "numpy" or "chroma"
+        launches: Number of launches
+        index_path: Directory of the index, shared by all launches
+        encoder: "model" or "synthetic" (numpy backend only)
+
+    Returns:
+        Seconds, stored documents and embedded texts per launch
+    """
+    kwargs: Dict[str, Any] = {}
+    if backend == "numpy":
+        kwargs["index_path"] = index_path
+        kwargs["embedding_cache_dir"] = None
+        if encoder == "synthetic":
+            from benchmarks.batch_benchmark import SyntheticEncoder
+            kwargs.update(encoder=SyntheticEncoder(), embedding_model="synthetic")
+    else:
+        kwargs["vector_db_path"] = index_path
+
+    results = []
+    for launch in range(launches):
+        start = time.perf_counter()
+        retriever = create_retriever(backend, coalesce=False, **kwargs)
+        results.append({
+            "launch": launch + 1,
+            "seconds": time.perf_counter() - start,
+            "documents": _document_count(retriever),
+            "embedded": _embedded_texts(retriever)
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark repeated retriever startups")
+    parser.add_argument("--backend", choices=("numpy", "chroma"), default=RAG_BACKEND)
+    parser.add_argument("--launches", type=int, default=5)
+    parser.add_argument("--encoder", choices=("model", "synthetic"), default="model",
+                        help="Embedding model of the numpy backend")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="startup_benchmark_") as index_path:
+        results = run_launches(args.backend, args.launches, index_path, args.encoder)
+    print(f"{'launch':>6} {'seconds':>8} {'documents':>9} {'embedded':>8}")
+    for result in results:
+        print(f"{result['launch']:>6} {result['seconds']:>8.3f} {result['documents']:>9} {result['embedded']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,40 +3,16 @@ import json
 from dotenv import load_dotenv
 
 from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
-from rpg_game.rag.retriever import RAGRetriever, load_sample_data
 
 # Load environment variables
 load_dotenv()
 
-def setup_rag_system():
-    """Set up the RAG system with historical data"""
-    print("Setting up RAG system with historical data...")
-    
-    # Create data directory if it doesn't exist
-    os.makedirs("./data/vector_db", exist_ok=True)
-    
-    # Initialize RAG retriever
-    retriever = RAGRetriever()
-    
-    # Load sample historical data
-    historical_data = load_sample_data("./data/historical_data.json")
-    
-    if historical_data:
-        # Add documents to vector database
-        retriever.add_documents(historical_data)
-        print(f"Added {len(historical_data)} historical documents to RAG system")
-    else:
-        print("No historical data found or error loading data")
-    
-    return retriever
-
 def text_based_game_loop():
     """Run a simple text-based version of the game"""
-    # Set up RAG system
-    setup_rag_system()
-    
-    # Initialize game orchestrator
+    # Initialize game orchestrator; the RAG system (which syncs the historical
+    # data) loads in the background while the player types their name
     game = GameOrchestrator()
+    game.warm_up()
     
     # Start the game
     player_name = input("Enter your character's name: ")
@@ -0,0 +1,202 @@
+import time
+import asyncio
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from rpg_game.config import LLM_CALL_DEADLINE
+from rpg_game.agent.llm_agent import LLMCharacterAgent, ACTION_TEMPERATURE
+from rpg_game.agent.completion_cache import completion_key
+from rpg_game.agent.resilient_client import LLMUnavailableError, create_async_llm_client
+from rpg_game.telemetry.telemetry import telemetry
+
+
+class AsyncLLMCharacterAgent(LLMCharacterAgent):
+    """asyncio variant of the character agent, backed by AsyncAI21Client (wrapped with AsyncResilientClient)
+
+    Prompt building, response parsing and conversation history are shared
+    with LLMCharacterAgent; only the API calls are awaited, so several
+    completions (e.g. a companion response and the next scene's action
+    choices) can be in flight at once.
+    """
+
+    @property
+    def client(self):
+        """Async AI21 client with retries, deadlines and a circuit breaker, created (and the SDK imported) on first use"""
+        if self._client is None:
+            self._client = create_async_llm_client(self.api_key)
+        return self._client
+
+    def _conversation_summarizer(self) -> None:
+        """Extractive summaries only: the async client can't be called from the summary threads"""
+        return None
+
+    async def _create(self, **kwargs) -> Any:
+        """Await a completion within LLM_CALL_DEADLINE
+
+        Raises:
+            LLMUnavailableError: The call failed or missed its deadline
+        """
+        try:
+            return await asyncio.wait_for(self.client.chat.completions.create(**kwargs), LLM_CALL_DEADLINE)
+        except LLMUnavailableError:
+            # Already counted by AsyncResilientClient
+            raise
+        except Exception as e:
+            telemetry.count("llm_unavailable", reason=type(e).__name__)
+            raise LLMUnavailableError(f"LLM call failed: {e}") from e
+
+    async def generate_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any],
+                                historical_context: List[Dict[str, Any]], player_message: str) -> str:
+        """Generate a response from the LLM agent
+
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
+
+        Returns:
+            Agent's response
+        """
+        messages = self._build_response_messages(agent_context, scene_context, historical_context, player_message)
+
+        try:
+            with telemetry.span("llm.call", kind="response"):
+                response = await self._create(
+                    messages=messages,
+                    model=self.model,
+                    temperature=0.7,
+                    max_tokens=150,
+                )
+            agent_response = response.choices[0].message.content
+            self._count_tokens("response", messages, agent_response, response)
+        except LLMUnavailableError as e:
+            print(f"Error generating response, using a canned one: {e}")
+            agent_response = self._fallback_response(agent_context)
+
+        self._record_exchange(player_message, agent_response)
+
+        return agent_response
+
+    async def generate_action_choices(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any],
+                                      historical_context: List[Dict[str, Any]], use_cache: bool = True) -> List[str]:
+        """Generate four action choices for the player
+
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            use_cache: Reuse (and store) choices from the completion cache
+
+        Returns:
+            List of four action choices
+        """
+        messages = self._build_action_messages(scene_context, historical_context)
+
+        cache_key = self._action_cache_key(messages, use_cache)
+        if cache_key is not None:
+            cached_actions = self.completion_cache.get(cache_key)
+            if cached_actions is not None:
+                return list(cached_actions)
+
+        if use_cache and self.single_flight is not None:
+            # Agents on different clients (e.g. different endpoints or keys) must not share a call
+            flight_key = ("actions", id(self.client),
+                          cache_key or completion_key(self.model, ACTION_TEMPERATURE, messages))
+            return list(await self.single_flight.do_async(
+                flight_key, lambda: self._request_action_choices(messages, cache_key, agent_context, scene_context)
+            ))
+        return await self._request_action_choices(messages, cache_key, agent_context, scene_context)
+
+    async def _request_action_choices(self, messages: List[Any], cache_key: Optional[str],
+                                      agent_context: Dict[str, Any], scene_context: Dict[str, Any]) -> List[str]:
+        """Call the LLM for action choices, parse them and cache them"""
+        try:
+            with telemetry.span("llm.call", kind="actions"):
+                response = await self._create(
+                    messages=messages,
+                    model=self.model,
+                    temperature=ACTION_TEMPERATURE,
+                    max_tokens=200,
+                )
+        except LLMUnavailableError as e:
+            print(f"Error generating action choices, using default ones: {e}")
+            return self._fallback_action_choices(agent_context, scene_context)
+
+        content = response.choices[0].message.content
+        self._count_tokens("actions", messages, content, response)
+        return self._store_action_choices(cache_key, content, agent_context, scene_context)
+
+    def iter_response(self, *args, **kwargs):
+        """Not available: the async client can only be streamed with aiter_response"""
+        raise TypeError("AsyncLLMCharacterAgent streams with aiter_response")
+
+    async def aiter_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any],
+                             historical_context: List[Dict[str, Any]], player_message: str) -> AsyncIterator[str]:
+        """Stream a response from the LLM agent as an async iterator of text chunks
+
+        Errors are handled as in LLMCharacterAgent.iter_response: a canned reply
+        replaces a failed call, and the exchange is recorded when the stream
+        ends or is closed, unless no text was received.
+
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
+
+        Yields:
+            Chunks of the agent's response
+        """
+        messages = self._build_response_messages(agent_context, scene_context, historical_context, player_message)
+
+        start = time.perf_counter()
+        chunks: List[str] = []
+        try:
+            try:
+                with telemetry.span("llm.call", kind="response", stream=True):
+                    response = await self._create(
+                        messages=messages,
+                        model=self.model,
+                        temperature=0.7,
+                        max_tokens=150,
+                        stream=True,
+                    )
+            except LLMUnavailableError as e:
+                print(f"Error streaming response, using a canned one: {e}")
+                response = None
+
+            if response is None:
+                chunks.append(self._fallback_response(agent_context))
+                yield chunks[0]
+                return
+
+            try:
+                async for chunk in response:
+                    text = self._chunk_text(chunk)
+                    if text:
+                        if not chunks:
+                            telemetry.observe("llm_first_token_seconds", time.perf_counter() - start, kind="response")
+                        chunks.append(text)
+                        yield text
+            except Exception as e:
+                print(f"Error streaming response: {e}")
+                if not chunks:
+                    chunks.append(self._fallback_response(agent_context))
+                    yield chunks[0]
+        finally:
+            self._finish_stream(messages, player_message, chunks, start)
+
+    async def stream_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any],
+                              historical_context: List[Dict[str, Any]], player_message: str) -> None:
+        """Stream a response from the LLM agent (for real-time display)
+
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
+        """
+        print(f"\n{agent_context['name']}:", end="")
+        async for text in self.aiter_response(agent_context, scene_context, historical_context, player_message):
+            print(text, end="", flush=True)
+        print("\n")
@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from rpg_game.config import (
+    COMPLETION_CACHE_PATH, COMPLETION_CACHE_TTL, COMPLETION_CACHE_MEMORY_SIZE, COMPLETION_CACHE_MAX_ENTRIES,
+    COMPLETION_CACHE_ACCESS_BATCH
+)
+from rpg_game.telemetry.telemetry import log
+
+
+def completion_key(model: str, temperature: float, messages: List[Any]) -> str:
+    """Cache key for a chat completion request
+
+    Message content is whitespace-normalized, so prompts that differ only in
+    template indentation share an entry.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        messages: Chat messages (objects with role and content, or dicts)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    normalized = []
+    for message in messages:
+        role = message["role"] if isinstance(message, dict) else message.role
+        content = message["content"] if isinstance(message, dict) else message.content
+        normalized.append([str(role), " ".join(str(content).split())])
+    payload = json.dumps({"model": model, "temperature": temperature, "messages": normalized})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """LLM completion cache with an in-memory LRU tier and an on-disk SQLite tier
+
+    Entries expire after a per-entry TTL. The SQLite tier is shared by every
+    process and session using the same file, and is kept within max_entries
+    by evicting expired rows, then the least recently used ones. Writes keep
+    a running row count, so the table is only counted when it may be full,
+    and the last-access times of disk hits are written in batches rather
+    than on every read.
+    """
+
+    def __init__(self, path: Optional[str] = COMPLETION_CACHE_PATH, ttl: float = COMPLETION_CACHE_TTL,
+                 memory_size: int = COMPLETION_CACHE_MEMORY_SIZE, max_entries: int = COMPLETION_CACHE_MAX_ENTRIES,
+                 access_batch: int = COMPLETION_CACHE_ACCESS_BATCH):
+        """Initialize the cache
+
+        Args:
+            path: SQLite file for the disk tier (None keeps the cache in memory only)
+            ttl: Default time-to-live of an entry in seconds
+            memory_size: Maximum entries in the in-memory tier
+            max_entries: Maximum rows in the SQLite tier
+            access_batch: Disk hits whose last-access times are written together
+        """
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.access_batch = access_batch
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Rows in the SQLite tier as far as this process knows (recounted before evicting)
+        self._row_count = 0
+        # Last-access times of disk hits not yet written
+        self._pending_access: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS completions ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS completions_last_access ON completions (last_access)")
+                self._db.commit()
+                self._row_count = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+            except Exception as e:
+                log(f"Error opening completion cache: {e}", "error")
+                self._db = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a cached completion
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+                    ).fetchone()
+                    # Expired rows are left for the next eviction
+                    if row is not None and row[1] > now:
+                        self._pending_access[key] = now
+                        if len(self._pending_access) >= self.access_batch:
+                            self._flush_access()
+                            self._db.commit()
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self.hits += 1
+                        return value
+                except Exception as e:
+                    log(f"Error reading completion cache: {e}", "error")
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a completion
+
+        Args:
+            key: Key from completion_key
+            value: JSON-serializable completion (text or parsed result)
+            ttl: Time-to-live in seconds (defaults to the cache TTL)
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is None:
+                return
+            try:
+                self._pending_access.pop(key, None)
+                updated = self._db.execute(
+                    "UPDATE completions SET value = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                    (json.dumps(value), expires_at, now, key)
+                ).rowcount
+                if not updated:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO completions (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value), expires_at, now)
+                    )
+                    self._row_count += 1
+                if self._row_count > self.max_entries:
+                    self._evict(now)
+                self._db.commit()
+            except Exception as e:
+                log(f"Error writing completion cache: {e}", "error")
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _flush_access(self) -> None:
+        """Write the pending last-access times of disk hits (the caller commits)"""
+        if self._pending_access:
+            self._db.executemany("UPDATE completions SET last_access = ? WHERE key = ?",
+                                 [(at, key) for key, at in self._pending_access.items()])
+            self._pending_access.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then the least recently used rows down to 90% of max_entries
+
+        Trimming below the limit leaves room for a run of inserts before the
+        table has to be counted and trimmed again.
+        """
+        self._flush_access()
+        self._db.execute("DELETE FROM completions WHERE expires_at <= ?", (now,))
+        # Other processes sharing the file may have added rows too
+        count = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        if count > self.max_entries:
+            target = self.max_entries - self.max_entries // 10
+            self._db.execute(
+                "DELETE FROM completions WHERE key IN "
+                "(SELECT key FROM completions ORDER BY last_access ASC LIMIT ?)",
+                (count - target,)
+            )
+            count = target
+        self._row_count = count
+
+    def flush(self) -> None:
+        """Write the last-access times of recent disk hits to SQLite"""
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._flush_access()
+                self._db.commit()
+            except Exception as e:
+                log(f"Error writing completion cache: {e}", "error")
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._pending_access.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM completions")
+                self._db.commit()
+                self._row_count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory)
+            }
@@ -0,0 +1,191 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from rpg_game.config import CONVERSATION_MAX_MESSAGES, CONVERSATION_SUMMARY_TOKENS, CONVERSATION_SUMMARY_WORKERS
+from rpg_game.agent.prompt_builder import estimate_tokens, truncate_to_tokens
+from rpg_game.telemetry.telemetry import telemetry, log
+
+# Summarizer signature: (current summary, evicted messages, token limit) -> new summary
+Summarizer = Callable[[str, List[Any], int], str]
+
+_ROLE_LABELS = {"user": "Player", "assistant": "Companion"}
+
+# Tokens kept per message by the extractive summary (whole leading sentences where possible)
+_EXTRACT_TOKENS = 32
+
+# Shared by every memory so thousands of sessions don't each own a thread
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _summary_executor() -> ThreadPoolExecutor:
+    """Background pool for summary folds, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CONVERSATION_SUMMARY_WORKERS,
+                                           thread_name_prefix="conversation-summary")
+        return _executor
+
+
+def extractive_summary(summary: str, messages: List[Any], max_tokens: int) -> str:
+    """Fold messages into a summary by keeping the start of each
+
+    Each message becomes one line; when the summary outgrows its limit the
+    oldest lines are dropped.
+
+    Args:
+        summary: Current summary
+        messages: Messages to fold in, oldest first
+        max_tokens: Token limit of the summary
+
+    Returns:
+        New summary
+    """
+    lines = summary.splitlines() if summary else []
+    for message in messages:
+        text = truncate_to_tokens(" ".join(str(message.content).split()), _EXTRACT_TOKENS)
+        if text:
+            lines.append(f"{_ROLE_LABELS.get(message.role, message.role)}: {text}")
+
+    kept = []
+    used = 0
+    for line in reversed(lines):
+        tokens = estimate_tokens(line)
+        if used + tokens > max_tokens:
+            break
+        kept.append(line)
+        used += tokens
+    kept.reverse()
+    return "\n".join(kept)
+
+
+class ConversationMemory:
+    """Companion conversation kept as recent messages plus a rolling summary
+
+    Messages live in a ring buffer of at most ``max_messages``; when it
+    overflows, its older half is evicted at once. Evicted messages are
+    folded into a compact summary on a shared background pool (evictions
+    that arrive while a fold is running join the next one), so both the
+    memory held and the context sent per turn stay bounded. Messages are anything with ``role`` and ``content`` attributes.
+    """
+
+    def __init__(self, max_messages: int = CONVERSATION_MAX_MESSAGES,
+                 summary_tokens: int = CONVERSATION_SUMMARY_TOKENS,
+                 summarizer: Optional[Summarizer] = None, background: bool = True):
+        """Initialize the memory
+
+        Args:
+            max_messages: Recent messages kept verbatim
+            summary_tokens: Token limit of the summary
+            summarizer: Function folding messages into the summary (extractive if None);
+                the extractive fold is used if it raises
+            background: Fold on the background pool instead of inline
+        """
+        self.max_messages = max_messages
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer or extractive_summary
+        self.background = background
+        self.messages: deque = deque()
+        self.summary = ""
+        self.folds = 0
+        self._pending: List[Any] = []
+        self._folding: List[Any] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def append(self, message: Any) -> None:
+        """Add a message, evicting the oldest ones into the summary backlog"""
+        with self._lock:
+            self.messages.append(message)
+            if len(self.messages) > self.max_messages:
+                # Evict down to half capacity so folds (and summarization calls) come in batches
+                while len(self.messages) > self.max_messages // 2:
+                    self._pending.append(self.messages.popleft())
+        self._start_fold()
+
+    def _start_fold(self) -> None:
+        """Fold the backlog unless it is empty or a fold is already running"""
+        with self._lock:
+            if not self._pending or not self._idle.is_set():
+                return
+            self._idle.clear()
+        if self.background:
+            _summary_executor().submit(self._fold)
+        else:
+            self._fold()
+
+    def recent(self) -> List[Any]:
+        """Messages kept verbatim, oldest first"""
+        with self._lock:
+            return list(self.messages)
+
+    def _fold(self) -> None:
+        """Fold the backlog into the summary until it is empty"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._folding = []
+                    self._idle.set()
+                    return
+                self._folding, self._pending = self._pending, []
+                summary = self.summary
+
+            with telemetry.span("conversation.summarize", messages=len(self._folding)):
+                try:
+                    new_summary = self.summarizer(summary, self._folding, self.summary_tokens)
+                    if not new_summary:
+                        raise ValueError("empty summary")
+                except Exception as e:
+                    log(f"Error summarizing conversation, using extractive summary: {e}", "warning")
+                    new_summary = extractive_summary(summary, self._folding, self.summary_tokens)
+            new_summary = truncate_to_tokens(new_summary, self.summary_tokens)
+
+            with self._lock:
+                self.summary = new_summary
+                self.folds += 1
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the backlog has been folded into the summary
+
+        Returns:
+            True if the memory is idle
+        """
+        return self._idle.wait(timeout)
+
+    def backlog(self) -> List[Any]:
+        """Evicted messages not yet folded into the summary, oldest first"""
+        with self._lock:
+            return self._folding + self._pending
+
+    def unsummarized(self) -> List[Any]:
+        """Every message not yet folded into the summary (backlog and recent), oldest first"""
+        with self._lock:
+            return self._folding + self._pending + list(self.messages)
+
+    def restore(self, messages: List[Any], summary: str = "", backlog: Optional[List[Any]] = None) -> None:
+        """Replace the contents, folding any backlog into the summary
+
+        Args:
+            messages: Recent messages, oldest first (evicted as usual beyond the ring buffer)
+            summary: Summary of the conversation before them
+            backlog: Evicted messages still to be folded into the summary
+        """
+        self.wait()
+        with self._lock:
+            self.messages = deque()
+            self._pending = list(backlog or [])
+            self.summary = summary
+        for message in messages:
+            self.append(message)
+        self._start_fold()
+
+    def clear(self) -> None:
+        """Forget all messages and the summary"""
+        self.restore([])
@@ -1,69 +1,159 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, TYPE_CHECKING
 import json
+import time
+import asyncio
 
-from ai21 import AI21Client
-from ai21.models.chat import ChatMessage
+from rpg_game.config import (
+    AI21_API_KEY, DEFAULT_MODEL, COMPLETION_CACHE_ENABLED, CONVERSATION_SUMMARIZER, SINGLE_FLIGHT_ENABLED
+)
+from rpg_game.agent.completion_cache import CompletionCache, completion_key
+from rpg_game.agent.prompt_builder import PromptBuilder
+from rpg_game.agent.conversation_memory import ConversationMemory, Summarizer
+from rpg_game.agent.resilient_client import LLMUnavailableError, create_llm_client
+from rpg_game.concurrency.single_flight import SingleFlight, single_flight as shared_single_flight
+from rpg_game.telemetry.telemetry import telemetry
 
-from rpg_game.config import AI21_API_KEY, DEFAULT_MODEL
+if TYPE_CHECKING:
+    from ai21.models.chat import ChatMessage
+
+
+# Sampling temperature of the action choice prompt
+ACTION_TEMPERATURE = 0.8
+
+_ROLE_LABELS = {"user": "Player", "assistant": "You"}
+
+
+def _chat_message(content: str, role: str) -> "ChatMessage":
+    """Create an AI21 chat message, importing the SDK on first use"""
+    from ai21.models.chat import ChatMessage
+    return ChatMessage(content=content, role=role)
 
 
 class LLMCharacterAgent:
     """AI21-powered character agent for the RPG game"""
     
-    def __init__(self, api_key: str = AI21_API_KEY, model: str = DEFAULT_MODEL):
+    def __init__(self, api_key: str = AI21_API_KEY, model: str = DEFAULT_MODEL,
+                 completion_cache: Optional[CompletionCache] = None, client: Any = None,
+                 prompt_builder: Optional[PromptBuilder] = None, single_flight: Optional[SingleFlight] = None,
+                 coalesce: bool = SINGLE_FLIGHT_ENABLED):
         """Initialize the LLM agent with AI21 client
         
         Args:
             api_key: AI21 API key
             model: AI21 model to use
+            completion_cache: Cache for deterministic completions such as action
+                choices (defaults to the shared on-disk cache if enabled)
+            client: Existing client to share between agents (created lazily if None)
+            prompt_builder: Token-budgeted prompt builder (a default one if None)
+            single_flight: Layer sharing one action choice call between agents on the same client
+                asking the same thing at once (the process-wide one if None)
+            coalesce: Share action choice calls at all (False ignores single_flight)
         """
-        self.client = AI21Client(api_key=api_key)
+        self.api_key = api_key
         self.model = model
-        self.conversation_history: List[ChatMessage] = []
+        self._client = client
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.memory = ConversationMemory(summarizer=self._conversation_summarizer())
+        
+        if completion_cache is None and COMPLETION_CACHE_ENABLED:
+            completion_cache = CompletionCache()
+        self.completion_cache = completion_cache
+        if single_flight is None:
+            single_flight = shared_single_flight
+        self.single_flight = single_flight if coalesce else None
+    
+    @property
+    def client(self):
+        """AI21 client with retries, deadlines and a circuit breaker, created (and the SDK imported) on first use"""
+        if self._client is None:
+            self._client = create_llm_client(self.api_key)
+        return self._client
+    
+    @property
+    def conversation_history(self) -> List["ChatMessage"]:
+        """Recent conversation messages, oldest first (earlier ones live in memory.summary)"""
+        return self.memory.recent()
+    
+    def _conversation_summarizer(self) -> Optional[Summarizer]:
+        """Summarizer for evicted conversation messages (None for the extractive one)"""
+        return self._summarize_conversation if CONVERSATION_SUMMARIZER == "llm" else None
+    
+    def _summarize_conversation(self, summary: str, messages: List["ChatMessage"], max_tokens: int) -> str:
+        """Fold evicted conversation messages into the running summary with a short LLM call
+        
+        Args:
+            summary: Current summary
+            messages: Evicted messages, oldest first
+            max_tokens: Token limit of the summary
+            
+        Returns:
+            New summary
+        """
+        transcript = "\n".join(f"{_ROLE_LABELS.get(message.role, message.role)}: {message.content}"
+                               for message in messages)
+        prompt = [
+            _chat_message(
+                "You keep the memory of a companion in a medieval role-playing game. Merge the new exchanges "
+                "into the summary of the journey so far. Keep people, places, promises and the player's "
+                f"deeds. Use at most {max_tokens * 3 // 4} words and reply with the summary only.",
+                "system"
+            ),
+            _chat_message(f"Summary so far:\n{summary or 'None'}\n\nNew exchanges:\n{transcript}", "user")
+        ]
+        with telemetry.span("llm.call", kind="summary"):
+            response = self.client.chat.completions.create(
+                messages=prompt,
+                model=self.model,
+                temperature=0.0,
+                max_tokens=max_tokens,
+            )
+        content = response.choices[0].message.content
+        self._count_tokens("summary", prompt, content, response)
+        return content.strip()
     
-    def _build_system_prompt(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
-                            historical_context: List[Dict[str, Any]]) -> str:
-        """Build the system prompt for the LLM agent
+    def _build_response_messages(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
+                                 historical_context: List[Dict[str, Any]], player_message: str) -> List["ChatMessage"]:
+        """Build the message list for a companion response
         
         Args:
             agent_context: Agent memory and state
             scene_context: Current scene information
             historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
             
         Returns:
-            Formatted system prompt
+            System prompt, the recent conversation history that fits the token
+            budget and the player's message
         """
-        # Format historical context
-        history_text = ""
-        if historical_context:
-            history_text = "Historical context:\n"
-            for item in historical_context:
-                history_text += f"- {item['title']}: {item['text']}\n"
-        
-        # Format recent actions
-        recent_actions = "\n".join([f"- {action}" for action in agent_context["recent_actions"]]) if agent_context["recent_actions"] else "None"
-        
-        # Build the complete system prompt
-        system_prompt = f"""You are {agent_context['name']}, a {agent_context['class']} from the medieval era (year 1312).
-        
-        Your alignment is {agent_context['alignment']} and your current mood is {agent_context['mood']}.
-        
-        Backstory: {agent_context['backstory']}
-        
-        Your trust in the player is {agent_context['trust_in_player']}/100.
-        
-        Current scene: {scene_context['description']}
-        
-        Recent events:\n{recent_actions}
-        
-        {history_text}
+        system_prompt, history = self.prompt_builder.response_prompt(
+            agent_context, scene_context, historical_context, self.memory.recent(), player_message,
+            summary=self.memory.summary
+        )
+        return [_chat_message(system_prompt, "system")] + history + [_chat_message(player_message, "user")]
+    
+    @staticmethod
+    def _count_tokens(kind: str, messages: List["ChatMessage"], completion: str, response: Any = None) -> None:
+        """Add an LLM call's prompt and completion tokens to the telemetry counters
         
-        Respond in character as {agent_context['name']}. Your responses should reflect your mood, alignment, and trust in the player.
-        Keep your responses concise (2-3 sentences) and authentic to medieval speech patterns without being difficult to understand.
-        Do not use modern phrases, references, or technology.
+        Uses the usage reported by the API when present, otherwise a word count.
         """
-        
-        return system_prompt
+        if not telemetry.enabled:
+            return
+        usage = getattr(response, "usage", None)
+        tokens_in = getattr(usage, "prompt_tokens", None)
+        tokens_out = getattr(usage, "completion_tokens", None)
+        if tokens_in is None:
+            tokens_in = sum(len(str(message.content).split()) for message in messages)
+        if tokens_out is None:
+            tokens_out = len(str(completion or "").split())
+        telemetry.count("llm_calls", kind=kind)
+        telemetry.count("llm_tokens_in", tokens_in, kind=kind)
+        telemetry.count("llm_tokens_out", tokens_out, kind=kind)
+    
+    def _record_exchange(self, player_message: str, agent_response: str) -> None:
+        """Append a player message and the agent's reply to the conversation memory"""
+        self.memory.append(_chat_message(player_message, "user"))
+        self.memory.append(_chat_message(agent_response, "assistant"))
     
     def generate_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
                           historical_context: List[Dict[str, Any]], player_message: str) -> str:
@@ -78,84 +168,85 @@ class LLMCharacterAgent:
         Returns:
             Agent's response
         """
-        # Build system prompt
-        system_prompt = self._build_system_prompt(agent_context, scene_context, historical_context)
-        
-        # Create messages array
-        messages = [
-            ChatMessage(content=system_prompt, role="system")
-        ]
-        
-        # Add conversation history (limited to last 10 exchanges)
-        if self.conversation_history:
-            messages.extend(self.conversation_history[-10:])
-        
-        # Add player's current message
-        messages.append(ChatMessage(content=player_message, role="user"))
+        with telemetry.span("llm.prompt_build", kind="response"):
+            messages = self._build_response_messages(agent_context, scene_context, historical_context, player_message)
         
         # Generate response from AI21
-        response = self.client.chat.completions.create(
-            messages=messages,
-            model=self.model,
-            temperature=0.7,
-            max_tokens=150,
-        )
-        
-        agent_response = response.choices[0].message.content
+        try:
+            with telemetry.span("llm.call", kind="response"):
+                response = self.client.chat.completions.create(
+                    messages=messages,
+                    model=self.model,
+                    temperature=0.7,
+                    max_tokens=150,
+                )
+            agent_response = response.choices[0].message.content
+            self._count_tokens("response", messages, agent_response, response)
+        except LLMUnavailableError as e:
+            print(f"Error generating response, using a canned one: {e}")
+            agent_response = self._fallback_response(agent_context)
         
         # Update conversation history
-        self.conversation_history.append(ChatMessage(content=player_message, role="user"))
-        self.conversation_history.append(ChatMessage(content=agent_response, role="assistant"))
+        self._record_exchange(player_message, agent_response)
         
         return agent_response
     
-    def generate_action_choices(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
-                               historical_context: List[Dict[str, Any]]) -> List[str]:
-        """Generate four action choices for the player
+    def _build_action_messages(self, scene_context: Dict[str, Any], 
+                               historical_context: List[Dict[str, Any]]) -> List["ChatMessage"]:
+        """Build the message list for action choice generation
         
         Args:
-            agent_context: Agent memory and state
             scene_context: Current scene information
             historical_context: Retrieved historical context from RAG
             
         Returns:
-            List of four action choices
-        """
-        # Build system prompt for action generation
-        system_prompt = f"""You are a medieval RPG game master.
-        
-        Current scene: {scene_context['description']}
-        
-        Historical context:
-        {json.dumps(historical_context, indent=2)}
-        
-        Generate EXACTLY 4 possible actions for the player. Each action should:
-        1. Be a single sentence starting with a verb
-        2. Represent different moral or strategic choices
-        3. Be historically plausible for medieval times
-        4. Lead to different potential outcomes
-        
-        Format your response as a JSON array of 4 strings, with no additional text.
+            System and user messages for the game-master prompt
         """
+        system_prompt = self.prompt_builder.action_prompt(scene_context, historical_context)
         
         # Create messages array
-        messages = [
-            ChatMessage(content=system_prompt, role="system"),
-            ChatMessage(content="Generate 4 action choices for this scene.", role="user")
+        return [
+            _chat_message(system_prompt, "system"),
+            _chat_message("Generate 4 action choices for this scene.", "user")
         ]
+    
+    def _parse_action_choices(self, content: str, agent_context: Dict[str, Any], 
+                              scene_context: Dict[str, Any]) -> List[str]:
+        """Parse the game master's reply into four action choices
         
-        # Generate response from AI21
-        response = self.client.chat.completions.create(
-            messages=messages,
-            model=self.model,
-            temperature=0.8,
-            max_tokens=200,
-        )
-        
+        Args:
+            content: Raw completion text
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            
+        Returns:
+            List of four action choices (defaults if the reply cannot be parsed)
+        """
+        actions = self._try_parse_action_choices(content)
+        if actions is not None:
+            return actions
+        return self._fallback_action_choices(agent_context, scene_context)
+    
+    @staticmethod
+    def _fallback_response(agent_context: Dict[str, Any]) -> str:
+        """Canned reply used when the LLM is unavailable"""
+        return f"{agent_context['name']} says nothing for a moment, eyes fixed on the road ahead."
+    
+    @staticmethod
+    def _fallback_action_choices(agent_context: Dict[str, Any], scene_context: Dict[str, Any]) -> List[str]:
+        """Default actions used when the game master's reply cannot be parsed"""
+        return [
+            f"Investigate the {scene_context.get('location', 'area')} further.",
+            f"Ask {agent_context['name']} for advice.",
+            "Leave and find another path.",
+            "Wait and observe the surroundings."
+        ]
+    
+    @staticmethod
+    def _try_parse_action_choices(content: str) -> Optional[List[str]]:
+        """Parse a JSON array of exactly four actions, or return None"""
         # Parse the response to extract the action choices
         try:
-            # Try to parse as JSON
-            content = response.choices[0].message.content
             # Clean up the content to ensure it's valid JSON
             content = content.strip()
             if content.startswith("```json"):
@@ -173,60 +264,191 @@ class LLMCharacterAgent:
             return actions
         except Exception as e:
             print(f"Error parsing action choices: {e}")
-            # Fallback to default actions if parsing fails
-            return [
-                f"Investigate the {scene_context.get('location', 'area')} further.",
-                f"Ask {agent_context['name']} for advice.",
-                "Leave and find another path.",
-                "Wait and observe the surroundings."
-            ]
+            return None
     
-    def stream_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
-                       historical_context: List[Dict[str, Any]], player_message: str) -> None:
-        """Stream a response from the LLM agent (for real-time display)
+    def _action_cache_key(self, messages: List["ChatMessage"], use_cache: bool) -> Optional[str]:
+        """Completion cache key for an action request, or None if caching is off"""
+        if not use_cache or self.completion_cache is None:
+            return None
+        return completion_key(self.model, ACTION_TEMPERATURE, messages)
+    
+    def _store_action_choices(self, cache_key: Optional[str], content: str, agent_context: Dict[str, Any], 
+                              scene_context: Dict[str, Any]) -> List[str]:
+        """Parse action choices and cache them; fallback choices are never cached"""
+        actions = self._try_parse_action_choices(content)
+        if actions is None:
+            return self._fallback_action_choices(agent_context, scene_context)
+        if cache_key is not None:
+            self.completion_cache.set(cache_key, actions)
+        return actions
+    
+    def generate_action_choices(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
+                               historical_context: List[Dict[str, Any]], use_cache: bool = True) -> List[str]:
+        """Generate four action choices for the player
         
         Args:
             agent_context: Agent memory and state
             scene_context: Current scene information
             historical_context: Retrieved historical context from RAG
-            player_message: Player's message or action
+            use_cache: Reuse (and store) choices from the completion cache
+            
+        Returns:
+            List of four action choices
         """
-        # Build system prompt
-        system_prompt = self._build_system_prompt(agent_context, scene_context, historical_context)
+        with telemetry.span("llm.prompt_build", kind="actions"):
+            messages = self._build_action_messages(scene_context, historical_context)
+        
+        # The same scene and context always gets the same choices
+        cache_key = self._action_cache_key(messages, use_cache)
+        if cache_key is not None:
+            cached_actions = self.completion_cache.get(cache_key)
+            if cached_actions is not None:
+                telemetry.count("llm_cache_hits", kind="actions")
+                return list(cached_actions)
+        
+        # Sessions on the same scene ask at the same moment; let them share one call
+        if use_cache and self.single_flight is not None:
+            # Agents on different clients (e.g. different endpoints or keys) must not share a call
+            flight_key = ("actions", id(self.client),
+                          cache_key or completion_key(self.model, ACTION_TEMPERATURE, messages))
+            return list(self.single_flight.do(flight_key, self._request_action_choices, messages, cache_key,
+                                              agent_context, scene_context))
+        return self._request_action_choices(messages, cache_key, agent_context, scene_context)
+    
+    def _request_action_choices(self, messages: List["ChatMessage"], cache_key: Optional[str],
+                                agent_context: Dict[str, Any], scene_context: Dict[str, Any]) -> List[str]:
+        """Call the LLM for action choices, parse them and cache them"""
+        try:
+            with telemetry.span("llm.call", kind="actions"):
+                response = self.client.chat.completions.create(
+                    messages=messages,
+                    model=self.model,
+                    temperature=ACTION_TEMPERATURE,
+                    max_tokens=200,
+                )
+        except LLMUnavailableError as e:
+            print(f"Error generating action choices, using default ones: {e}")
+            return self._fallback_action_choices(agent_context, scene_context)
+        
+        content = response.choices[0].message.content
+        self._count_tokens("actions", messages, content, response)
+        return self._store_action_choices(cache_key, content, agent_context, scene_context)
+    
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Text of a streamed completion chunk ("" for chunks without content)"""
+        return (chunk.choices[0].delta.content or "") if chunk.choices else ""
+    
+    def _finish_stream(self, messages: List["ChatMessage"], player_message: str, chunks: List[str],
+                       start: float) -> None:
+        """Record a streamed reply: latency, token counts and the conversation exchange (none if it is empty)"""
+        telemetry.observe("llm_response_seconds", time.perf_counter() - start, kind="response")
+        full_response = "".join(chunks)
+        if not full_response:
+            # Closed before any text arrived; an empty reply would only confuse later prompts
+            return
+        self._count_tokens("response", messages, full_response)
+        self._record_exchange(player_message, full_response)
+    
+    def iter_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
+                      historical_context: List[Dict[str, Any]], player_message: str) -> Iterator[str]:
+        """Stream a response from the LLM agent as text chunks
         
-        # Create messages array
-        messages = [
-            ChatMessage(content=system_prompt, role="system")
-        ]
+        The exchange is added to the conversation history when the stream ends,
+        or when it is closed early, with the text received so far (nothing is
+        added if no text was received). Time to the first chunk and to the end
+        of the stream are recorded as separate telemetry histograms.
         
-        # Add conversation history (limited to last 10 exchanges)
-        if self.conversation_history:
-            messages.extend(self.conversation_history[-10:])
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
+            
+        Yields:
+            Chunks of the agent's response
+        """
+        with telemetry.span("llm.prompt_build", kind="response"):
+            messages = self._build_response_messages(agent_context, scene_context, historical_context, player_message)
         
-        # Add player's current message
-        messages.append(ChatMessage(content=player_message, role="user"))
+        start = time.perf_counter()
+        chunks: List[str] = []
+        try:
+            try:
+                with telemetry.span("llm.call", kind="response", stream=True):
+                    response = self.client.chat.completions.create(
+                        messages=messages,
+                        model=self.model,
+                        temperature=0.7,
+                        max_tokens=150,
+                        stream=True,
+                    )
+            except LLMUnavailableError as e:
+                print(f"Error streaming response, using a canned one: {e}")
+                response = None
+            
+            if response is None:
+                chunks.append(self._fallback_response(agent_context))
+                yield chunks[0]
+                return
+            
+            try:
+                for chunk in response:
+                    text = self._chunk_text(chunk)
+                    if text:
+                        if not chunks:
+                            telemetry.observe("llm_first_token_seconds", time.perf_counter() - start, kind="response")
+                        chunks.append(text)
+                        yield text
+            except Exception as e:
+                print(f"Error streaming response: {e}")
+                if not chunks:
+                    chunks.append(self._fallback_response(agent_context))
+                    yield chunks[0]
+        finally:
+            self._finish_stream(messages, player_message, chunks, start)
+    
+    async def aiter_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
+                             historical_context: List[Dict[str, Any]], player_message: str) -> AsyncIterator[str]:
+        """Stream a response from the LLM agent as an async iterator of text chunks
         
-        # Generate streaming response from AI21
-        response = self.client.chat.completions.create(
-            messages=messages,
-            model=self.model,
-            temperature=0.7,
-            max_tokens=150,
-            stream=True,
-        )
+        The blocking stream of iter_response is advanced on a worker thread.
         
-        # Collect the full response for conversation history
-        full_response = ""
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
+            
+        Yields:
+            Chunks of the agent's response
+        """
+        chunks = self.iter_response(agent_context, scene_context, historical_context, player_message)
+        end = object()
+        try:
+            while True:
+                text = await asyncio.to_thread(next, chunks, end)
+                if text is end:
+                    return
+                yield text
+        finally:
+            try:
+                chunks.close()
+            except ValueError:
+                # Cancelled while a worker thread was advancing the stream
+                pass
+    
+    def stream_response(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any], 
+                       historical_context: List[Dict[str, Any]], player_message: str) -> None:
+        """Stream a response from the LLM agent (for real-time display)
         
-        # Stream the response
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            player_message: Player's message or action
+        """
         print(f"\n{agent_context['name']}:", end="")
-        for chunk in response:
-            content = chunk.choices[0].delta.content
-            if content:
-                print(content, end="", flush=True)
-                full_response += content
+        for text in self.iter_response(agent_context, scene_context, historical_context, player_message):
+            print(text, end="", flush=True)
         print("\n")
-        
-        # Update conversation history
-        self.conversation_history.append(ChatMessage(content=player_message, role="user"))
-        self.conversation_history.append(ChatMessage(content=full_response, role="assistant"))
@@ -0,0 +1,246 @@
+import re
+from typing import Dict, Any, Callable, List, Tuple
+
+from rpg_game.config import (
+    PROMPT_TOKEN_BUDGET, ACTION_PROMPT_TOKEN_BUDGET, PROMPT_HISTORY_MESSAGES, PROMPT_MIN_PASSAGE_TOKENS
+)
+from rpg_game.telemetry.telemetry import telemetry, log
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Persona prefixes kept before the cache is cleared (one per distinct companion)
+_MAX_CACHED_PREFIXES = 64
+
+_PERSONA_TEMPLATE = (
+    "You are {name}, a {character_class} from the medieval era (year 1312).\n"
+    "Backstory: {backstory}\n"
+    "Respond in character as {name}. Your responses should reflect your mood, alignment, and trust in the player.\n"
+    "Keep your responses concise (2-3 sentences) and authentic to medieval speech patterns "
+    "without being difficult to understand.\n"
+    "Do not use modern phrases, references, or technology."
+)
+
+_CONTEXT_HEADER = "Historical context:\n"
+
+_GAME_MASTER_PREFIX = (
+    "You are a medieval RPG game master.\n"
+    "Generate EXACTLY 4 possible actions for the player. Each action should:\n"
+    "1. Be a single sentence starting with a verb\n"
+    "2. Represent different moral or strategic choices\n"
+    "3. Be historically plausible for medieval times\n"
+    "4. Lead to different potential outcomes\n"
+    "Format your response as a JSON array of 4 strings, with no additional text."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text (words and punctuation marks)"""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, count_tokens: Callable[[str], int] = estimate_tokens) -> str:
+    """Shorten a text to at most max_tokens tokens
+
+    Whole leading sentences are kept when at least one fits; otherwise the
+    text is cut at a token boundary and marked with an ellipsis.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token limit
+        count_tokens: Token counting function
+
+    Returns:
+        The text itself if it fits, otherwise a shortened version
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text):
+        tokens = count_tokens(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+
+    # Leave room for the ellipsis
+    tokens = list(_TOKEN_PATTERN.finditer(text))[:max(max_tokens - 1, 1)]
+    return text[:tokens[-1].end()].rstrip() + "…"
+
+
+class PromptBuilder:
+    """Assembles LLM prompts within a hard token budget
+
+    Prompts are built from segments whose token counts are tracked: a static
+    prefix (persona and rules, compiled once per companion), the turn's state
+    and scene, the historical passages and, for replies, the recent
+    conversation. Passages are cut to whole sentences or dropped, and the
+    oldest conversation messages are left out, until the prompt fits.
+    """
+
+    def __init__(self, budget: int = PROMPT_TOKEN_BUDGET, action_budget: int = ACTION_PROMPT_TOKEN_BUDGET,
+                 history_messages: int = PROMPT_HISTORY_MESSAGES,
+                 min_passage_tokens: int = PROMPT_MIN_PASSAGE_TOKENS,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        """Initialize the prompt builder
+
+        Args:
+            budget: Token budget of a companion reply prompt, including history
+            action_budget: Token budget of the action choice prompt
+            history_messages: Most recent conversation messages considered
+            min_passage_tokens: Passages are dropped rather than cut shorter than this
+            count_tokens: Token counting function
+        """
+        self.budget = budget
+        self.action_budget = action_budget
+        self.history_messages = history_messages
+        self.min_passage_tokens = min_passage_tokens
+        self.count_tokens = count_tokens
+        self._prefixes: Dict[Tuple[str, str, str], Tuple[str, int]] = {}
+        self._game_master_tokens = count_tokens(_GAME_MASTER_PREFIX)
+        self._context_header_tokens = count_tokens(_CONTEXT_HEADER)
+
+    def persona_prefix(self, agent_context: Dict[str, Any]) -> Tuple[str, int]:
+        """Get the static persona and rules text of a companion and its token count"""
+        key = (agent_context['name'], agent_context['class'], agent_context['backstory'])
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            if len(self._prefixes) >= _MAX_CACHED_PREFIXES:
+                self._prefixes.clear()
+            text = _PERSONA_TEMPLATE.format(name=key[0], character_class=key[1], backstory=key[2])
+            prefix = self._prefixes[key] = (text, self.count_tokens(text))
+        return prefix
+
+    def _fit_passages(self, historical_context: List[Dict[str, Any]], budget: int) -> Tuple[List[str], int, int]:
+        """Format historical passages as list items within a token budget
+
+        The budget covers the section header too.
+
+        Returns:
+            Lines included, tokens used (header included if any line is) and tokens left out
+        """
+        lines = []
+        used = 0
+        dropped = 0
+        budget -= self._context_header_tokens
+        for item in historical_context:
+            line = f"- {item['title']}: {item['text']}"
+            tokens = self.count_tokens(line)
+            remaining = budget - used
+            if tokens > remaining:
+                prefix_tokens = self.count_tokens(f"- {item['title']}:")
+                if remaining - prefix_tokens >= self.min_passage_tokens:
+                    text = truncate_to_tokens(item['text'], remaining - prefix_tokens, self.count_tokens)
+                    line = f"- {item['title']}: {text}"
+                    dropped += tokens
+                    tokens = self.count_tokens(line)
+                    dropped -= tokens
+                else:
+                    dropped += tokens
+                    continue
+            lines.append(line)
+            used += tokens
+        if lines:
+            used += self._context_header_tokens
+        return lines, used, dropped
+
+    def fit_history(self, history: List[Any], budget: int) -> Tuple[List[Any], int, int]:
+        """Select the most recent conversation messages that fit a token budget
+
+        Args:
+            history: Conversation messages, oldest first (objects with a content attribute)
+            budget: Token budget for the history
+
+        Returns:
+            Messages included (oldest first), tokens used and tokens left out
+        """
+        candidates = history[-self.history_messages:] if self.history_messages else []
+        kept = []
+        used = 0
+        dropped = 0
+        for message in reversed(candidates):
+            tokens = self.count_tokens(str(message.content))
+            # Once a message doesn't fit, older ones are left out too so the history stays contiguous
+            if dropped or used + tokens > budget:
+                dropped += tokens
+                continue
+            kept.append(message)
+            used += tokens
+        kept.reverse()
+        return kept, used, dropped
+
+    def _report(self, kind: str, used: int, budget: int, saved: int) -> None:
+        """Log and count the tokens of a built prompt and the tokens left out"""
+        telemetry.count("prompt_tokens", used, kind=kind)
+        telemetry.count("prompt_tokens_saved", saved, kind=kind)
+        log(f"[Prompt] {kind}: {used}/{budget} tokens, {saved} saved", "debug")
+
+    def response_prompt(self, agent_context: Dict[str, Any], scene_context: Dict[str, Any],
+                        historical_context: List[Dict[str, Any]], history: List[Any],
+                        player_message: str, summary: str = "") -> Tuple[str, List[Any]]:
+        """Build the system prompt and select the history for a companion reply
+
+        The conversation history is guaranteed up to half of the tokens left
+        after the fixed segments; historical passages get the rest, and
+        whatever they don't use goes back to the history, newest messages first.
+
+        Args:
+            agent_context: Agent memory and state
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+            history: Conversation messages, oldest first
+            player_message: Player's message or action
+            summary: Summary of the conversation before the history
+
+        Returns:
+            System prompt and the conversation messages to include
+        """
+        prefix, prefix_tokens = self.persona_prefix(agent_context)
+        recent_actions = "\n".join(f"- {action}" for action in agent_context["recent_actions"]) or "None"
+        state = (
+            f"Your alignment is {agent_context['alignment']} and your current mood is {agent_context['mood']}.\n"
+            f"Your trust in the player is {agent_context['trust_in_player']}/100.\n"
+            f"Current scene: {scene_context['description']}\n"
+            f"Recent events:\n{recent_actions}"
+        )
+        if summary:
+            state += f"\nEarlier in your journey with the player:\n{summary}"
+        used = prefix_tokens + self.count_tokens(state) + self.count_tokens(player_message)
+
+        available = max(self.budget - used, 0)
+        _, reserved, _ = self.fit_history(history, available // 2)
+        lines, passage_tokens, passages_dropped = self._fit_passages(historical_context, available - reserved)
+        messages, history_tokens, history_dropped = self.fit_history(history, available - passage_tokens)
+
+        segments = [prefix, state]
+        if lines:
+            segments.append(_CONTEXT_HEADER + "\n".join(lines))
+        self._report("response", used + passage_tokens + history_tokens, self.budget,
+                     passages_dropped + history_dropped)
+        return "\n\n".join(segments), messages
+
+    def action_prompt(self, scene_context: Dict[str, Any], historical_context: List[Dict[str, Any]]) -> str:
+        """Build the game-master system prompt for action choice generation
+
+        Args:
+            scene_context: Current scene information
+            historical_context: Retrieved historical context from RAG
+
+        Returns:
+            System prompt
+        """
+        scene = f"Current scene: {scene_context['description']}"
+        used = self._game_master_tokens + self.count_tokens(scene)
+        lines, passage_tokens, dropped = self._fit_passages(historical_context, max(self.action_budget - used, 0))
+
+        segments = [_GAME_MASTER_PREFIX, scene]
+        if lines:
+            segments.append(_CONTEXT_HEADER + "\n".join(lines))
+        self._report("actions", used + passage_tokens, self.action_budget, dropped)
+        return "\n\n".join(segments)
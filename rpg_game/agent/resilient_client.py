@@ -0,0 +1,438 @@
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Awaitable, Callable, Deque, Optional
+
+from rpg_game.config import (
+    LLM_CALL_DEADLINE, LLM_ATTEMPT_TIMEOUT, LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX,
+    LLM_HEDGE_ENABLED, LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES, LLM_BREAKER_THRESHOLD,
+    LLM_BREAKER_RESET, LLM_MAX_CONNECTIONS, LLM_CALL_WORKERS
+)
+from rpg_game.telemetry.telemetry import telemetry, log
+
+# HTTP statuses worth retrying; other 4xx errors (bad request, auth) never succeed on retry
+RETRYABLE_STATUS_CODES = frozenset((408, 409, 425, 429, 500, 502, 503, 504))
+
+# Successful call latencies kept for the hedging percentile
+_LATENCY_WINDOW = 200
+
+_shared_http_client = None
+_shared_async_http_client = None
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when a completion can't be produced: deadline passed, retries exhausted or circuit open"""
+
+
+def shared_http_client():
+    """Process-wide pooled HTTP client, so every agent reuses the same keep-alive connections"""
+    global _shared_http_client
+    with _shared_lock:
+        if _shared_http_client is None:
+            import httpx
+            _shared_http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS,
+                                    max_keepalive_connections=LLM_MAX_CONNECTIONS),
+                timeout=LLM_ATTEMPT_TIMEOUT
+            )
+        return _shared_http_client
+
+
+def shared_async_http_client():
+    """Process-wide pooled async HTTP client, the AsyncAI21Client counterpart of shared_http_client"""
+    global _shared_async_http_client
+    with _shared_lock:
+        if _shared_async_http_client is None:
+            import httpx
+            _shared_async_http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS,
+                                    max_keepalive_connections=LLM_MAX_CONNECTIONS),
+                timeout=LLM_ATTEMPT_TIMEOUT
+            )
+        return _shared_async_http_client
+
+
+def _call_executor() -> ThreadPoolExecutor:
+    """Threads running the underlying calls, so attempts can be abandoned at their deadline"""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(max_workers=LLM_CALL_WORKERS, thread_name_prefix="llm-call")
+        return _shared_executor
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed call may succeed if repeated (timeouts, throttling, server and network errors)"""
+    if isinstance(error, LLMUnavailableError):
+        return False
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    return isinstance(error, (TimeoutError, ConnectionError, OSError)) or type(error).__module__.startswith("httpx")
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while
+
+    After ``threshold`` consecutive failures the circuit opens and calls are
+    refused for ``reset_after`` seconds; then one trial call is let through
+    (half-open), which closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, reset_after: float = LLM_BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be made now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_after or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or when a trial call fails"""
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or (self.opened_at is None and self.failures >= self.threshold):
+                if self.opened_at is None:
+                    self.trips += 1
+                    telemetry.count("llm_breaker_trips")
+                    log(f"LLM circuit opened after {self.failures} consecutive failures", "warning")
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class _ResilientCompletions:
+    """chat.completions endpoint of ResilientClient"""
+
+    def __init__(self, owner: "ResilientClient"):
+        self._owner = owner
+
+    def create(self, **kwargs) -> Any:
+        return self._owner._create(kwargs)
+
+
+class ResilientClient:
+    """Wraps an AI21-style client with deadlines, retries, hedging and a circuit breaker
+
+    Exposes the same ``chat.completions.create`` call as the wrapped client.
+    Each attempt runs on a shared worker pool and is abandoned at its
+    timeout; failed attempts that may succeed on repeat are retried with
+    jittered exponential backoff until the call's overall deadline. With
+    hedging on, a duplicate request is sent once an attempt has run longer
+    than the recent latency percentile, and the first answer wins. When no
+    answer can be produced, LLMUnavailableError is raised so callers can fall
+    back to canned or cached output. Streaming calls are retried but not
+    hedged, and their deadline covers only the start of the stream.
+    """
+
+    def __init__(self, client: Any, deadline: float = LLM_CALL_DEADLINE, attempt_timeout: float = LLM_ATTEMPT_TIMEOUT,
+                 max_retries: int = LLM_MAX_RETRIES, backoff_base: float = LLM_BACKOFF_BASE,
+                 backoff_max: float = LLM_BACKOFF_MAX, hedge: bool = LLM_HEDGE_ENABLED,
+                 hedge_percentile: float = LLM_HEDGE_PERCENTILE, hedge_min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+                 breaker: Optional[CircuitBreaker] = None, sleep: Callable[[float], None] = time.sleep):
+        """Initialize the wrapper
+
+        Args:
+            client: Client with a chat.completions.create method (e.g. AI21Client)
+            deadline: Seconds a call may take in total, across attempts and backoff
+            attempt_timeout: Seconds a single attempt may take
+            max_retries: Retries after the first attempt
+            backoff_base: Backoff ceiling of the first retry in seconds (doubled per retry)
+            backoff_max: Largest backoff ceiling in seconds
+            hedge: Send a duplicate request when an attempt is slower than usual
+            hedge_percentile: Latency percentile after which the duplicate is sent
+            hedge_min_samples: Successful calls observed before hedging starts
+            breaker: Circuit breaker (a new one if None)
+            sleep: Sleep function used for backoff
+        """
+        self.client = client
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_ResilientCompletions(self))
+
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.failures = 0
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds after which to send a duplicate request (None if hedging is off or untrained)"""
+        if not self.hedge:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * self.hedge_percentile / 100), len(ordered) - 1)]
+
+    def _attempt(self, kwargs: dict, timeout: float) -> Any:
+        """Run one attempt (plus a hedged duplicate) and return the first successful response"""
+        executor = _call_executor()
+        create = self.client.chat.completions.create
+        start = time.monotonic()
+        futures = [executor.submit(create, **kwargs)]
+
+        hedge_delay = None if kwargs.get("stream") else self._hedge_delay()
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = wait(futures, timeout=hedge_delay)
+            if not done:
+                with self._lock:
+                    self.hedges += 1
+                telemetry.count("llm_hedges")
+                futures.append(executor.submit(create, **kwargs))
+
+        error: Optional[BaseException] = None
+        pending = set(futures)
+        while pending:
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    with self._lock:
+                        self._latencies.append(time.monotonic() - start)
+                    return future.result()
+                error = future.exception()
+
+        for future in pending:
+            future.cancel()
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f"LLM call timed out after {timeout:.1f}s")
+
+    def _create(self, kwargs: dict) -> Any:
+        """Call the wrapped client within the deadline, retrying transient failures"""
+        deadline = self._open_call()
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                response = self._attempt(kwargs, min(self.attempt_timeout, remaining))
+                self.breaker.record_success()
+                return response
+            except Exception as e:
+                self._sleep(self._retry_backoff(e, attempt, deadline))
+                attempt += 1
+
+    def _open_call(self) -> float:
+        """Count a call and check the breaker
+
+        Returns:
+            Monotonic time by which the call must finish
+
+        Raises:
+            LLMUnavailableError: The circuit is open
+        """
+        with self._lock:
+            self.calls += 1
+        if not self.breaker.allow():
+            telemetry.count("llm_unavailable", reason="circuit_open")
+            raise LLMUnavailableError("LLM circuit is open")
+        return time.monotonic() + self.deadline
+
+    def _retry_backoff(self, error: Exception, attempt: int, deadline: float) -> float:
+        """Record a failed attempt and decide whether to retry it
+
+        Args:
+            error: Error raised by the attempt
+            attempt: Number of the attempt, starting at 0
+            deadline: Monotonic time by which the call must finish
+
+        Returns:
+            Seconds to wait before the next attempt
+
+        Raises:
+            LLMUnavailableError: The error isn't retryable, retries are exhausted or the circuit opened
+        """
+        # Client errors such as a bad request mean the API is up; only outages trip the breaker.
+        # Counting them as successes also ends a half-open trial, which would otherwise hold
+        # the circuit open for good
+        if is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        # Full jitter: a random wait below an exponentially growing ceiling
+        backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        remaining = deadline - time.monotonic()
+        if (not is_retryable(error) or attempt >= self.max_retries or backoff >= remaining
+                or not self.breaker.allow()):
+            with self._lock:
+                self.failures += 1
+            telemetry.count("llm_unavailable", reason=type(error).__name__)
+            raise LLMUnavailableError(f"LLM call failed after {attempt + 1} attempts: {error}") from error
+        log(f"LLM call failed ({error}), retrying in {backoff:.2f}s", "warning")
+        with self._lock:
+            self.retries += 1
+        telemetry.count("llm_retries")
+        return backoff
+
+    def stats(self) -> Dict[str, Any]:
+        """Get call, retry, hedge and failure counts and the breaker state"""
+        with self._lock:
+            counts = {"calls": self.calls, "retries": self.retries, "hedges": self.hedges, "failures": self.failures}
+        return dict(counts, breaker=self.breaker.state, breaker_trips=self.breaker.trips)
+
+
+class _AsyncResilientCompletions:
+    """chat.completions endpoint of AsyncResilientClient"""
+
+    def __init__(self, owner: "AsyncResilientClient"):
+        self._owner = owner
+
+    async def create(self, **kwargs) -> Any:
+        return await self._owner._create(kwargs)
+
+
+class AsyncResilientClient(ResilientClient):
+    """asyncio counterpart of ResilientClient, wrapping an AsyncAI21Client-style client
+
+    Same retry, hedging and circuit breaker policy (the breaker may be shared
+    with a sync client); attempts are tasks on the running event loop rather
+    than threads, and are cancelled when abandoned.
+    """
+
+    def __init__(self, client: Any, sleep: Callable[[float], Awaitable[None]] = asyncio.sleep, **resilience):
+        """Initialize the wrapper
+
+        Args:
+            client: Client with an awaitable chat.completions.create method (e.g. AsyncAI21Client)
+            sleep: Coroutine function used for backoff
+            **resilience: Deadlines, retry, hedging and breaker settings, as for ResilientClient
+        """
+        super().__init__(client, **resilience)
+        self._sleep = sleep
+        self.chat = SimpleNamespace(completions=_AsyncResilientCompletions(self))
+
+    async def _attempt(self, kwargs: dict, timeout: float) -> Any:
+        """Run one attempt (plus a hedged duplicate) and return the first successful response"""
+        create = self.client.chat.completions.create
+        start = time.monotonic()
+        tasks = [asyncio.ensure_future(create(**kwargs))]
+        try:
+            hedge_delay = None if kwargs.get("stream") else self._hedge_delay()
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    with self._lock:
+                        self.hedges += 1
+                    telemetry.count("llm_hedges")
+                    tasks.append(asyncio.ensure_future(create(**kwargs)))
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        with self._lock:
+                            self._latencies.append(time.monotonic() - start)
+                        return task.result()
+                    error = task.exception()
+
+            if error is not None and not pending:
+                raise error
+            raise TimeoutError(f"LLM call timed out after {timeout:.1f}s")
+        finally:
+            # Abandoned and losing attempts (or all of them, if the caller is cancelled)
+            for task in tasks:
+                task.cancel()
+
+    async def _create(self, kwargs: dict) -> Any:
+        """Await the wrapped client within the deadline, retrying transient failures"""
+        deadline = self._open_call()
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                response = await self._attempt(kwargs, min(self.attempt_timeout, remaining))
+                self.breaker.record_success()
+                return response
+            except Exception as e:
+                await self._sleep(self._retry_backoff(e, attempt, deadline))
+                attempt += 1
+
+
+def create_llm_client(api_key: Optional[str], api_host: Optional[str] = None, **resilience) -> ResilientClient:
+    """Create an AI21 client on the shared connection pool, wrapped with ResilientClient
+
+    The SDK's own retries are turned off so ResilientClient's policy applies.
+
+    Args:
+        api_key: AI21 API key
+        api_host: API base URL (the AI21 default if None)
+        **resilience: Passed to ResilientClient
+
+    Returns:
+        Wrapped client
+    """
+    from ai21 import AI21Client
+    client = AI21Client(api_key=api_key, api_host=api_host, timeout_sec=LLM_ATTEMPT_TIMEOUT, num_retries=0,
+                        http_client=shared_http_client())
+    return ResilientClient(client, **resilience)
+
+
+def create_async_llm_client(api_key: Optional[str], api_host: Optional[str] = None,
+                            **resilience) -> AsyncResilientClient:
+    """Create an async AI21 client on the shared async connection pool, wrapped with AsyncResilientClient
+
+    The SDK's own retries are turned off so AsyncResilientClient's policy applies.
+
+    Args:
+        api_key: AI21 API key
+        api_host: API base URL (the AI21 default if None)
+        **resilience: Passed to AsyncResilientClient
+
+    Returns:
+        Wrapped client
+    """
+    from ai21 import AsyncAI21Client
+    client = AsyncAI21Client(api_key=api_key, api_host=api_host, timeout_sec=LLM_ATTEMPT_TIMEOUT, num_retries=0,
+                             http_client=shared_async_http_client())
+    return AsyncResilientClient(client, **resilience)
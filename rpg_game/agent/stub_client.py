@@ -0,0 +1,110 @@
+import time
+import json
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Any, List
+
+from rpg_game.config import STUB_LLM_LATENCY, STUB_LLM_TOKEN_LATENCY, STUB_LLM_RESPONSE_TOKENS
+
+
+_STUB_ACTIONS = [
+    "Speak with the villagers about what they have seen",
+    "Search the surroundings for anything out of place",
+    "Ask Ser Elyen what he makes of this",
+    "Move on before nightfall"
+]
+
+_STUB_WORDS = ("Aye", "the", "road", "ahead", "is", "long", "and", "the", "night", "grows", "cold", "friend")
+
+
+def _content(message: Any) -> str:
+    return message["content"] if isinstance(message, dict) else message.content
+
+
+def _role(message: Any) -> str:
+    return message["role"] if isinstance(message, dict) else message.role
+
+
+class _StubCompletions:
+    """In-process stand-in for AI21's chat.completions endpoint"""
+
+    def __init__(self, owner: "StubLLMClient"):
+        self._owner = owner
+
+    def _reply(self, messages: List[Any]) -> str:
+        system = next((_content(message) for message in messages if _role(message) == "system"), "")
+        if "game master" in system:
+            return json.dumps(_STUB_ACTIONS)
+        words = [_STUB_WORDS[i % len(_STUB_WORDS)] for i in range(self._owner.response_tokens)]
+        return " ".join(words) + "."
+
+    def _record(self, messages: List[Any], reply: str) -> None:
+        owner = self._owner
+        with owner.lock:
+            owner.calls += 1
+            owner.prompt_chars += sum(len(_content(message)) for message in messages)
+            owner.completion_chars += len(reply)
+
+    def create(self, messages: List[Any], model: str = "", temperature: float = 0.7,
+               max_tokens: int = 150, stream: bool = False, **kwargs):
+        reply = self._reply(messages)
+        self._record(messages, reply)
+        time.sleep(self._owner.latency)
+        if stream:
+            return self._stream(reply)
+        time.sleep(self._owner.token_latency * len(reply.split()))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+
+    def _stream(self, reply: str):
+        for i, word in enumerate(reply.split(" ")):
+            time.sleep(self._owner.token_latency)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word if i == 0 else " " + word))])
+
+
+class _AsyncStubCompletions(_StubCompletions):
+    """Awaitable variant of the stub completions endpoint"""
+
+    async def create(self, messages: List[Any], model: str = "", temperature: float = 0.7,
+                     max_tokens: int = 150, stream: bool = False, **kwargs):
+        reply = self._reply(messages)
+        self._record(messages, reply)
+        await asyncio.sleep(self._owner.latency)
+        if stream:
+            return self._astream(reply)
+        await asyncio.sleep(self._owner.token_latency * len(reply.split()))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+
+    async def _astream(self, reply: str):
+        for i, word in enumerate(reply.split(" ")):
+            await asyncio.sleep(self._owner.token_latency)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word if i == 0 else " " + word))])
+
+
+class StubLLMClient:
+    """Offline AI21Client replacement with configurable latency and output size
+
+    Game-master prompts get a JSON array of four actions, every other prompt
+    a filler reply of ``response_tokens`` words. Used for load tests,
+    simulations and running the game without an API key.
+    """
+
+    def __init__(self, latency: float = STUB_LLM_LATENCY, token_latency: float = STUB_LLM_TOKEN_LATENCY,
+                 response_tokens: int = STUB_LLM_RESPONSE_TOKENS, asynchronous: bool = False):
+        """Initialize the stub client
+
+        Args:
+            latency: Seconds before the first token of each reply
+            token_latency: Seconds per generated word
+            response_tokens: Words per companion reply
+            asynchronous: Expose awaitable create() like AsyncAI21Client
+        """
+        self.latency = latency
+        self.token_latency = token_latency
+        self.response_tokens = response_tokens
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.prompt_chars = 0
+        self.completion_chars = 0
+        completions = _AsyncStubCompletions(self) if asynchronous else _StubCompletions(self)
+        self.chat = SimpleNamespace(completions=completions)
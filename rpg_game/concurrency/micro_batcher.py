@@ -0,0 +1,97 @@
+import time
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rpg_game.telemetry.telemetry import telemetry
+
+
+class MicroBatcher:
+    """Gathers calls from many threads into batches for one batched function
+
+    The first caller of a batch waits up to ``window`` seconds for others
+    to join; the batch runs as soon as it holds ``max_batch`` items or the
+    window closes, on the thread of whichever caller completed it. Each
+    caller blocks until its own result is ready. With a window of 0 or a
+    max_batch of 1 every call runs on its own, without waiting.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch: int, window: float, name: str = "batch"):
+        """Initialize the batcher
+
+        Args:
+            fn: Function mapping a list of items to a list of results in the same order
+            max_batch: Most items run in one batch
+            window: Seconds the first item of a batch waits for others
+            name: Label of the batch counters
+        """
+        self.fn = fn
+        self.max_batch = max(1, max_batch)
+        self.window = window
+        self.name = name
+        self._batch: List[Tuple[Any, Future]] = []
+        self._cond = threading.Condition()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Any:
+        """Run item through the batched function, together with whatever arrives in the window
+
+        Args:
+            item: Item to process
+
+        Returns:
+            The result for this item
+
+        Raises:
+            Exception: Whatever the batched function raised
+        """
+        future: Future = Future()
+        run: Optional[List[Tuple[Any, Future]]] = None
+        with self._cond:
+            batch = self._batch
+            batch.append((item, future))
+            if len(batch) >= self.max_batch or self.window <= 0:
+                self._batch = []
+                self._cond.notify_all()
+                run = batch
+            elif len(batch) == 1:
+                # First in: hold the batch open for the window unless it fills up first
+                deadline = time.monotonic() + self.window
+                while self._batch is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._batch = []
+                        run = batch
+                        break
+                    self._cond.wait(remaining)
+
+        if run is not None:
+            self._run(run)
+        return future.result()
+
+    def _run(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Call the batched function and hand each caller its result"""
+        with self._cond:
+            self.batches += 1
+            self.items += len(batch)
+        telemetry.count("batches", kind=self.name)
+        telemetry.count("batched_items", len(batch), kind=self.name)
+        try:
+            results = self.fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batched function returned {len(results)} results for {len(batch)} items")
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of batches run and their mean size"""
+        with self._cond:
+            return {"batches": self.batches, "items": self.items,
+                    "mean_batch_size": self.items / self.batches if self.batches else 0.0}
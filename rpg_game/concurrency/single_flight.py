@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from rpg_game.telemetry.telemetry import telemetry
+
+
+class _Call:
+    """One in-flight computation and the outcome handed to every caller waiting on it"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapses concurrent identical calls into one
+
+    The first caller for a key (the leader) runs the computation; callers
+    that arrive with the same key while it is running wait for it and get
+    the same result, or the same exception. Nothing is remembered once the
+    call finishes, so this only removes duplicate work that overlaps in time;
+    caching across time is the completion and embedding caches' job.
+
+    Bookkeeping survives cancellation: a key is always released when its
+    leader stops, and if the leader is interrupted (KeyboardInterrupt,
+    SystemExit) the waiters retry instead of inheriting the interruption.
+    For coroutines, a waiter that is cancelled leaves the shared task
+    running for the others; the task is only cancelled when no waiter is
+    left. Results are shared, not copied, so callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[Any, Hashable], List[Any]] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def _count(self, key: Hashable, outcome: str) -> None:
+        with self._lock:
+            if outcome == "executed":
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        telemetry.count("single_flight_calls", kind=key[0] if isinstance(key, tuple) and key else "other",
+                        outcome=outcome)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args), or wait for the identical call already running
+
+        Args:
+            key: Hashable key identifying identical calls (a tuple whose first item names the kind)
+            fn: Function to run
+            *args: Arguments for fn
+
+        Returns:
+            Result of the one shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                self._count(key, "executed")
+                try:
+                    call.result = fn(*args)
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+                return call.result
+
+            self._count(key, "coalesced")
+            call.done.wait()
+            if call.error is None:
+                return call.result
+            if isinstance(call.error, Exception):
+                raise call.error
+            # The leader was interrupted, not failed; run the call again
+
+    async def do_async(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await factory(), or join the identical coroutine already running
+
+        Args:
+            key: Hashable key identifying identical calls (a tuple whose first item names the kind)
+            factory: Zero-argument function creating the coroutine to run
+
+        Returns:
+            Result of the one shared coroutine
+
+        Raises:
+            Exception: Whatever the shared coroutine raised
+            asyncio.CancelledError: If this waiter (or, with no waiters left, the shared task) was cancelled
+        """
+        # Tasks belong to one event loop, so identical calls on different loops aren't shared
+        task_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            entry = self._tasks.get(task_key)
+            leader = entry is None
+            if leader:
+                entry = self._tasks[task_key] = [asyncio.ensure_future(factory()), 0]
+                entry[0].add_done_callback(lambda _: self._forget(task_key, entry))
+            entry[1] += 1
+        self._count(key, "executed" if leader else "coalesced")
+
+        task = entry[0]
+        try:
+            return await asyncio.shield(task)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                abandoned = entry[1] == 0 and not task.done()
+                if abandoned and self._tasks.get(task_key) is entry:
+                    del self._tasks[task_key]
+            if abandoned:
+                task.cancel()
+
+    def _forget(self, task_key: Tuple[Any, Hashable], entry: List[Any]) -> None:
+        """Release the key of a finished shared task"""
+        with self._lock:
+            if self._tasks.get(task_key) is entry:
+                del self._tasks[task_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get executed and coalesced call counts and the calls in flight"""
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced,
+                    "in_flight": len(self._calls) + len(self._tasks)}
+
+
+# Process-wide instance shared by every session's retriever and agent
+single_flight = SingleFlight()
@@ -8,14 +8,90 @@ load_dotenv()
 AI21_API_KEY = os.getenv('AI21_API_KEY')
 DEFAULT_MODEL = "jamba-mini-1.6-2025-03"  # Use the latest model available
 
+# LLM Completion Cache Configuration
+COMPLETION_CACHE_ENABLED = True
+COMPLETION_CACHE_PATH = "./data/completion_cache.sqlite3"  # Shared across sessions (None for memory only)
+COMPLETION_CACHE_TTL = 7 * 24 * 3600  # Seconds before a cached completion expires
+COMPLETION_CACHE_MEMORY_SIZE = 256  # Completions kept in memory
+COMPLETION_CACHE_MAX_ENTRIES = 10000  # Rows kept in the SQLite tier
+COMPLETION_CACHE_ACCESS_BATCH = 64  # Disk hits whose last-access times are written to SQLite in one batch
+SINGLE_FLIGHT_ENABLED = True  # Concurrent identical action-choice calls and RAG searches share one request
+
+# LLM Client Resilience Configuration
+LLM_CALL_DEADLINE = 30.0  # Seconds an LLM call may take in total, including retries
+LLM_ATTEMPT_TIMEOUT = 12.0  # Seconds a single request may take
+LLM_MAX_RETRIES = 2  # Retries of timeouts, throttling and server errors
+LLM_BACKOFF_BASE = 0.5  # Backoff ceiling of the first retry in seconds (doubled per retry, jittered)
+LLM_BACKOFF_MAX = 4.0  # Largest backoff ceiling in seconds
+LLM_HEDGE_ENABLED = False  # Send a duplicate request when one is slower than LLM_HEDGE_PERCENTILE (costs tokens)
+LLM_HEDGE_PERCENTILE = 95  # Latency percentile after which a hedged request is sent
+LLM_HEDGE_MIN_SAMPLES = 20  # Successful calls observed before hedging starts
+LLM_BREAKER_THRESHOLD = 5  # Consecutive failures that open the circuit (canned responses while open)
+LLM_BREAKER_RESET = 30.0  # Seconds the circuit stays open before a trial call
+LLM_MAX_CONNECTIONS = 20  # Pooled HTTP connections shared by all agents in a process
+LLM_CALL_WORKERS = 32  # Threads running LLM requests so they can be abandoned at their deadline
+
+# Prompt Budget Configuration
+PROMPT_TOKEN_BUDGET = 1200  # Max prompt tokens for a companion reply (system prompt plus history)
+ACTION_PROMPT_TOKEN_BUDGET = 800  # Max prompt tokens for action choice generation
+PROMPT_HISTORY_MESSAGES = 10  # Most recent conversation messages considered for a reply
+PROMPT_MIN_PASSAGE_TOKENS = 24  # Historical passages are dropped rather than cut shorter than this
+CONVERSATION_MAX_MESSAGES = 20  # Companion messages kept verbatim; older ones are folded into a summary
+CONVERSATION_SUMMARY_TOKENS = 200  # Token limit of the rolling conversation summary
+CONVERSATION_SUMMARIZER = "llm"  # "llm" (cheap summarization call) or "extractive" (no API call)
+CONVERSATION_SUMMARY_WORKERS = 2  # Background threads folding evicted messages, shared by all sessions
+
 # Game Configuration
 GAME_TITLE = "Medieval Chronicles: The Fallen Knight"
 DEBUG_MODE = False
 
+# Telemetry and Logging Configuration
+TELEMETRY_ENABLED = os.getenv('RPG_TELEMETRY', "0") == "1"  # Record spans and metrics (near-zero cost when off)
+LOG_LEVEL = os.getenv('RPG_LOG_LEVEL', "debug" if DEBUG_MODE else "info")  # debug, info, warning, error or off
+TELEMETRY_SPAN_BUFFER = 10000  # Spans kept by the in-memory exporter
+TELEMETRY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Histogram bounds (seconds)
+
 # RAG Configuration
+RAG_BACKEND = os.getenv('RAG_BACKEND', "chroma")  # "chroma" (LangChain + ChromaDB) or "numpy" (in-process matrix)
 VECTOR_DB_PATH = "./data/vector_db"
+NUMPY_INDEX_PATH = os.path.join(VECTOR_DB_PATH, "numpy_index")
+ANN_MIN_CORPUS_SIZE = 5000  # Corpus size above which the numpy backend uses its IVF index
+ANN_NPROBE = 8  # IVF cells scanned per query
+RAG_TAG_SUBSET_CACHE = 64  # Tag filters whose rows the numpy backend keeps laid out for narrowed search
+HISTORICAL_DATA_PATH = "./data/historical_data.json"
+INGEST_MANIFEST_NAME = "ingest_manifest.json"  # Stored inside the vector DB directory
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # Sentence transformers model
 RAG_TOP_K = 3  # Number of relevant passages to retrieve
+EMBEDDING_CACHE_PATH = os.path.join(VECTOR_DB_PATH, "embedding_cache")  # On-disk embedding cache (None to disable)
+EMBEDDING_CACHE_SIZE = 1024  # Number of embeddings kept in memory
+INGEST_BATCH_SIZE = 64  # Documents embedded and written per batch by rpg_game.rag.ingest
+RAG_BATCH_WINDOW = 0.005  # Seconds a retrieval waits for concurrent ones to share its embedding pass (0 disables)
+RAG_BATCH_MAX = 32  # Most retrieval queries embedded (and searched) in one batch
+RAG_RETRIEVAL_MODE = os.getenv('RAG_RETRIEVAL_MODE', "vector")  # "vector", "hybrid" (BM25 + vector) or "lexical" (no embedding model)
+RAG_RRF_K = 60  # Reciprocal rank fusion constant of hybrid retrieval
+RAG_FUSION_CANDIDATES = 20  # Candidates taken from each ranking before fusion
+BM25_K1 = 1.5  # BM25 term frequency saturation
+BM25_B = 0.75  # BM25 document length normalization
+
+# Stub LLM Configuration (offline client for load tests and simulations)
+STUB_LLM_LATENCY = 0.2  # Seconds before the first token
+STUB_LLM_TOKEN_LATENCY = 0.0  # Seconds per generated word
+STUB_LLM_RESPONSE_TOKENS = 40  # Words per companion reply
+
+# Server Configuration
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_MAX_SESSIONS = 10000
+SERVER_SESSION_TTL = 3600  # Seconds of inactivity before a session is dropped
+
+# Orchestrator Configuration
+SPECULATIVE_PREFETCH = True  # Render successor scenes in the background while the player decides
+PREFETCH_WORKERS = 4  # Background threads for speculative scene renders, shared by all sessions
+PREFETCH_CACHE_SIZE = 16  # Speculatively rendered scenes kept in memory
+SCENE_GRAPH_CACHE_DIR = "./data/scene_graph_cache"  # Compiled scene graphs keyed by the game data's hash
+SAVE_SNAPSHOT_INTERVAL = 1000  # Events appended to a save's log before it is compacted into a snapshot
+STARTUP_IMPORT_BUDGET = 1.0  # Seconds importing the orchestrator may take before benchmarks.launch_benchmark fails
+STARTUP_FIRST_SCENE_BUDGET = 5.0  # Seconds from interpreter start to the first rendered scene (warm index)
 
 # Scoring Configuration
 INITIAL_ALIGNMENT = {
@@ -23,6 +99,7 @@ INITIAL_ALIGNMENT = {
     "good_evil": 0,   # -100 (Evil) to 100 (Good)
     "trust": 50       # 0 (No trust) to 100 (Complete trust)
 }
+ACTION_HISTORY_MAX_ENTRIES = 1000  # Most recent actions kept per player (older ones are dropped)
 
 # LLM Agent Configuration
 DEFAULT_AGENT = {
@@ -0,0 +1,222 @@
+import asyncio
+import os
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
+
+from rpg_game.config import SPECULATIVE_PREFETCH
+from rpg_game.agent.async_agent import AsyncLLMCharacterAgent
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.orchestrator.scene_graph import SceneGraph
+
+
+class AsyncGameOrchestrator(GameOrchestrator):
+    """asyncio game flow that overlaps independent retrieval and LLM work
+
+    With speculative_prefetch, while the companion responds to the player's
+    action the next scene's historical context and action choices are
+    prepared concurrently, so advance_to_next_scene usually returns from the
+    per-turn scene cache. RAG retrieval is blocking, so it runs in the default thread pool.
+    """
+
+    def __init__(self, game_data_path: str = "./data/game_data.json", rag_retriever=None,
+                 llm_agent: Optional[AsyncLLMCharacterAgent] = None,
+                 game_data: Optional[Union[Dict[str, Any], SceneGraph]] = None,
+                 speculative_prefetch: bool = SPECULATIVE_PREFETCH):
+        """Initialize the orchestrator with an async LLM agent
+
+        Args:
+            game_data_path: Path to the game data JSON file
+            rag_retriever: Existing retriever to share (built lazily if None)
+            llm_agent: Existing async agent to use (one per player, as it holds their conversation)
+            game_data: Parsed game data or compiled SceneGraph to share instead of reading game_data_path
+            speculative_prefetch: Render the next scene while the companion responds
+        """
+        if llm_agent is None:
+            llm_agent = AsyncLLMCharacterAgent(api_key=os.environ.get('AI21_API_KEY'))
+        # The base class's thread-pool prefetcher calls the agent synchronously, so it is never
+        # built; the next scene is rendered on the event loop instead
+        super().__init__(game_data_path, rag_retriever=rag_retriever, llm_agent=llm_agent,
+                         game_data=game_data, speculative_prefetch=False)
+        self.speculative_prefetch = speculative_prefetch
+
+    async def _retrieve(self, scene_id: str, scene: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "rag_context_query" not in scene:
+            return []
+        historical_context = self._precomputed_context(scene_id, scene)
+        if historical_context is not None:
+            return historical_context
+        return await asyncio.to_thread(
+            self.rag_retriever.retrieve,
+            query=scene["rag_context_query"],
+            filter_tags=scene.get("rag_filter_tags", None)
+        )
+
+    async def _render_scene(self, scene_id: str, turn: int) -> Dict[str, Any]:
+        """Retrieve context and generate action choices for a scene, caching the result
+
+        Args:
+            scene_id: Scene to render
+            turn: Turn the render is for (the cache key)
+
+        Returns:
+            Scene information with action choices
+        """
+        cached_scene = self._cached_scene(scene_id, turn)
+        if cached_scene is not None:
+            return cached_scene
+
+        scene = self.scenes[scene_id]
+        historical_context = await self._retrieve(scene_id, scene)
+
+        action_choices = scene.get("actions", [])
+        if not action_choices:
+            action_choices = await self.llm_agent.generate_action_choices(
+                agent_context=self.behavior_controller.get_prompt_context(),
+                scene_context=self._scene_context(scene),
+                historical_context=historical_context
+            )
+
+        scene_response = self._build_scene_response(scene_id, scene, action_choices, historical_context)
+        self._cache_scene(scene_id, turn, scene_response)
+        return scene_response
+
+    async def start_game(self, player_name: str = "Player") -> Dict[str, Any]:
+        """Start a new game
+
+        Args:
+            player_name: Name of the player character
+
+        Returns:
+            Initial scene information
+        """
+        self._reset_game(player_name)
+        return await self.get_current_scene()
+
+    async def get_current_scene(self) -> Dict[str, Any]:
+        """Get the current scene information with action choices
+
+        Returns:
+            Scene information with generated action choices
+        """
+        if not self.current_scene_id or self.current_scene_id not in self.scenes:
+            return {
+                "error": "No valid scene available",
+                "description": "The game has not been properly initialized."
+            }
+
+        self._enter_current_scene()
+        return await self._render_scene(self.current_scene_id, self.turn)
+
+    async def process_player_action(self, action_index: int, custom_action: Optional[str] = None) -> Dict[str, Any]:
+        """Process the player's chosen action
+
+        The companion's response and the next scene's render run concurrently.
+
+        Args:
+            action_index: Index of the chosen action (0-3)
+            custom_action: Optional custom action text
+
+        Returns:
+            Result of the action with agent response
+        """
+        if not self.current_scene_id or self.current_scene_id not in self.scenes:
+            return {"error": "No valid scene available"}
+
+        current_scene = await self.get_current_scene()
+        outcome = self._apply_action(current_scene, action_index, custom_action)
+        if "error" in outcome:
+            return outcome
+
+        response_task = self.llm_agent.generate_response(
+            agent_context=self.behavior_controller.get_prompt_context(),
+            scene_context=self._scene_context(outcome["scene"]),
+            historical_context=current_scene["historical_context"],
+            player_message=f"I {outcome['action_description']}"
+        )
+
+        next_scene_id = outcome["next_scene_id"]
+        if self.speculative_prefetch and next_scene_id and next_scene_id in self.scenes:
+            agent_response, prefetched = await asyncio.gather(
+                response_task,
+                self._render_scene(next_scene_id, self.turn + 1),
+                return_exceptions=True
+            )
+            if isinstance(agent_response, BaseException):
+                raise agent_response
+            # A failed prefetch is not fatal; the scene is rendered again on demand
+            if isinstance(prefetched, BaseException):
+                print(f"Error prefetching scene {next_scene_id}: {prefetched}")
+        else:
+            agent_response = await response_task
+
+        return self._finish_action(outcome, agent_response)
+
+    async def process_player_action_stream(self, action_index: int,
+                                           custom_action: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Process the player's chosen action, streaming the companion's response
+
+        Yields the same events as GameOrchestrator.process_player_action_stream;
+        the next scene is rendered concurrently while the reply streams.
+
+        Args:
+            action_index: Index of the chosen action (0-3)
+            custom_action: Optional custom action text
+
+        Yields:
+            Event dictionaries
+        """
+        if not self.current_scene_id or self.current_scene_id not in self.scenes:
+            yield {"type": "error", "error": "No valid scene available"}
+            return
+
+        current_scene = await self.get_current_scene()
+        outcome = self._apply_action(current_scene, action_index, custom_action)
+        if "error" in outcome:
+            yield {"type": "error", "error": outcome["error"]}
+            return
+
+        next_scene_id = outcome["next_scene_id"]
+        render_task = None
+        first_token = None
+        chunks: List[str] = []
+        tokens = self.llm_agent.aiter_response(
+            agent_context=self.behavior_controller.get_prompt_context(),
+            scene_context=self._scene_context(outcome["scene"]),
+            historical_context=current_scene["historical_context"],
+            player_message=f"I {outcome['action_description']}"
+        )
+        # The action is applied, so the turn must end even if the stream is closed at its first event
+        try:
+            yield self._action_event(outcome)
+            if self.speculative_prefetch and next_scene_id and next_scene_id in self.scenes:
+                render_task = asyncio.ensure_future(self._render_scene(next_scene_id, self.turn + 1))
+
+            start = time.perf_counter()
+            async for text in tokens:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                chunks.append(text)
+                yield {"type": "token", "text": text}
+
+            if render_task is not None:
+                try:
+                    await render_task
+                except Exception as e:
+                    # A failed prefetch is not fatal; the scene is rendered again on demand
+                    print(f"Error prefetching scene {next_scene_id}: {e}")
+        finally:
+            await tokens.aclose()
+            if render_task is not None and not render_task.done():
+                # Closed early: the next scene is rendered on demand instead
+                render_task.cancel()
+            result = self._finish_action(outcome, "".join(chunks))
+
+        yield self._done_event(result, first_token, time.perf_counter() - start)
+
+    async def advance_to_next_scene(self) -> Dict[str, Any]:
+        """Advance to the next scene after player action
+
+        Returns:
+            Next scene information
+        """
+        return await self.get_current_scene()
@@ -0,0 +1,137 @@
+import os
+import json
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from rpg_game.config import SAVE_SNAPSHOT_INTERVAL
+
+
+class EventLog:
+    """Append-only event log with periodic snapshots for one saved game
+
+    A save is a snapshot file (the save path itself) plus a JSON Lines file
+    of the events recorded after that snapshot. Saving appends only the
+    events recorded since the previous save; once snapshot_interval events
+    have accumulated, a fresh snapshot is written instead and the log starts
+    over. Loading reads the snapshot and replays only the events after it.
+
+    Each snapshot has a generation number naming its log file, so a crash
+    while writing a snapshot leaves the previous snapshot and log intact.
+    """
+
+    def __init__(self, snapshot_interval: int = SAVE_SNAPSHOT_INTERVAL):
+        """Initialize an empty log
+
+        Args:
+            snapshot_interval: Events appended to a log before the next save snapshots instead
+        """
+        self.snapshot_interval = snapshot_interval
+        self.pending: List[Dict[str, Any]] = []
+        self.path: Optional[str] = None
+        self.generation = 0
+        self.logged_events = 0
+
+    @staticmethod
+    def log_path(save_path: str, generation: int) -> str:
+        """Path of the event log belonging to a snapshot generation"""
+        return f"{os.path.splitext(save_path)[0]}.{generation}.events.jsonl"
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """Queue an event for the next save
+
+        Nothing is kept while the next save is bound to write a snapshot: before
+        the first save, and once more events are queued than the log may take
+        (the queue is then dropped), so an unsaved game doesn't grow the queue
+        past snapshot_interval.
+        """
+        if self.path is None:
+            return
+        self.pending.append(event)
+        if self.logged_events + len(self.pending) > self.snapshot_interval:
+            self.pending = []
+            self.path = None
+
+    def reset(self) -> None:
+        """Forget queued events; the next save writes a full snapshot"""
+        self.pending = []
+        self.path = None
+        self.logged_events = 0
+
+    def save(self, save_path: str, snapshot: Callable[[], Dict[str, Any]]) -> str:
+        """Persist the queued events
+
+        Args:
+            save_path: Path of the snapshot file
+            snapshot: Returns the full current state (called only when snapshotting)
+
+        Returns:
+            "snapshot" or "append", depending on what was written
+        """
+        if self.path != save_path or self.logged_events + len(self.pending) > self.snapshot_interval:
+            self._write_snapshot(save_path, snapshot())
+            return "snapshot"
+
+        with open(self.log_path(save_path, self.generation), 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in self.pending))
+        self.logged_events += len(self.pending)
+        self.pending = []
+        return "append"
+
+    def _write_snapshot(self, save_path: str, state: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        previous_generation = self._read_generation(save_path)
+        generation = max(self.generation, previous_generation) + 1
+
+        # Create the new (empty) log before the snapshot that points at it
+        open(self.log_path(save_path, generation), 'w', encoding='utf-8').close()
+        temp_path = f"{save_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(state, generation=generation), f, separators=(",", ":"))
+        os.replace(temp_path, save_path)
+
+        if previous_generation and os.path.exists(self.log_path(save_path, previous_generation)):
+            os.remove(self.log_path(save_path, previous_generation))
+
+        self.path = save_path
+        self.generation = generation
+        self.logged_events = 0
+        self.pending = []
+
+    @staticmethod
+    def _read_generation(save_path: str) -> int:
+        try:
+            with open(save_path, 'r', encoding='utf-8') as f:
+                return int(json.load(f).get("generation", 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def load(self, save_path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Read a snapshot and the events recorded after it
+
+        Args:
+            save_path: Path of the snapshot file
+
+        Returns:
+            Snapshot state and the events to replay on top of it, oldest first
+        """
+        with open(save_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        events = []
+        torn = False
+        generation = state.get("generation", 0)
+        log_path = self.log_path(save_path, generation)
+        if generation and os.path.exists(log_path):
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        # A torn final line from an interrupted save; snapshot on the next save
+                        torn = True
+                        break
+
+        self.path = save_path if generation and not torn else None
+        self.generation = generation
+        self.logged_events = len(events)
+        self.pending = []
+        return state, events
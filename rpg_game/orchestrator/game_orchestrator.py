@@ -1,34 +1,66 @@
-from typing import Dict, Any, List, Optional, Tuple
-import json
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 import os
+import copy
+import time
+import threading
 
-from rpg_game.rag.retriever import RAGRetriever
+from rpg_game.config import SPECULATIVE_PREFETCH, PREFETCH_CACHE_SIZE
+from rpg_game.rag.factory import create_retriever
+from rpg_game.orchestrator.prefetch import ScenePrefetcher
+from rpg_game.orchestrator.event_log import EventLog
+from rpg_game.orchestrator.scene_graph import SceneGraph, compile_scene_graph, load_scene_graph
+from rpg_game.orchestrator.scene_context import precomputed_passages
 from rpg_game.scoring.engine import ScoringEngine
+from rpg_game.scoring.history import ActionHistory
 from rpg_game.behavior.controller import BehaviorController
-from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.llm_agent import LLMCharacterAgent, _chat_message
+from rpg_game.agent.conversation_memory import ConversationMemory
+from rpg_game.telemetry.telemetry import telemetry, log
 
 
 class GameOrchestrator:
     """Central controller for the RPG game flow and logic"""
     
-    def __init__(self, game_data_path: str = "./data/game_data.json"):
+    def __init__(self, game_data_path: str = "./data/game_data.json", rag_retriever=None,
+                 llm_agent: Optional[LLMCharacterAgent] = None, game_data: Optional[Union[Dict[str, Any], SceneGraph]] = None,
+                 speculative_prefetch: bool = SPECULATIVE_PREFETCH):
         """Initialize the game orchestrator with all components
         
         Args:
             game_data_path: Path to the game data JSON file
+            rag_retriever: Existing retriever to share (built lazily if None)
+            llm_agent: Existing agent to use (one per player, as it holds their conversation)
+            game_data: Parsed game data or compiled SceneGraph to share instead of reading game_data_path
+            speculative_prefetch: Render successor scenes in the background
         """
-        # Initialize components
-        self.rag_retriever = RAGRetriever()
+        # Initialize components (the retriever is built on first use or by warm_up)
+        self._rag_retriever = rag_retriever
+        self._retriever_lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
         self.scoring_engine = ScoringEngine()
         self.behavior_controller = BehaviorController()
-        # Get API key from environment and pass it explicitly to the agent
-        api_key = os.environ.get('AI21_API_KEY')
-        self.llm_agent = LLMCharacterAgent(api_key=api_key)
+        self.event_log = EventLog()
+        if llm_agent is None:
+            # Get API key from environment and pass it explicitly to the agent
+            api_key = os.environ.get('AI21_API_KEY')
+            llm_agent = LLMCharacterAgent(api_key=api_key)
+        self.llm_agent = llm_agent
         
         # Game state
         self.current_scene_id = None
         self.scenes = {}
         self.player_name = "Player"
+        self.turn = 0
+        self._visited = 0  # Bitset of visited scenes; game_state["visited_scenes"] is only written to saves
+        self._replay_memory: Optional[ConversationMemory] = None  # Conversation being rebuilt by load_game
+        
+        # Rendered scenes for the current turn, keyed by (scene_id, turn)
+        self._scene_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        
+        # Background renders of the scenes the player may move to next
+        self.prefetcher = None
+        if speculative_prefetch:
+            self.prefetcher = ScenePrefetcher(self._prepare_scene, cache_size=PREFETCH_CACHE_SIZE)
         self.game_state = {
             "visited_scenes": [],
             "inventory": [],
@@ -38,28 +70,72 @@ class GameOrchestrator:
         }
         
         # Load game data
-        self._load_game_data(game_data_path)
+        if game_data is not None:
+            self._apply_game_data(game_data)
+        else:
+            self._load_game_data(game_data_path)
+    
+    @property
+    def rag_retriever(self):
+        """RAG retriever, created on first access"""
+        if self._rag_retriever is None:
+            with self._retriever_lock:
+                if self._rag_retriever is None:
+                    self._rag_retriever = create_retriever()
+        return self._rag_retriever
+    
+    @rag_retriever.setter
+    def rag_retriever(self, retriever) -> None:
+        self._rag_retriever = retriever
+    
+    def warm_up(self) -> threading.Thread:
+        """Build the retriever and embed the starting scene's query in the background
+        
+        Call this before blocking on player input so the heavy imports and the
+        embedding model load overlap with the player typing.
+        
+        Returns:
+            The background thread (daemon, safe to ignore)
+        """
+        def _warm():
+            try:
+                scene = self.scenes.get(self.current_scene_id) if self.current_scene_id else None
+                if scene and precomputed_passages(self.scene_graph.contexts, self.current_scene_id, scene) is not None:
+                    # Baked scene contexts need neither the retriever nor the model
+                    return
+                retriever = self.rag_retriever
+                if scene and "rag_context_query" in scene:
+                    retriever.embeddings.embed_query(scene["rag_context_query"])
+            except Exception as e:
+                print(f"Error warming up retriever: {e}")
+        
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=_warm, name="rag-warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
     
     def _load_game_data(self, game_data_path: str) -> None:
         """Load game scenes and data from JSON file"""
         try:
             if os.path.exists(game_data_path):
-                with open(game_data_path, 'r', encoding='utf-8') as f:
-                    game_data = json.load(f)
-                    
-                self.scenes = game_data.get("scenes", {})
-                self.current_scene_id = game_data.get("starting_scene", None)
+                self._apply_game_data(load_scene_graph(game_data_path))
                 
-                print(f"Loaded {len(self.scenes)} scenes from game data")
+                log(f"Loaded {len(self.scenes)} scenes from game data")
             else:
                 print(f"Game data file not found at {game_data_path}")
                 # Initialize with empty scenes if file doesn't exist
-                self.scenes = {}
-                self.current_scene_id = None
+                self._apply_game_data({})
         except Exception as e:
             print(f"Error loading game data: {e}")
-            self.scenes = {}
-            self.current_scene_id = None
+            self._apply_game_data({})
+    
+    def _apply_game_data(self, game_data: Union[Dict[str, Any], SceneGraph]) -> None:
+        """Use parsed game data or a compiled scene graph (shared read-only between sessions)"""
+        if not isinstance(game_data, SceneGraph):
+            game_data = compile_scene_graph(game_data)
+        self.scene_graph = game_data
+        self.scenes = game_data.by_key
+        self.current_scene_id = game_data.start
     
     def start_game(self, player_name: str = "Player") -> Dict[str, Any]:
         """Start a new game
@@ -70,6 +146,13 @@ class GameOrchestrator:
         Returns:
             Initial scene information
         """
+        self._reset_game(player_name)
+        
+        # Get the initial scene
+        return self.get_current_scene()
+    
+    def _reset_game(self, player_name: str) -> None:
+        """Reset all per-game state for a new game"""
         self.player_name = player_name
         
         # Reset game state
@@ -87,63 +170,114 @@ class GameOrchestrator:
         # Reset behavior controller
         self.behavior_controller = BehaviorController()
         
+        # Reset turn counter, rendered scenes and unsaved events
+        self.turn = 0
+        self._scene_cache = {}
+        self._visited = 0
+        self.event_log.reset()
+        
         # Start with the first scene
         if not self.current_scene_id and self.scenes:
-            self.current_scene_id = list(self.scenes.keys())[0]
-        
-        # Get the initial scene
-        return self.get_current_scene()
+            self.current_scene_id = self.scene_graph.scenes[0].key
     
-    def get_current_scene(self) -> Dict[str, Any]:
-        """Get the current scene information with action choices
+    def _scene_context(self, scene: Dict[str, Any], time_of_day: Optional[str] = None) -> Dict[str, Any]:
+        """Scene information passed to the LLM agent"""
+        return {
+            "description": scene["description"],
+            "location": scene.get("location", ""),
+            "time_of_day": time_of_day or self.game_state["time_of_day"]
+        }
+    
+    def _precomputed_context(self, scene_id: str, scene: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Historical context baked by rpg_game.orchestrator.scene_context (None to retrieve live)"""
+        historical_context = precomputed_passages(self.scene_graph.contexts, scene_id, scene)
+        telemetry.count("scene_retrievals", source="live" if historical_context is None else "precomputed")
+        return historical_context
+    
+    def _prepare_scene(self, key: Tuple[str, str],
+                       agent_context: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Retrieve historical context and action choices for a scene
         
+        Args:
+            key: (scene_id, time_of_day) of the scene to prepare
+            agent_context: Snapshot of the companion's prompt context (the live one if None)
+            
         Returns:
-            Scene information with generated action choices
+            Historical context and action choices
         """
-        if not self.current_scene_id or self.current_scene_id not in self.scenes:
-            return {
-                "error": "No valid scene available",
-                "description": "The game has not been properly initialized."
-            }
-        
-        # Get the current scene
-        scene = self.scenes[self.current_scene_id]
-        
-        # Update game state
-        if self.current_scene_id not in self.game_state["visited_scenes"]:
-            self.game_state["visited_scenes"].append(self.current_scene_id)
-        
-        self.game_state["current_location"] = scene.get("location", "")
+        scene_id, time_of_day = key
+        scene = self.scenes[scene_id]
         
-        # Retrieve historical context for the scene
+        # Retrieve historical context for the scene (baked at build time unless its query changed)
         historical_context = []
         if "rag_context_query" in scene:
-            historical_context = self.rag_retriever.retrieve(
-                query=scene["rag_context_query"],
-                filter_tags=scene.get("rag_filter_tags", None)
-            )
-        
-        # Generate action choices using the LLM agent
-        scene_context = {
-            "description": scene["description"],
-            "location": scene.get("location", ""),
-            "time_of_day": self.game_state["time_of_day"]
-        }
-        
-        agent_context = self.behavior_controller.get_prompt_context()
+            historical_context = self._precomputed_context(scene_id, scene)
+            if historical_context is None:
+                with telemetry.span("scene.retrieve", scene_id=scene_id):
+                    historical_context = self.rag_retriever.retrieve(
+                        query=scene["rag_context_query"],
+                        filter_tags=scene.get("rag_filter_tags", None)
+                    )
         
         # Generate action choices if they're not predefined
         action_choices = scene.get("actions", [])
         if not action_choices:
-            action_choices = self.llm_agent.generate_action_choices(
-                agent_context=agent_context,
-                scene_context=scene_context,
-                historical_context=historical_context
-            )
+            with telemetry.span("scene.action_generation", scene_id=scene_id):
+                if agent_context is None:
+                    agent_context = self.behavior_controller.get_prompt_context()
+                action_choices = self.llm_agent.generate_action_choices(
+                    agent_context=agent_context,
+                    scene_context=self._scene_context(scene, time_of_day),
+                    historical_context=historical_context
+                )
+        
+        return historical_context, action_choices
+    
+    def _prefetch_key(self, scene_id: Optional[str]) -> Optional[Tuple[str, str]]:
+        return (scene_id, self.game_state["time_of_day"]) if scene_id else None
+    
+    def _speculate_successors(self, scene_id: str) -> None:
+        """Start background renders of every scene reachable from this one"""
+        if self.prefetcher is None:
+            return
+        successors = self.scene_graph.successors(scene_id)
+        # Renders run while the player acts, so they read a copy of the companion's state
+        agent_context = copy.deepcopy(self.behavior_controller.get_prompt_context())
+        self.prefetcher.speculate((self._prefetch_key(successor) for successor in successors), agent_context)
+    
+    def prefetch_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/wasted-work counters of speculative scene rendering"""
+        return self.prefetcher.stats() if self.prefetcher else {}
+    
+    def _enter_current_scene(self) -> Dict[str, Any]:
+        """Record the current scene as visited and return its data"""
+        scene = self.scenes[self.current_scene_id]
         
-        # Prepare the scene response
-        scene_response = {
-            "scene_id": self.current_scene_id,
+        # Update game state (only when entering changes it, so re-renders log nothing)
+        location = scene.get("location", "")
+        if (not self._visited & self.scene_graph.bit(self.current_scene_id)
+                or self.game_state["current_location"] != location):
+            self._emit("scene_entered", scene_id=self.current_scene_id, location=location)
+        
+        return scene
+    
+    def _cached_scene(self, scene_id: str, turn: int) -> Optional[Dict[str, Any]]:
+        """Get a scene already rendered for the given turn, with fresh scores"""
+        cached_scene = self._scene_cache.get((scene_id, turn))
+        if cached_scene is None:
+            return None
+        return dict(cached_scene, player_scores=self.scoring_engine.get_current_scores())
+    
+    def _cache_scene(self, scene_id: str, turn: int, scene_response: Dict[str, Any]) -> None:
+        """Store a rendered scene; renders for turns already played are dropped"""
+        self._scene_cache = {key: value for key, value in self._scene_cache.items() if key[1] >= self.turn}
+        self._scene_cache[(scene_id, turn)] = scene_response
+    
+    def _build_scene_response(self, scene_id: str, scene: Dict[str, Any], action_choices: List[str], 
+                              historical_context: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assemble the scene information returned to the caller"""
+        return {
+            "scene_id": scene_id,
             "title": scene.get("title", "Untitled Scene"),
             "description": scene["description"],
             "location": scene.get("location", ""),
@@ -152,88 +286,228 @@ class GameOrchestrator:
             "historical_context": historical_context,
             "player_scores": self.scoring_engine.get_current_scores()
         }
+    
+    def get_current_scene(self) -> Dict[str, Any]:
+        """Get the current scene information with action choices
+        
+        Returns:
+            Scene information with generated action choices
+        """
+        if not self.current_scene_id or self.current_scene_id not in self.scenes:
+            return {
+                "error": "No valid scene available",
+                "description": "The game has not been properly initialized."
+            }
+        
+        # Get the current scene
+        scene = self._enter_current_scene()
+        
+        # Reuse the scene already rendered this turn
+        cached_scene = self._cached_scene(self.current_scene_id, self.turn)
+        if cached_scene is not None:
+            telemetry.count("scene_renders", source="turn_cache")
+            return cached_scene
+        
+        # Use the speculative render if there is one, otherwise render now
+        key = self._prefetch_key(self.current_scene_id)
+        with telemetry.span("scene.prefetch_take"):
+            prepared = self.prefetcher.take(key) if self.prefetcher else None
+        source = "prefetch"
+        if prepared is None:
+            source = "render"
+            with telemetry.span("scene.render", scene_id=self.current_scene_id):
+                prepared = self._prepare_scene(key)
+        telemetry.count("scene_renders", source=source)
+        historical_context, action_choices = prepared
+        
+        # Prepare the scene response
+        scene_response = self._build_scene_response(self.current_scene_id, scene, action_choices, historical_context)
+        self._cache_scene(self.current_scene_id, self.turn, scene_response)
+        
+        # Prepare the possible next scenes while the player decides
+        self._speculate_successors(self.current_scene_id)
         
         return scene_response
     
-    def process_player_action(self, action_index: int, custom_action: Optional[str] = None) -> Dict[str, Any]:
-        """Process the player's chosen action
+    def _apply_action(self, current_scene: Dict[str, Any], action_index: int, 
+                      custom_action: Optional[str] = None) -> Dict[str, Any]:
+        """Apply the game-state side of a player action (scores, behavior, next scene)
         
         Args:
+            current_scene: Scene information rendered this turn
             action_index: Index of the chosen action (0-3)
             custom_action: Optional custom action text
             
         Returns:
-            Result of the action with agent response
+            Action outcome, or a dictionary with an "error" key
         """
-        if not self.current_scene_id or self.current_scene_id not in self.scenes:
-            return {"error": "No valid scene available"}
-        
-        # Get the current scene
-        scene = self.scenes[self.current_scene_id]
-        
-        # Get the chosen action
-        current_scene = self.get_current_scene()
         actions = current_scene["actions"]
         
         if action_index < 0 or action_index >= len(actions):
             return {"error": "Invalid action index"}
         
+        scene = self.scenes[self.current_scene_id]
         chosen_action = actions[action_index]
         action_description = custom_action if custom_action else chosen_action
         
-        # Apply score effects for the action
-        score_effects = scene.get("score_effects", {}).get(str(action_index), {})
-        if not score_effects:
-            # Default minimal effects if none defined
-            score_effects = {"xp": 1}
+        # Apply score effects for the action (a minimal default if none are defined)
+        score_effects = self.scene_graph.effects(self.current_scene_id, action_index)
         
-        updated_scores = self.scoring_engine.apply_score_effects(
+        # Apply score effects and update agent behavior based on player action
+        updated_scores = self._emit(
+            "action_chosen",
             action_id=f"{self.current_scene_id}_{action_index}",
             effects=score_effects,
             description=action_description
         )
         
-        # Update agent behavior based on player action
-        self.behavior_controller.update_agent_state(
-            player_scores=updated_scores,
-            action_description=action_description
-        )
-        
-        # Generate agent response to the player's action
-        scene_context = {
-            "description": scene["description"],
-            "location": scene.get("location", ""),
-            "time_of_day": self.game_state["time_of_day"]
-        }
-        
-        agent_context = self.behavior_controller.get_prompt_context()
+        # Determine the next scene
+        next_scene_id = self.scene_graph.successor(self.current_scene_id, action_index)
         
-        agent_response = self.llm_agent.generate_response(
-            agent_context=agent_context,
-            scene_context=scene_context,
-            historical_context=current_scene["historical_context"],
-            player_message=f"I {action_description}"
-        )
+        # Stop speculating on the branches the player did not take
+        if self.prefetcher is not None:
+            self.prefetcher.resolve(self._prefetch_key(next_scene_id))
         
-        # Determine the next scene
-        next_scene_id = None
-        if "next_scene_map" in scene and str(action_index) in scene["next_scene_map"]:
-            next_scene_id = scene["next_scene_map"][str(action_index)]
+        return {
+            "scene": scene,
+            "action_description": action_description,
+            "updated_scores": updated_scores,
+            "next_scene_id": next_scene_id
+        }
+    
+    def _finish_action(self, outcome: Dict[str, Any], agent_response: str) -> Dict[str, Any]:
+        """Build the action result, then move to the next scene and end the turn"""
+        next_scene_id = outcome["next_scene_id"]
         
         # Prepare the action result
         action_result = {
-            "action_taken": action_description,
+            "action_taken": outcome["action_description"],
             "agent_response": agent_response,
-            "updated_scores": updated_scores,
+            "updated_scores": outcome["updated_scores"],
             "has_next_scene": next_scene_id is not None
         }
         
-        # Update the current scene if there's a next scene
-        if next_scene_id and next_scene_id in self.scenes:
-            self.current_scene_id = next_scene_id
+        if agent_response:
+            # Mirrors the agent, which records no exchange for a reply closed before any text
+            self.event_log.record({
+                "type": "agent_message",
+                "player_message": f"I {outcome['action_description']}",
+                "response": agent_response
+            })
+        
+        # Move to the next scene if there is one; the action ends the turn
+        self._emit("turn_ended", next_scene_id=next_scene_id)
         
         return action_result
     
+    def process_player_action(self, action_index: int, custom_action: Optional[str] = None) -> Dict[str, Any]:
+        """Process the player's chosen action
+        
+        Args:
+            action_index: Index of the chosen action (0-3)
+            custom_action: Optional custom action text
+            
+        Returns:
+            Result of the action with agent response
+        """
+        if not self.current_scene_id or self.current_scene_id not in self.scenes:
+            return {"error": "No valid scene available"}
+        
+        # Get the chosen action from the scene rendered this turn
+        current_scene = self.get_current_scene()
+        outcome = self._apply_action(current_scene, action_index, custom_action)
+        if "error" in outcome:
+            return outcome
+        
+        # Generate agent response to the player's action
+        with telemetry.span("action.response"):
+            agent_response = self.llm_agent.generate_response(
+                agent_context=self.behavior_controller.get_prompt_context(),
+                scene_context=self._scene_context(outcome["scene"]),
+                historical_context=current_scene["historical_context"],
+                player_message=f"I {outcome['action_description']}"
+            )
+        
+        return self._finish_action(outcome, agent_response)
+    
+    def _action_event(self, outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """First event of a streamed action: the scores and where the story goes next"""
+        next_scene_id = outcome["next_scene_id"]
+        next_scene = self.scenes.get(next_scene_id, {}) if next_scene_id else {}
+        return {
+            "type": "action",
+            "action_taken": outcome["action_description"],
+            "updated_scores": outcome["updated_scores"],
+            "has_next_scene": next_scene_id is not None,
+            "next_scene_id": next_scene_id,
+            "next_scene_title": next_scene.get("title"),
+            "next_scene_location": next_scene.get("location")
+        }
+    
+    def process_player_action_stream(self, action_index: int,
+                                     custom_action: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Process the player's chosen action, streaming the companion's response
+        
+        Events, in order:
+            {"type": "action", ...}: updated scores and the next scene, as soon as the action is applied
+            {"type": "token", "text": ...}: each chunk of the companion's reply
+            {"type": "done", "result": ..., "first_token_ms": ..., "total_ms": ...}: the
+                same result as process_player_action, with the time to the first chunk and
+                to the end of the reply
+        An invalid action yields a single {"type": "error", "error": ...} event. If the
+        stream is closed early, even right after the action event, the turn ends with
+        the part of the reply received.
+        
+        Args:
+            action_index: Index of the chosen action (0-3)
+            custom_action: Optional custom action text
+            
+        Yields:
+            Event dictionaries
+        """
+        if not self.current_scene_id or self.current_scene_id not in self.scenes:
+            yield {"type": "error", "error": "No valid scene available"}
+            return
+        
+        current_scene = self.get_current_scene()
+        outcome = self._apply_action(current_scene, action_index, custom_action)
+        if "error" in outcome:
+            yield {"type": "error", "error": outcome["error"]}
+            return
+        
+        first_token = None
+        chunks: List[str] = []
+        tokens = self.llm_agent.iter_response(
+            agent_context=self.behavior_controller.get_prompt_context(),
+            scene_context=self._scene_context(outcome["scene"]),
+            historical_context=current_scene["historical_context"],
+            player_message=f"I {outcome['action_description']}"
+        )
+        # The action is applied, so the turn must end even if the stream is closed at its first event
+        try:
+            yield self._action_event(outcome)
+            start = time.perf_counter()
+            for text in tokens:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                chunks.append(text)
+                yield {"type": "token", "text": text}
+        finally:
+            tokens.close()
+            result = self._finish_action(outcome, "".join(chunks))
+        
+        yield self._done_event(result, first_token, time.perf_counter() - start)
+    
+    @staticmethod
+    def _done_event(result: Dict[str, Any], first_token: Optional[float], total: float) -> Dict[str, Any]:
+        """Last event of a streamed action, with the reply's time to first chunk and total time"""
+        return {
+            "type": "done",
+            "result": result,
+            "first_token_ms": first_token * 1000 if first_token is not None else None,
+            "total_ms": total * 1000
+        }
+    
     def advance_to_next_scene(self) -> Dict[str, Any]:
         """Advance to the next scene after player action
         
@@ -242,9 +516,112 @@ class GameOrchestrator:
         """
         return self.get_current_scene()
     
+    def _emit(self, event_type: str, **data) -> Any:
+        """Record a state-changing event for the next save and apply it"""
+        event = dict(data, type=event_type)
+        self.event_log.record(event)
+        return self._apply_event(event)
+    
+    def _apply_event(self, event: Dict[str, Any]) -> Any:
+        """Apply one event to the game state (live, or when replaying a save)"""
+        event_type = event["type"]
+        if event_type == "scene_entered":
+            bit = self.scene_graph.bit(event["scene_id"])
+            if not self._visited & bit:
+                self.game_state["visited_scenes"].append(event["scene_id"])
+                self._visited |= bit
+            self.game_state["current_location"] = event["location"]
+        elif event_type == "action_chosen":
+            with telemetry.span("action.scoring", action_id=event["action_id"]):
+                updated_scores = self.scoring_engine.apply_score_effects(
+                    action_id=event["action_id"],
+                    effects=event["effects"],
+                    description=event["description"]
+                )
+            with telemetry.span("action.behavior_update"):
+                self.behavior_controller.update_agent_state(
+                    player_scores=updated_scores,
+                    action_description=event["description"]
+                )
+            return updated_scores
+        elif event_type == "agent_message":
+            # Recorded by the agent itself during play; only replayed from saves, into the replay memory
+            memory = self._replay_memory if self._replay_memory is not None else self.llm_agent.memory
+            memory.append(_chat_message(event["player_message"], "user"))
+            memory.append(_chat_message(event["response"], "assistant"))
+        elif event_type == "turn_ended":
+            next_scene_id = event["next_scene_id"]
+            if next_scene_id and next_scene_id in self.scenes:
+                self.current_scene_id = next_scene_id
+            self.turn += 1
+        return None
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        """Full game state for a save snapshot"""
+        return {
+            "player_name": self.player_name,
+            "current_scene_id": self.current_scene_id,
+            "turn": self.turn,
+            "game_state": self.game_state,
+            "alignment": self.scoring_engine.alignment.dict(),
+            "action_history": self.scoring_engine.action_history.to_dict(),
+            "agent_memory": self.behavior_controller.memory.dict(),
+            "conversation_history": [
+                [message.role, message.content] for message in self.llm_agent.memory.recent()
+            ],
+            "conversation_backlog": [
+                [message.role, message.content] for message in self.llm_agent.memory.backlog()
+            ],
+            "conversation_summary": self.llm_agent.memory.summary
+        }
+    
+    def _restore_snapshot(self, save_data: Dict[str, Any], memory: ConversationMemory) -> None:
+        """Replace the game state with a save snapshot
+
+        Args:
+            save_data: Snapshot written by _snapshot
+            memory: Conversation memory receiving the companion's conversation
+        """
+        self.player_name = save_data.get("player_name", "Player")
+        self.current_scene_id = save_data.get("current_scene_id")
+        self.game_state = save_data.get("game_state", {})
+        self.turn = save_data.get("turn", 0)
+        self._scene_cache = {}
+        self._visited = 0
+        for scene_id in self.game_state.get("visited_scenes", []):
+            self._visited |= self.scene_graph.bit(scene_id)
+        
+        # Restore scoring engine state
+        alignment_data = save_data.get("alignment", {})
+        action_history = save_data.get("action_history", {})
+        
+        self.scoring_engine = ScoringEngine()
+        self.scoring_engine.alignment = self.scoring_engine.alignment.__class__(**alignment_data)
+        if isinstance(action_history, list):
+            # Older saves store one full record per action
+            self.scoring_engine.action_history = ActionHistory.from_records(action_history)
+        else:
+            self.scoring_engine.action_history = ActionHistory.from_dict(action_history)
+        
+        # Restore agent memory
+        agent_memory_data = save_data.get("agent_memory", {})
+        self.behavior_controller = BehaviorController()
+        self.behavior_controller.memory = self.behavior_controller.memory.__class__(**agent_memory_data)
+        
+        # Restore the companion's conversation (missing from older saves)
+        memory.restore(
+            [_chat_message(content, role) for role, content in save_data.get("conversation_history", [])],
+            save_data.get("conversation_summary", ""),
+            [_chat_message(content, role) for role, content in save_data.get("conversation_backlog", [])]
+        )
+    
     def save_game(self, save_path: str = "./data/save_game.json") -> bool:
         """Save the current game state
         
+        Only the events since the previous save are appended to the save's
+        event log; a full snapshot is written for the first save to a path
+        and whenever the log grows past SAVE_SNAPSHOT_INTERVAL events.
+        
         Args:
             save_path: Path to save the game state
             
@@ -252,23 +629,7 @@ class GameOrchestrator:
             True if save successful, False otherwise
         """
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            
-            # Prepare save data
-            save_data = {
-                "player_name": self.player_name,
-                "current_scene_id": self.current_scene_id,
-                "game_state": self.game_state,
-                "alignment": self.scoring_engine.alignment.dict(),
-                "action_history": self.scoring_engine.action_history,
-                "agent_memory": self.behavior_controller.memory.dict()
-            }
-            
-            # Save to file
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2)
-            
+            self.event_log.save(save_path, self._snapshot)
             return True
         except Exception as e:
             print(f"Error saving game: {e}")
@@ -287,27 +648,23 @@ class GameOrchestrator:
             if not os.path.exists(save_path):
                 return False
             
-            # Load save data
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            # Restore game state
-            self.player_name = save_data.get("player_name", "Player")
-            self.current_scene_id = save_data.get("current_scene_id")
-            self.game_state = save_data.get("game_state", {})
-            
-            # Restore scoring engine state
-            alignment_data = save_data.get("alignment", {})
-            action_history = save_data.get("action_history", [])
-            
-            self.scoring_engine = ScoringEngine()
-            self.scoring_engine.alignment = self.scoring_engine.alignment.__class__(**alignment_data)
-            self.scoring_engine.action_history = action_history
-            
-            # Restore agent memory
-            agent_memory_data = save_data.get("agent_memory", {})
-            self.behavior_controller = BehaviorController()
-            self.behavior_controller.memory = self.behavior_controller.memory.__class__(**agent_memory_data)
+            # Restore the last snapshot, then replay the events saved after it. The
+            # conversation is rebuilt in a memory that folds inline and extractively,
+            # so loading never waits on (or pays for) LLM summarization calls.
+            save_data, events = self.event_log.load(save_path)
+            self._replay_memory = ConversationMemory(
+                max_messages=self.llm_agent.memory.max_messages,
+                summary_tokens=self.llm_agent.memory.summary_tokens,
+                background=False
+            )
+            try:
+                self._restore_snapshot(save_data, self._replay_memory)
+                for event in events:
+                    self._apply_event(event)
+                replayed = self._replay_memory
+            finally:
+                self._replay_memory = None
+            self.llm_agent.memory.restore(replayed.recent(), replayed.summary)
             
             return True
         except Exception as e:
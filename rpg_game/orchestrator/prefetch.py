@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from rpg_game.config import PREFETCH_WORKERS
+from rpg_game.telemetry.telemetry import log
+
+# Render threads shared by the prefetchers of every game in the process
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _prefetch_executor() -> ThreadPoolExecutor:
+    """Background pool for speculative scene renders, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="scene-prefetch")
+        return _executor
+
+
+class ScenePrefetcher:
+    """Speculatively renders successor scenes on a shared, bounded thread pool
+
+    While the player decides, every reachable successor is rendered (RAG
+    context plus action choices) from a snapshot of the game state taken
+    when the speculation starts. When the choice arrives, queued renders of
+    the other branches are cancelled and running ones are counted as wasted
+    work. Finished renders stay in a bounded LRU cache keyed by scene.
+    """
+
+    def __init__(self, render: Callable[[Hashable, Any], Any], cache_size: int = 16):
+        """Initialize the prefetcher
+
+        Args:
+            render: Function producing the prepared content for a key from a state snapshot
+            cache_size: Maximum number of renders kept (pending ones are never evicted)
+        """
+        self._render = render
+        self.cache_size = cache_size
+        self._entries: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._outstanding = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.cancelled = 0
+
+    def speculate(self, keys: Iterable[Hashable], snapshot: Any = None) -> None:
+        """Start rendering every key that is not already cached or in flight
+
+        Args:
+            keys: Candidate keys for the upcoming decision
+            snapshot: Copy of the state the renders read, so they never see the game change under them
+        """
+        executor = _prefetch_executor()
+        with self._lock:
+            for key in keys:
+                self._outstanding.add(key)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    continue
+                self._entries[key] = executor.submit(self._render, key, snapshot)
+            self._evict()
+
+    def resolve(self, chosen: Optional[Hashable]) -> None:
+        """Settle the current decision: drop the speculation for unchosen branches
+
+        Args:
+            chosen: Key the player's choice leads to (None if no successor)
+        """
+        with self._lock:
+            for key in self._outstanding:
+                if key == chosen:
+                    continue
+                future = self._entries.get(key)
+                if future is None:
+                    continue
+                if future.cancel():
+                    self.cancelled += 1
+                    del self._entries[key]
+                else:
+                    self.wasted += 1
+            self._outstanding = set()
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """Get the prepared content for a key, waiting if its render is still running
+
+        Returns:
+            The rendered content, or None if the key was never speculated or failed
+        """
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self._entries.move_to_end(key)
+        if future is None or future.cancelled():
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            result = future.result()
+        except Exception as e:
+            log(f"Error in speculative scene render: {e}", "warning")
+            with self._lock:
+                self.misses += 1
+                if self._entries.get(key) is future:
+                    del self._entries[key]
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def _evict(self) -> None:
+        # Oldest first, never dropping a render the current decision may need
+        for key in list(self._entries):
+            if len(self._entries) <= self.cache_size:
+                break
+            if key not in self._outstanding:
+                self._entries[key].cancel()
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Forget all renders (e.g. when a new game starts)"""
+        with self._lock:
+            for future in self._entries.values():
+                future.cancel()
+            self._entries.clear()
+            self._outstanding = set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/wasted-work counters
+
+        Returns:
+            Dictionary with counters and the current cache size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "wasted": self.wasted,
+                "cancelled": self.cancelled,
+                "cached": len(self._entries)
+            }
+
+    def shutdown(self) -> None:
+        """Cancel this prefetcher's pending renders (the shared worker threads keep running)"""
+        self.clear()
@@ -0,0 +1,147 @@
+"""Historical context of every scene, retrieved once at build time
+
+A scene's ``rag_context_query`` and ``rag_filter_tags`` are static, so its
+retrieval result only changes when the game data, the historical data or
+the retrieval setup does. This build step runs every scene's retrieval
+and stores the passages next to the compiled scene graphs, keyed by a hash
+of both JSON files, the embedding model, the backend, the retrieval mode
+and top_k; at runtime the orchestrator serves them without loading the
+embedding model. Scenes whose query differs from the one baked in are
+retrieved live.
+
+Corpora added with rpg_game.rag.ingest aren't part of the key; rebuild
+after ingesting.
+
+Usage:
+    python -m rpg_game.orchestrator.scene_context
+    python -m rpg_game.orchestrator.scene_context --game-data data/game_data.json
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from typing import Dict, Any, List, Optional
+
+from rpg_game.config import (
+    EMBEDDING_MODEL, HISTORICAL_DATA_PATH, RAG_BACKEND, RAG_RETRIEVAL_MODE, RAG_TOP_K, SCENE_GRAPH_CACHE_DIR
+)
+from rpg_game.telemetry.telemetry import log
+
+# Bump when the artifact layout changes so stale artifacts are ignored
+SCENE_CONTEXT_FORMAT_VERSION = 1
+
+
+def _file_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def scene_context_path(game_data_path: str, historical_data_path: str = HISTORICAL_DATA_PATH,
+                       cache_dir: str = SCENE_GRAPH_CACHE_DIR, embedding_model: str = EMBEDDING_MODEL,
+                       backend: str = RAG_BACKEND, mode: str = RAG_RETRIEVAL_MODE, top_k: int = RAG_TOP_K) -> str:
+    """Path of the artifact for the current game data, historical data and retrieval setup"""
+    digest = hashlib.sha256("\0".join([
+        _file_digest(game_data_path), _file_digest(historical_data_path), embedding_model, backend, mode, str(top_k)
+    ]).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"scene_context_v{SCENE_CONTEXT_FORMAT_VERSION}_{digest}.json")
+
+
+def load_scene_contexts(game_data_path: str, historical_data_path: str = HISTORICAL_DATA_PATH,
+                        cache_dir: str = SCENE_GRAPH_CACHE_DIR) -> Dict[str, Dict[str, Any]]:
+    """Load the precomputed contexts matching the current data, if they have been built
+
+    Returns:
+        Scene id -> {"query", "filter_tags", "passages"} (empty if there is no up-to-date artifact)
+    """
+    try:
+        path = scene_context_path(game_data_path, historical_data_path, cache_dir)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)["scenes"]
+    except Exception as e:
+        log(f"Error loading precomputed scene contexts: {e}", "warning")
+        return {}
+
+
+def precomputed_passages(contexts: Dict[str, Dict[str, Any]], scene_id: str,
+                         scene: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Baked passages of a scene, or None if the scene's query or tags differ from the baked ones
+
+    Returns:
+        Copies of the passages, or None to retrieve live
+    """
+    context = contexts.get(scene_id)
+    if context is None or context["query"] != scene.get("rag_context_query") \
+            or context["filter_tags"] != scene.get("rag_filter_tags"):
+        return None
+    return [dict(passage) for passage in context["passages"]]
+
+
+def build_scene_contexts(game_data_path: str, cache_dir: str = SCENE_GRAPH_CACHE_DIR,
+                         retriever=None) -> Dict[str, Any]:
+    """Retrieve the context of every scene and write the artifact
+
+    The retriever indexes HISTORICAL_DATA_PATH, so that file is part of the key.
+
+    Args:
+        game_data_path: Path to the game data JSON file
+        cache_dir: Directory of the compiled scene artifacts
+        retriever: Retriever to use (the configured backend if None)
+
+    Returns:
+        Artifact path, number of scenes and seconds taken
+    """
+    from rpg_game.orchestrator.scene_graph import load_scene_graph
+    from rpg_game.rag.factory import create_retriever
+
+    start = time.perf_counter()
+    graph = load_scene_graph(game_data_path, cache_dir=None)
+    if retriever is None:
+        retriever = create_retriever(coalesce=False)
+
+    contexts = {}
+    for compiled in graph.scenes:
+        scene = compiled.data
+        if "rag_context_query" not in scene:
+            continue
+        filter_tags = scene.get("rag_filter_tags")
+        passages = retriever.retrieve(query=scene["rag_context_query"], top_k=RAG_TOP_K, filter_tags=filter_tags)
+        if not passages:
+            # Retrievers return nothing on errors too; leave the scene to live retrieval
+            log(f"No context retrieved for scene '{compiled.key}', it will be retrieved live", "warning")
+            continue
+        contexts[compiled.key] = {"query": scene["rag_context_query"], "filter_tags": filter_tags,
+                                  "passages": passages}
+
+    path = scene_context_path(game_data_path, HISTORICAL_DATA_PATH, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"embedding_model": EMBEDDING_MODEL, "backend": RAG_BACKEND, "mode": RAG_RETRIEVAL_MODE,
+                   "top_k": RAG_TOP_K, "scenes": contexts}, f)
+    os.replace(tmp_path, path)
+    return {"path": path, "scenes": len(contexts), "seconds": time.perf_counter() - start}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Precompute the historical context of every scene")
+    parser.add_argument("--game-data", default="./data/game_data.json")
+    parser.add_argument("--cache-dir", default=SCENE_GRAPH_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    for path in (args.game_data, HISTORICAL_DATA_PATH):
+        if not os.path.exists(path):
+            log(f"File not found at {path}", "error")
+            return 1
+
+    result = build_scene_contexts(args.game_data, args.cache_dir)
+    log(f"Precomputed context for {result['scenes']} scenes in {result['seconds']:.2f}s -> {result['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import os
+import json
+import pickle
+import hashlib
+from collections import deque
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+from rpg_game.config import SCENE_GRAPH_CACHE_DIR
+from rpg_game.telemetry.telemetry import log
+
+# Bump when the compiled layout changes so stale cache artifacts are ignored
+SCENE_GRAPH_FORMAT_VERSION = 2
+
+# Effects applied when a scene defines none for the chosen action
+DEFAULT_SCORE_EFFECTS = {"xp": 1}
+
+
+class CompiledScene(NamedTuple):
+    """One scene with its per-action data indexed by action position"""
+    index: int
+    key: str
+    data: Dict[str, Any]
+    effects: Tuple[Dict[str, Any], ...]
+    successor_keys: Tuple[Optional[str], ...]
+    successors: Tuple[int, ...]  # Scene index per action, -1 for none or a missing scene
+
+
+class SceneGraph:
+    """Read-only scene graph compiled from game data
+
+    Scenes get integer indexes, and each scene's score effects and
+    successors become tuples indexed by action position, replacing the
+    string-keyed ``score_effects``/``next_scene_map`` lookups. A visited set
+    can be kept as an integer bitset using ``bit(scene_key)``. ``contexts``
+    holds the scenes' precomputed historical context, when it has been built
+    (see rpg_game.orchestrator.scene_context).
+    """
+
+    def __init__(self, scenes: List[CompiledScene], start: Optional[str], problems: List[str]):
+        self.scenes = tuple(scenes)
+        self.index = {scene.key: scene.index for scene in scenes}
+        self.by_key = {scene.key: scene.data for scene in scenes}
+        self.start = start
+        self.problems = problems
+        self.contexts: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.scenes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def bit(self, key: str) -> int:
+        """Bit of a scene in a visited-scenes bitset (0 for unknown scenes)"""
+        index = self.index.get(key)
+        return 0 if index is None else 1 << index
+
+    def effects(self, key: str, action_index: int) -> Dict[str, Any]:
+        """Score effects of an action (the default effects if none are defined)"""
+        effects = self.scenes[self.index[key]].effects
+        return effects[action_index] if 0 <= action_index < len(effects) else DEFAULT_SCORE_EFFECTS
+
+    def successor(self, key: str, action_index: int) -> Optional[str]:
+        """Scene named as the next scene of an action (may be missing from the graph)"""
+        successor_keys = self.scenes[self.index[key]].successor_keys
+        return successor_keys[action_index] if 0 <= action_index < len(successor_keys) else None
+
+    def successors(self, key: str) -> List[str]:
+        """Distinct existing scenes reachable in one action, sorted"""
+        return sorted({self.scenes[index].key for index in self.scenes[self.index[key]].successors if index >= 0})
+
+
+def compile_scene_graph(game_data: Dict[str, Any]) -> SceneGraph:
+    """Compile parsed game data into a scene graph and validate it
+
+    Dangling ``next_scene_map`` targets and scenes unreachable from the
+    starting scene are reported in ``problems`` (and summarized); the targets
+    are kept, so the game behaves exactly as with the raw data.
+
+    Args:
+        game_data: Parsed game_data.json
+
+    Returns:
+        Compiled scene graph
+    """
+    raw_scenes = game_data.get("scenes", {})
+    index = {key: i for i, key in enumerate(raw_scenes)}
+    problems = []
+
+    scenes = []
+    for key, scene in raw_scenes.items():
+        score_effects = scene.get("score_effects", {})
+        next_scene_map = scene.get("next_scene_map", {})
+        action_count = max(
+            [len(scene.get("actions", []))] + [int(action) + 1 for action in list(score_effects) + list(next_scene_map)]
+        )
+        effects = tuple(score_effects.get(str(action)) or DEFAULT_SCORE_EFFECTS for action in range(action_count))
+        successor_keys = tuple(next_scene_map.get(str(action)) for action in range(action_count))
+        for action, target in enumerate(successor_keys):
+            if target is not None and target not in index:
+                problems.append(f"Scene '{key}' action {action} leads to missing scene '{target}'")
+        successors = tuple(index.get(target, -1) if target is not None else -1 for target in successor_keys)
+        scenes.append(CompiledScene(index[key], key, scene, effects, successor_keys, successors))
+
+    start = game_data.get("starting_scene")
+    if start is not None and start not in index:
+        problems.append(f"Starting scene '{start}' is missing")
+        start = None
+    if start is None and scenes:
+        start = scenes[0].key
+
+    if start is not None:
+        reached = {index[start]}
+        queue = deque(reached)
+        while queue:
+            for successor in scenes[queue.popleft()].successors:
+                if successor >= 0 and successor not in reached:
+                    reached.add(successor)
+                    queue.append(successor)
+        problems.extend(f"Scene '{scene.key}' is unreachable from '{start}'"
+                        for scene in scenes if scene.index not in reached)
+
+    if problems:
+        log(f"Scene graph: {len(problems)} problems (see SceneGraph.problems), first: {problems[0]}", "warning")
+
+    return SceneGraph(scenes, start, problems)
+
+
+def load_scene_graph(game_data_path: str, cache_dir: Optional[str] = SCENE_GRAPH_CACHE_DIR) -> SceneGraph:
+    """Load a compiled scene graph, compiling and caching it on first use
+
+    The cache artifact is keyed by a hash of the JSON file's bytes, so edits
+    to the game data are picked up and unchanged data skips JSON parsing.
+    Precomputed scene contexts in the same directory are attached if they
+    match the current data.
+
+    Args:
+        game_data_path: Path to the game data JSON file
+        cache_dir: Directory for compiled artifacts (None disables caching)
+
+    Returns:
+        Compiled scene graph
+    """
+    graph = _load_compiled(game_data_path, cache_dir)
+    if cache_dir:
+        from rpg_game.orchestrator.scene_context import load_scene_contexts
+        graph.contexts = load_scene_contexts(game_data_path, cache_dir=cache_dir)
+    return graph
+
+
+def _load_compiled(game_data_path: str, cache_dir: Optional[str]) -> SceneGraph:
+    """Read the compiled scene graph artifact, or compile the JSON file and write one"""
+    with open(game_data_path, 'rb') as f:
+        raw = f.read()
+
+    cache_path = None
+    if cache_dir:
+        digest = hashlib.sha256(raw).hexdigest()
+        cache_path = os.path.join(cache_dir, f"scene_graph_v{SCENE_GRAPH_FORMAT_VERSION}_{digest}.pickle")
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    return pickle.load(f)
+            except Exception as e:
+                log(f"Error reading compiled scene graph, recompiling: {e}", "warning")
+
+    graph = compile_scene_graph(json.loads(raw.decode('utf-8')))
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            log(f"Error caching compiled scene graph: {e}", "warning")
+
+    return graph
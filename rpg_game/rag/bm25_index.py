@@ -0,0 +1,228 @@
+import os
+import re
+import json
+import hashlib
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rpg_game.config import BM25_K1, BM25_B
+
+# Bump when tokenization or the stored layout changes so saved indexes are rebuilt
+BM25_FORMAT_VERSION = 1
+
+# Values of RAG_RETRIEVAL_MODE
+RETRIEVAL_MODES = ("vector", "hybrid", "lexical")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "had", "has", "have", "he", "her", "his",
+    "in", "into", "is", "it", "its", "of", "on", "or", "she", "that", "the", "their", "them", "they", "this",
+    "to", "was", "were", "which", "who", "with"
+))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with a plural "s" stripped"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def corpus_fingerprint(entries: Iterable[Tuple[str, str]]) -> str:
+    """Hash of (document id, content fingerprint) pairs in index order"""
+    digest = hashlib.sha256(f"bm25-v{BM25_FORMAT_VERSION}".encode("utf-8"))
+    for doc_id, fingerprint in entries:
+        digest.update(f"\0{doc_id}\0{fingerprint}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int) -> List[Hashable]:
+    """Merge ranked lists of keys by reciprocal rank fusion
+
+    Each key scores the sum of 1 / (k + rank) over the lists it appears
+    in (rank starting at 1); ties keep the order of first appearance.
+
+    Args:
+        rankings: Ranked lists of keys, best first
+        k: Damping constant (larger values flatten the rank weights)
+
+    Returns:
+        Keys ordered by fused score, best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+class BM25Index:
+    """In-process BM25 index with postings in flat numpy arrays
+
+    Documents are tokenized once at build time. Postings are stored CSR
+    style: the postings of term ``t`` are ``doc_ids[offsets[t]:offsets[t+1]]``
+    with matching ``term_freqs``, so a query only touches the postings of
+    its own terms. Documents are addressed by position; ``ids`` maps a
+    position back to the document id of the retriever it serves.
+    """
+
+    def __init__(self, ids: List[str], vocabulary: Dict[str, int], offsets: np.ndarray, doc_ids: np.ndarray,
+                 term_freqs: np.ndarray, doc_lengths: np.ndarray, fingerprint: str = "",
+                 k1: float = BM25_K1, b: float = BM25_B):
+        """Initialize the index from its arrays (use build or load)"""
+        self.ids = ids
+        self.positions = {doc_id: position for position, doc_id in enumerate(ids)}
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.fingerprint = fingerprint
+        self.k1 = k1
+        self.b = b
+
+        n_docs = len(ids)
+        document_frequency = np.diff(offsets).astype(np.float32)
+        self.idf = np.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        average_length = float(doc_lengths.mean()) if n_docs else 1.0
+        # Per-document part of the BM25 denominator, computed once
+        self._length_norm = (k1 * (1 - b + b * doc_lengths / max(average_length, 1e-9))).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, ids: List[str], texts: List[str], fingerprint: str = "", k1: float = BM25_K1,
+              b: float = BM25_B) -> "BM25Index":
+        """Tokenize documents and build the index
+
+        Args:
+            ids: Document id per position
+            texts: Text to index per position (e.g. title and body)
+            fingerprint: Corpus fingerprint stored with the index
+            k1: Term frequency saturation
+            b: Document length normalization
+
+        Returns:
+            Built index
+        """
+        vocabulary: Dict[str, int] = {}
+        postings: List[Dict[int, int]] = []
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+        for position, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths[position] = len(tokens)
+            counts: Dict[int, int] = {}
+            for token in tokens:
+                term = vocabulary.setdefault(token, len(vocabulary))
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                if term == len(postings):
+                    postings.append({})
+                postings[term][position] = count
+
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(term_postings) for term_postings in postings])
+        doc_ids = np.empty(offsets[-1], dtype=np.int32)
+        term_freqs = np.empty(offsets[-1], dtype=np.float32)
+        for term, term_postings in enumerate(postings):
+            start = offsets[term]
+            doc_ids[start:start + len(term_postings)] = list(term_postings)
+            term_freqs[start:start + len(term_postings)] = list(term_postings.values())
+        return cls(ids, vocabulary, offsets, doc_ids, term_freqs, doc_lengths, fingerprint, k1, b)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for a query (zeros if no term matches)"""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for token in set(tokenize(query)):
+            term = self.vocabulary.get(token)
+            if term is None:
+                continue
+            start, end = self.offsets[term], self.offsets[term + 1]
+            docs = self.doc_ids[start:end]
+            freqs = self.term_freqs[start:end]
+            scores[docs] += self.idf[term] * freqs * (self.k1 + 1) / (freqs + self._length_norm[docs])
+        return scores
+
+    def search(self, query: str, top_k: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Best-scoring document positions for a query
+
+        Args:
+            query: Query text
+            top_k: Number of positions to return
+            positions: Positions allowed in the result (all if None)
+
+        Returns:
+            Up to top_k positions with a positive score, best first
+        """
+        scores = self.scores(query)
+        if positions is not None:
+            allowed = np.zeros(len(scores), dtype=bool)
+            allowed[positions] = True
+            scores[~allowed] = 0.0
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        return matched[np.argsort(-scores[matched], kind="stable")]
+
+    def save(self, directory: str) -> None:
+        """Write the index to ``<directory>/bm25.npz`` and ``bm25.json``"""
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, "bm25.tmp.npz")
+        np.savez(tmp_path, offsets=self.offsets, doc_ids=self.doc_ids, term_freqs=self.term_freqs,
+                 doc_lengths=self.doc_lengths)
+        os.replace(tmp_path, os.path.join(directory, "bm25.npz"))
+        tmp_path = os.path.join(directory, "bm25.json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": BM25_FORMAT_VERSION, "fingerprint": self.fingerprint, "k1": self.k1,
+                       "b": self.b, "ids": self.ids, "vocabulary": self.vocabulary}, f)
+        os.replace(tmp_path, os.path.join(directory, "bm25.json"))
+
+    @classmethod
+    def load(cls, directory: str, fingerprint: str, k1: float = BM25_K1, b: float = BM25_B) -> Optional["BM25Index"]:
+        """Load a saved index if it was built from the same corpus with the same parameters
+
+        Returns:
+            The index, or None if it is missing or stale
+        """
+        try:
+            with open(os.path.join(directory, "bm25.json"), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get("version"), meta.get("fingerprint"), meta.get("k1"), meta.get("b")) \
+                    != (BM25_FORMAT_VERSION, fingerprint, k1, b):
+                return None
+            with np.load(os.path.join(directory, "bm25.npz")) as arrays:
+                return cls(meta["ids"], meta["vocabulary"], arrays["offsets"], arrays["doc_ids"],
+                           arrays["term_freqs"], arrays["doc_lengths"], fingerprint, k1, b)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def load_or_build(cls, directory: str, fingerprint: str,
+                      corpus: Callable[[], Tuple[List[str], List[str]]]) -> "BM25Index":
+        """Load the saved index for a corpus, or build and save it
+
+        Args:
+            directory: Directory of the saved index
+            fingerprint: Corpus fingerprint (see corpus_fingerprint)
+            corpus: Returns (ids, texts) per position; only called when building
+
+        Returns:
+            Index over the corpus
+        """
+        index = cls.load(directory, fingerprint)
+        if index is None:
+            ids, texts = corpus()
+            index = cls.build(ids, texts, fingerprint)
+            try:
+                index.save(directory)
+            except OSError as e:
+                print(f"Error saving BM25 index: {e}")
+        return index
@@ -0,0 +1,52 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+from rpg_game.config import RAG_TOP_K
+from rpg_game.concurrency.single_flight import SingleFlight, single_flight as shared_single_flight
+
+
+def retrieval_key(retriever: Any, query: str, top_k: int, filter_tags: Optional[List[str]]) -> Tuple[Any, ...]:
+    """Single-flight key of a retrieval: retriever identity, whitespace-normalized query, tag set and top_k
+
+    The single-flight layer is process-wide, so the retriever's identity keeps
+    retrievers over different indexes from receiving each other's passages.
+    """
+    tags = tuple(sorted({str(tag).strip() for tag in filter_tags if tag})) if filter_tags else ()
+    return ("rag", id(retriever), " ".join(query.split()), tags, top_k)
+
+
+class CoalescingRetriever:
+    """Retriever wrapper sharing one search between concurrent identical queries
+
+    Players on the same scene issue the same query with the same tags at the
+    same moment; only the first of them embeds and searches, the others wait
+    for its passages. Every caller gets its own list of passage copies.
+    Anything other than retrieve is delegated to the wrapped retriever.
+    """
+
+    def __init__(self, retriever: Any, single_flight: Optional[SingleFlight] = None):
+        """Initialize the wrapper
+
+        Args:
+            retriever: Retriever exposing retrieve(query, top_k, filter_tags)
+            single_flight: Coalescing layer (the process-wide one if None)
+        """
+        self.retriever = retriever
+        self.single_flight = single_flight or shared_single_flight
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.retriever, name)
+
+    def retrieve(self, query: str, top_k: int = RAG_TOP_K, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Retrieve relevant historical context, joining an identical retrieval in flight
+
+        Args:
+            query: The search query related to the current scene
+            top_k: Number of relevant passages to retrieve
+            filter_tags: Optional list of tags to filter results
+
+        Returns:
+            List of relevant historical context documents
+        """
+        passages = self.single_flight.do(retrieval_key(self.retriever, query, top_k, filter_tags), self.retriever.retrieve,
+                                         query, top_k, filter_tags)
+        return [dict(passage) for passage in passages]
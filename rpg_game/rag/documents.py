@@ -0,0 +1,34 @@
+import json
+import hashlib
+from typing import List, Dict, Any
+
+
+# Bump when the stored metadata layout changes, so existing rows get re-upserted
+METADATA_SCHEMA_VERSION = 2
+
+
+def document_id(doc: Dict[str, Any]) -> str:
+    """Stable id of a historical document (hash of its title and text)"""
+    return hashlib.sha256(f"{doc['title']}\0{doc['text']}".encode("utf-8")).hexdigest()
+
+
+def document_fingerprint(doc: Dict[str, Any]) -> str:
+    """Hash of everything stored for a document, used to detect changes"""
+    payload = json.dumps({
+        "schema": METADATA_SCHEMA_VERSION,
+        "title": doc["title"],
+        "text": doc["text"],
+        "tags": list(doc.get("tags", []))
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Helper function to load sample historical data
+def load_sample_data(file_path: str) -> List[Dict[str, Any]]:
+    """Load sample historical data from a JSON file"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading sample data: {e}")
+        return []
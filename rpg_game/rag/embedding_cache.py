@@ -0,0 +1,313 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends from several processes are not serialized
+    fcntl = None
+
+try:
+    from langchain.embeddings.base import Embeddings
+except ImportError:  # langchain is not needed by the NumPy retriever backend
+    Embeddings = object
+
+from rpg_game.config import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_SIZE
+
+
+def text_hash(model_name: str, text: str) -> str:
+    """Stable cache key for a text embedded with a given model"""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-memory LRU backed by an on-disk float32 matrix
+
+    The disk tier lives in ``<cache_dir>/<model>/`` as a raw float32 matrix
+    (``vectors.f32``, memory-mapped for reads), a JSON header with the
+    vector size and an append-only log (``index.log``) of ``<hash> <row>``
+    lines. Rows are taken from the matrix file's size at append time, so
+    processes sharing the cache don't overwrite each other's rows, and log
+    entries pointing past the end of the matrix are dropped on load.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = EMBEDDING_CACHE_PATH,
+                 memory_size: int = EMBEDDING_CACHE_SIZE):
+        """Initialize the cache for one embedding model
+
+        Args:
+            model_name: Name of the embedding model the vectors come from
+            cache_dir: Root directory of the on-disk tier (None disables it)
+            memory_size: Maximum number of vectors kept in the in-memory tier
+        """
+        self.model_name = model_name
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._dir = None
+        self._index: Dict[str, int] = {}
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+
+        if cache_dir:
+            self._dir = os.path.join(cache_dir, model_name.replace("/", "_"))
+            os.makedirs(self._dir, exist_ok=True)
+            self._load_index()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self._dir, "vectors.f32")
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self._dir, "index.json")
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self._dir, "index.log")
+
+    def _load_index(self) -> None:
+        """Load the hash index of the disk tier, if one exists"""
+        try:
+            if not os.path.exists(self._index_path):
+                return
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._dim = data.get("dim")
+            # Older caches kept every row in the header
+            index = dict(data.get("rows", {}))
+            if os.path.exists(self._log_path):
+                with open(self._log_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        parts = line.split()
+                        # A crash can leave a torn last line
+                        if len(parts) == 2 and parts[1].isdigit():
+                            index[parts[0]] = int(parts[1])
+            rows = os.path.getsize(self._vectors_path) // (4 * self._dim) \
+                if self._dim and os.path.exists(self._vectors_path) else 0
+            self._index = {key: row for key, row in index.items() if row < rows}
+        except Exception as e:
+            print(f"Error loading embedding cache index: {e}")
+            self._index = {}
+            self._dim = None
+
+    def _save_header(self) -> None:
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"model": self.model_name, "dim": self._dim}, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _append_rows(self, keys: List[str], matrix: np.ndarray) -> None:
+        """Append vectors to the matrix file and their rows to the index log
+
+        The file is locked while appending, so the first row is the file's
+        row count at that moment even when other processes append too.
+        """
+        row_bytes = 4 * self._dim
+        data = matrix.astype(np.float32).tobytes()
+        fd = os.open(self._vectors_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            size = os.fstat(fd).st_size
+            if size % row_bytes:
+                # Partial row left by a crash mid-append
+                size -= size % row_bytes
+                os.ftruncate(fd, size)
+            written = 0
+            while written < len(data):
+                written += os.write(fd, data[written:])
+            first_row = size // row_bytes
+
+            lines = "".join(f"{key} {first_row + i}\n" for i, key in enumerate(keys))
+            with open(self._log_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        finally:
+            os.close(fd)
+        for i, key in enumerate(keys):
+            self._index[key] = first_row + i
+
+    def _disk_row(self, row: int) -> Optional[np.ndarray]:
+        """Read one row from the memory-mapped disk tier"""
+        try:
+            if self._matrix is None or row >= self._matrix.shape[0]:
+                rows = os.path.getsize(self._vectors_path) // (4 * self._dim)
+                if row >= rows:
+                    return None
+                self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim))
+            return np.array(self._matrix[row])
+        except Exception as e:
+            print(f"Error reading embedding cache: {e}")
+            return None
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Look up the cached embedding of a text
+
+        Returns:
+            The embedding, or None on a cache miss
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up cached embeddings for several texts
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            One embedding per text, None for each miss
+        """
+        results: List[Optional[List[float]]] = []
+        with self._lock:
+            for text in texts:
+                key = text_hash(self.model_name, text)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                elif self._dir and key in self._index:
+                    vector = self._disk_row(self._index[key])
+                    if vector is not None:
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+                if vector is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    results.append(vector.tolist())
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """Store embeddings in both tiers
+
+        Args:
+            texts: Texts that were embedded
+            vectors: Their embeddings, in the same order
+        """
+        with self._lock:
+            new_rows: Dict[str, np.ndarray] = {}
+            for text, vector in zip(texts, vectors):
+                key = text_hash(self.model_name, text)
+                array = np.asarray(vector, dtype=np.float32)
+                self._remember(key, array)
+                if self._dir and key not in self._index:
+                    if self._dim is None:
+                        self._dim = int(array.shape[0])
+                    if array.shape[0] != self._dim:
+                        continue
+                    new_rows[key] = array
+
+            if new_rows:
+                try:
+                    if not os.path.exists(self._index_path):
+                        self._save_header()
+                    self._append_rows(list(new_rows), np.stack(list(new_rows.values())))
+                except Exception as e:
+                    print(f"Error writing embedding cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters
+
+        Returns:
+            Dictionary with hit counts per tier, misses and overall hit rate
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "model": self.model_name,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._index)
+            }
+
+
+class LazyEmbeddings(Embeddings):
+    """Embeddings wrapper that builds the underlying model on first use
+
+    Loading a sentence-transformers model takes seconds; with the cache in
+    front, a session whose queries are all cached never loads it at all.
+    """
+
+    def __init__(self, factory: Callable[[], Embeddings]):
+        """Wrap an embeddings factory
+
+        Args:
+            factory: Zero-argument callable returning the embeddings model
+        """
+        self._factory = factory
+        self._embeddings = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._embeddings is not None
+
+    def get(self) -> Embeddings:
+        """Get the underlying model, loading it if needed"""
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    self._embeddings = self._factory()
+        return self._embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.get().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.get().embed_query(text)
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings wrapper that consults an EmbeddingCache before encoding"""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        """Wrap an embeddings model with a cache
+
+        Args:
+            embeddings: Underlying embeddings model (e.g. HuggingFaceEmbeddings)
+            cache: Cache for the model's vectors
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, encoding only texts that are not cached"""
+        vectors = self.cache.get_many(texts)
+
+        # Encode each distinct missing text once
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            encoded = dict(zip(missing, self.embeddings.embed_documents(missing)))
+            self.cache.put_many(missing, [encoded[text] for text in missing])
+            vectors = [vector if vector is not None else list(encoded[text])
+                       for text, vector in zip(texts, vectors)]
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, skipping the model entirely on a cache hit"""
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = list(self.embeddings.embed_query(text))
+            self.cache.put_many([text], [vector])
+        return vector
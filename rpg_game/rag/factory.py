@@ -0,0 +1,29 @@
+from rpg_game.config import RAG_BACKEND, SINGLE_FLIGHT_ENABLED
+
+
+def create_retriever(backend: str = RAG_BACKEND, coalesce: bool = SINGLE_FLIGHT_ENABLED, **kwargs):
+    """Create the configured retriever backend
+
+    Only the selected backend's dependencies are imported, so the numpy
+    backend runs without chromadb or langchain installed.
+
+    Args:
+        backend: "chroma" for RAGRetriever or "numpy" for NumpyRetriever
+        coalesce: Wrap the retriever so concurrent identical queries share one search
+        **kwargs: Passed through to the retriever constructor
+
+    Returns:
+        Retriever exposing retrieve(query, top_k, filter_tags)
+    """
+    if backend == "numpy":
+        from rpg_game.rag.numpy_retriever import NumpyRetriever
+        retriever = NumpyRetriever(**kwargs)
+    elif backend == "chroma":
+        from rpg_game.rag.retriever import RAGRetriever
+        retriever = RAGRetriever(**kwargs)
+    else:
+        raise ValueError(f"Unknown RAG backend: {backend}")
+    if coalesce:
+        from rpg_game.rag.coalescing import CoalescingRetriever
+        retriever = CoalescingRetriever(retriever)
+    return retriever
@@ -0,0 +1,224 @@
+"""Streaming ingestion of historical documents into the RAG vector database
+
+Usage:
+    python -m rpg_game.rag.ingest data/historical_data.json
+    python -m rpg_game.rag.ingest corpus.jsonl --batch-size 256 --workers 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, TextIO
+
+from rpg_game.config import EMBEDDING_MODEL, INGEST_BATCH_SIZE
+
+_READ_CHUNK_SIZE = 1 << 16
+
+# Embedding model of a pool worker process, loaded once by _init_worker
+_worker_model = None
+
+
+def iter_json_array(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the elements of a top-level JSON array
+
+    Only one chunk of the file and the element being decoded are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace and separators between elements
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if not started and pos < len(buffer):
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array of documents")
+            started = True
+            pos += 1
+            continue
+        if started and pos < len(buffer) and buffer[pos] == "]":
+            return
+
+        if pos < len(buffer):
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # An element that ends exactly at the buffer edge may be truncated
+                if end < len(buffer) or eof:
+                    yield item
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+
+        if eof:
+            if started:
+                raise ValueError("Unterminated JSON array")
+            return
+
+        chunk = f.read(_READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_jsonl(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield one document per non-empty line of a JSON Lines file"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily read documents from a .json array or .jsonl file
+
+    Args:
+        path: Path to the corpus file
+
+    Returns:
+        Iterator over document dictionaries with 'title', 'text', and 'tags' keys
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = iter_jsonl if path.endswith((".jsonl", ".ndjson")) else iter_json_array
+        for doc in reader(f):
+            if "title" in doc and "text" in doc:
+                yield doc
+
+
+def iter_batches(documents: Iterator[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group an iterator of documents into fixed-size batches"""
+    batch = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _init_worker(model_name: str) -> None:
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode(texts: List[str]) -> List[List[float]]:
+    # Same preprocessing as HuggingFaceEmbeddings.embed_documents
+    texts = [text.replace("\n", " ") for text in texts]
+    return _worker_model.encode(texts).tolist()
+
+
+class StreamingIngestor:
+    """Ingest a corpus into a retriever backend batch by batch with bounded memory"""
+
+    def __init__(self, retriever, batch_size: int = INGEST_BATCH_SIZE, workers: int = 0,
+                 embedding_model: str = EMBEDDING_MODEL):
+        """Initialize the ingestor
+
+        Args:
+            retriever: Retriever backend to write documents into
+            batch_size: Number of documents embedded and written per batch
+            workers: Encoder processes to spread each batch over (0 encodes in-process)
+            embedding_model: Model the worker processes load (must match the retriever's)
+        """
+        self.retriever = retriever
+        self.batch_size = batch_size
+        self.workers = workers
+        self.embedding_model = embedding_model
+
+    def _pre_encode(self, pool: ProcessPoolExecutor, batch: List[Dict[str, Any]]) -> None:
+        """Encode a batch across the pool and seed the retriever's embedding cache
+
+        The following add_documents call then finds every vector in the cache.
+        """
+        texts = [doc["text"] for doc in batch]
+        chunk_size = max(1, -(-len(texts) // self.workers))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+        vectors = []
+        for chunk_vectors in pool.map(_encode, chunks):
+            vectors.extend(chunk_vectors)
+        self.retriever.embedding_cache.put_many(texts, vectors)
+
+    def ingest(self, path: str, source: Optional[str] = None) -> Dict[str, Any]:
+        """Stream a corpus file into the vector database
+
+        Args:
+            path: Path to a .json array or .jsonl corpus
+            source: Corpus name recorded in the ingest manifest
+
+        Returns:
+            Ingestion statistics including throughput in docs/sec
+        """
+        totals = {"documents": 0, "batches": 0, "added": 0, "updated": 0, "unchanged": 0}
+        start = time.perf_counter()
+
+        pool = None
+        if self.workers > 0:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.embedding_model,)
+            )
+
+        try:
+            for batch in iter_batches(iter_documents(path), self.batch_size):
+                if pool is not None:
+                    self._pre_encode(pool, batch)
+                summary = self.retriever.add_documents(batch, source=source)
+
+                totals["documents"] += len(batch)
+                totals["batches"] += 1
+                for key in ("added", "updated", "unchanged"):
+                    totals[key] += summary[key]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - start
+        totals["seconds"] = elapsed
+        totals["docs_per_sec"] = totals["documents"] / elapsed if elapsed > 0 else 0.0
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        totals["peak_rss_mb"] = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+        return totals
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Stream historical documents into the RAG vector database")
+    parser.add_argument("path", help="Corpus file (.json array or .jsonl)")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE,
+                        help="Documents embedded and written per batch")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Encoder processes (0 encodes in the main process)")
+    parser.add_argument("--source", default=None,
+                        help="Corpus name for the ingest manifest (defaults to the file name)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"Corpus file not found at {args.path}")
+        return 1
+
+    from rpg_game.rag.factory import create_retriever
+
+    ingestor = StreamingIngestor(create_retriever(coalesce=False), batch_size=args.batch_size, workers=args.workers)
+    stats = ingestor.ingest(args.path, source=args.source or os.path.basename(args.path))
+
+    print(f"Ingested {stats['documents']} documents in {stats['batches']} batches "
+          f"({stats['added']} added, {stats['updated']} updated, {stats['unchanged']} unchanged)")
+    print(f"Throughput: {stats['docs_per_sec']:.1f} docs/sec over {stats['seconds']:.2f}s, "
+          f"peak RSS {stats['peak_rss_mb']:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
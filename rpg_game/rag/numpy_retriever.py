@@ -0,0 +1,562 @@
+import os
+import json
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from rpg_game.config import (
+    NUMPY_INDEX_PATH, EMBEDDING_MODEL, RAG_TOP_K, HISTORICAL_DATA_PATH,
+    ANN_MIN_CORPUS_SIZE, ANN_NPROBE, EMBEDDING_CACHE_PATH, RAG_BATCH_WINDOW, RAG_BATCH_MAX,
+    RAG_RETRIEVAL_MODE, RAG_RRF_K, RAG_FUSION_CANDIDATES, RAG_TAG_SUBSET_CACHE
+)
+from rpg_game.concurrency.micro_batcher import MicroBatcher
+from rpg_game.rag.bm25_index import BM25Index, RETRIEVAL_MODES, corpus_fingerprint, reciprocal_rank_fusion
+from rpg_game.rag.embedding_cache import EmbeddingCache, CachedEmbeddings
+from rpg_game.rag.tag_index import TagIndex
+from rpg_game.rag.documents import document_id, document_fingerprint
+from rpg_game.telemetry.telemetry import telemetry, log
+
+
+class SentenceEncoder:
+    """Minimal sentence-transformers encoder with the LangChain embeddings interface"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        """Initialize the encoder; the model itself is loaded on first use"""
+        self.model_name = model_name
+        self._model = None
+
+    def _get_model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Same preprocessing as HuggingFaceEmbeddings, so cached vectors are shared
+        texts = [text.replace("\n", " ") for text in texts]
+        return self._get_model().encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted-file ANN index: k-means centroids with one posting list per cell"""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray):
+        """Initialize the index from trained centroids and row assignments"""
+        self.centroids = centroids
+        self.assignments = assignments
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(centroids))]
+
+    @classmethod
+    def train(cls, matrix: np.ndarray, n_lists: Optional[int] = None, iterations: int = 10,
+              seed: int = 0) -> "IVFIndex":
+        """Cluster normalized embeddings with spherical k-means
+
+        Args:
+            matrix: Normalized embedding matrix (rows are documents)
+            n_lists: Number of cells (defaults to sqrt of the corpus size)
+            iterations: k-means iterations
+            seed: Random seed for centroid initialization
+
+        Returns:
+            Trained index
+        """
+        n_lists = n_lists or max(1, int(np.sqrt(len(matrix))))
+        rng = np.random.default_rng(seed)
+        centroids = np.array(matrix[rng.choice(len(matrix), n_lists, replace=False)])
+        for _ in range(iterations):
+            assignments = np.argmax(matrix @ centroids.T, axis=1)
+            for cell in range(n_lists):
+                members = matrix[assignments == cell]
+                if len(members):
+                    centroids[cell] = members.sum(axis=0)
+            centroids = _normalize(centroids)
+        assignments = np.argmax(matrix @ centroids.T, axis=1)
+        return cls(centroids, assignments.astype(np.int32))
+
+    def probe_cells(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Get the nprobe cells closest to the query"""
+        nprobe = min(nprobe, len(self.centroids))
+        return np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+
+    def rows_in(self, cells: np.ndarray) -> np.ndarray:
+        """Get the rows stored in the given cells"""
+        return np.concatenate([self._lists[cell] for cell in cells])
+
+    def probe(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Get the rows stored in the nprobe cells closest to the query"""
+        return self.rows_in(self.probe_cells(query, nprobe))
+
+    def save(self, directory: str) -> None:
+        np.save(os.path.join(directory, "ivf_centroids.npy"), self.centroids)
+        np.save(os.path.join(directory, "ivf_assignments.npy"), self.assignments)
+
+    @classmethod
+    def load(cls, directory: str, rows: int) -> Optional["IVFIndex"]:
+        """Load a saved index, or None if it is missing or stale"""
+        try:
+            centroids = np.load(os.path.join(directory, "ivf_centroids.npy"))
+            assignments = np.load(os.path.join(directory, "ivf_assignments.npy"))
+        except (OSError, ValueError):
+            return None
+        if len(assignments) != rows:
+            return None
+        return cls(centroids, assignments)
+
+
+class TagSubset:
+    """Rows carrying any of a filter's tags, laid out so a search scores only them
+
+    Without an IVF index the rows' embeddings are gathered into one
+    contiguous block, multiplied instead of the whole matrix. With one, the
+    rows are grouped by cell so probing slices out just the tagged rows of
+    the probed cells.
+    """
+
+    def __init__(self, rows: np.ndarray, matrix: np.ndarray, ivf: Optional[IVFIndex]):
+        """Lay out the subset
+
+        Args:
+            rows: Sorted matrix rows carrying the tags
+            matrix: Embedding matrix of the retriever
+            ivf: IVF index of the retriever, if any
+        """
+        self.rows = rows
+        self.block: Optional[np.ndarray] = None
+        self._by_cell: Optional[np.ndarray] = None
+        self._cell_bounds: Optional[np.ndarray] = None
+        if ivf is None:
+            self.block = np.ascontiguousarray(matrix[rows])
+        else:
+            cells = ivf.assignments[rows]
+            order = np.argsort(cells, kind="stable")
+            self._by_cell = rows[order]
+            self._cell_bounds = np.searchsorted(cells[order], np.arange(len(ivf.centroids) + 1))
+
+    def in_cells(self, cells: np.ndarray) -> np.ndarray:
+        """Sorted rows of the subset stored in the given IVF cells"""
+        return np.sort(np.concatenate([self._by_cell[self._cell_bounds[cell]:self._cell_bounds[cell + 1]]
+                                       for cell in cells]))
+
+
+class NumpyRetriever:
+    """Retriever backend on a memory-mapped float32 matrix, without chromadb or langchain
+
+    Documents live in ``<index_path>/documents.json`` and their normalized
+    embeddings in ``<index_path>/embeddings.f32``, one row per document. A
+    search is a single matrix-vector product plus ``argpartition``; above
+    ``ann_min_corpus_size`` documents an IVF index narrows the rows scored.
+    A tag filter narrows them before the product too (see TagSubset).
+    Concurrent retrievals are gathered into micro-batches that share one
+    embedding pass and one matrix-matrix product.
+
+    A BM25 index over the same rows (``<index_path>/bm25``) ranks documents
+    lexically. In "hybrid" mode its ranking is fused with the vector one by
+    reciprocal rank fusion; in "lexical" mode queries are never embedded. In
+    "vector" mode it is not built.
+    """
+
+    def __init__(self, index_path: str = NUMPY_INDEX_PATH, embedding_model: str = EMBEDDING_MODEL,
+                 ann_min_corpus_size: int = ANN_MIN_CORPUS_SIZE, nprobe: int = ANN_NPROBE,
+                 encoder: Any = None, embedding_cache_dir: Optional[str] = EMBEDDING_CACHE_PATH,
+                 batch_window: float = RAG_BATCH_WINDOW, batch_max: int = RAG_BATCH_MAX,
+                 mode: str = RAG_RETRIEVAL_MODE):
+        """Initialize the retriever and load (or build) its index
+
+        Args:
+            index_path: Directory holding the matrix and document store
+            embedding_model: Sentence transformers model name
+            ann_min_corpus_size: Corpus size above which the IVF index is used
+            nprobe: Number of IVF cells scanned per query
+            encoder: Embeddings model with embed_documents/embed_query (a SentenceEncoder if None)
+            embedding_cache_dir: Root directory of the on-disk embedding cache (None disables it)
+            batch_window: Seconds a retrieval waits for concurrent ones to batch with (0 disables)
+            batch_max: Most queries embedded and searched in one batch
+            mode: "vector", "hybrid" (BM25 fused with vector search) or "lexical" (BM25 only)
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        self.index_path = index_path
+        self.embedding_model = embedding_model
+        self.ann_min_corpus_size = ann_min_corpus_size
+        self.nprobe = nprobe
+        self.mode = mode
+        os.makedirs(index_path, exist_ok=True)
+
+        self.embedding_cache = EmbeddingCache(model_name=embedding_model, cache_dir=embedding_cache_dir)
+        self.embeddings = CachedEmbeddings(encoder or SentenceEncoder(embedding_model), self.embedding_cache)
+        self.batcher = MicroBatcher(self.retrieve_many, max_batch=batch_max, window=batch_window, name="rag")
+
+        self.documents: List[Dict[str, Any]] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.tag_index = TagIndex()
+        self.ivf: Optional[IVFIndex] = None
+        self._bm25: Optional[BM25Index] = None
+        # Laid-out rows per tag filter, dropped whenever the index changes
+        self._tag_subsets: Dict[Tuple[str, ...], TagSubset] = {}
+        self._tag_subsets_lock = threading.Lock()
+
+        self._load_index()
+        self._load_historical_data()
+
+    @property
+    def bm25(self) -> BM25Index:
+        """BM25 index of the stored documents, loaded from disk or built on first use"""
+        if self._bm25 is None:
+            # BM25 positions are matrix rows
+            self._bm25 = BM25Index.load_or_build(
+                os.path.join(self.index_path, "bm25"),
+                corpus_fingerprint((doc["id"], doc["fingerprint"]) for doc in self.documents),
+                lambda: ([doc["id"] for doc in self.documents],
+                         [f"{doc['title']} {doc['text']}" for doc in self.documents])
+            )
+        return self._bm25
+
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.index_path, "embeddings.f32")
+
+    @property
+    def _documents_path(self) -> str:
+        return os.path.join(self.index_path, "documents.json")
+
+    def _load_index(self) -> None:
+        """Memory-map the embedding matrix and load the document store"""
+        try:
+            if not os.path.exists(self._documents_path):
+                return
+            with open(self._documents_path, 'r', encoding='utf-8') as f:
+                store = json.load(f)
+            if store.get("model") != self.embedding_model:
+                print(f"Numpy index was built with {store.get('model')}, rebuilding")
+                return
+
+            documents = store["documents"]
+            dim = store["dim"]
+            if documents:
+                self.matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r",
+                                        shape=(len(documents), dim))
+            self.documents = documents
+            self._reindex()
+            log(f"Loaded numpy index with {len(self.documents)} documents")
+        except Exception as e:
+            print(f"Error loading numpy index: {e}")
+            self.documents = []
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def _reindex(self) -> None:
+        """Rebuild the tag index, the BM25 index (unless in vector mode) and, for large corpora, the IVF index"""
+        self.tag_index = TagIndex()
+        for row, doc in enumerate(self.documents):
+            self.tag_index.add(str(row), doc.get("tags", []))
+        with self._tag_subsets_lock:
+            self._tag_subsets = {}
+
+        self._bm25 = None
+        if self.mode != "vector":
+            # Built up front so concurrent lexical retrievals don't race to build it
+            self.bm25
+
+        self.ivf = None
+        if len(self.documents) >= self.ann_min_corpus_size:
+            self.ivf = IVFIndex.load(self.index_path, len(self.documents))
+            if self.ivf is None:
+                self.ivf = IVFIndex.train(np.asarray(self.matrix))
+                self.ivf.save(self.index_path)
+
+    def _write_index(self, documents: List[Dict[str, Any]], matrix: np.ndarray) -> None:
+        """Persist the document store and matrix, then map them back in"""
+        tmp_path = self._matrix_path + ".tmp"
+        matrix.astype(np.float32).tofile(tmp_path)
+        os.replace(tmp_path, self._matrix_path)
+
+        tmp_path = self._documents_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "model": self.embedding_model,
+                "dim": int(matrix.shape[1]) if matrix.size else 0,
+                "documents": documents
+            }, f)
+        os.replace(tmp_path, self._documents_path)
+
+        # Any saved IVF index describes the old rows
+        for name in ("ivf_centroids.npy", "ivf_assignments.npy"):
+            path = os.path.join(self.index_path, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.documents = documents
+        self.matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r",
+                                shape=matrix.shape) if matrix.size else matrix
+        self._reindex()
+
+    def _load_historical_data(self, data_path: str = HISTORICAL_DATA_PATH) -> None:
+        """Sync historical data from JSON file into the index"""
+        try:
+            with open(data_path, 'r', encoding='utf-8') as f:
+                historical_data = json.load(f)
+            self.sync_documents(historical_data, source=os.path.basename(data_path))
+        except Exception as e:
+            print(f"Error loading historical data: {e}")
+
+    def _embed(self, documents: List[Dict[str, Any]]) -> np.ndarray:
+        return _normalize(np.asarray(self.embeddings.embed_documents([doc["text"] for doc in documents]),
+                                     dtype=np.float32))
+
+    def add_documents(self, documents: List[Dict[str, Any]], source: Optional[str] = None) -> Dict[str, int]:
+        """Upsert historical documents into the index
+
+        Args:
+            documents: List of document dictionaries with 'title', 'text', and 'tags' keys
+            source: Optional name of the corpus the documents belong to
+
+        Returns:
+            Counts of added, updated and unchanged documents
+        """
+        rows = {doc["id"]: row for row, doc in enumerate(self.documents)}
+        by_id = {document_id(doc): doc for doc in documents}
+
+        added, updated = [], []
+        for doc_id, doc in by_id.items():
+            fingerprint = document_fingerprint(doc)
+            if doc_id not in rows:
+                added.append(doc_id)
+            elif self.documents[rows[doc_id]]["fingerprint"] != fingerprint:
+                updated.append(doc_id)
+
+        if added or updated:
+            new_documents = [dict(doc) for doc in self.documents]
+            for doc_id in updated:
+                new_documents[rows[doc_id]].update(self._stored_doc(doc_id, by_id[doc_id], source))
+            new_documents.extend(self._stored_doc(doc_id, by_id[doc_id], source) for doc_id in added)
+
+            blocks = [np.asarray(self.matrix)] if len(self.documents) else []
+            if added:
+                blocks.append(self._embed([by_id[doc_id] for doc_id in added]))
+            self._write_index(new_documents, np.concatenate(blocks) if len(blocks) > 1 else blocks[0])
+
+        summary = {"added": len(added), "updated": len(updated), "unchanged": len(by_id) - len(added) - len(updated)}
+        print(f"Added {summary['added']}, updated {summary['updated']}, "
+              f"skipped {summary['unchanged']} unchanged documents in numpy index")
+        return summary
+
+    def sync_documents(self, documents: List[Dict[str, Any]], source: str) -> Dict[str, int]:
+        """Make the index match a corpus exactly, deleting documents removed from the source
+
+        Args:
+            documents: Complete list of documents in the corpus
+            source: Name of the corpus (e.g. the data file name)
+
+        Returns:
+            Counts of added, updated, unchanged and deleted documents
+        """
+        wanted_ids = {document_id(doc) for doc in documents}
+        keep = [row for row, doc in enumerate(self.documents)
+                if doc.get("source") != source or doc["id"] in wanted_ids]
+
+        deleted = len(self.documents) - len(keep)
+        if deleted:
+            matrix = np.asarray(self.matrix)[keep] if keep else np.zeros((0, 0), dtype=np.float32)
+            self._write_index([self.documents[row] for row in keep], matrix)
+            print(f"Deleted {deleted} stale documents from numpy index")
+
+        summary = self.add_documents(documents, source=source)
+        summary["deleted"] = deleted
+        return summary
+
+    @staticmethod
+    def _stored_doc(doc_id: str, doc: Dict[str, Any], source: Optional[str]) -> Dict[str, Any]:
+        return {
+            "id": doc_id,
+            "fingerprint": document_fingerprint(doc),
+            "source": source,
+            "title": doc["title"],
+            "text": doc["text"],
+            "tags": list(doc.get("tags", []))
+        }
+
+    def embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the embedding cache"""
+        return self.embedding_cache.stats()
+
+    @staticmethod
+    def _best(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Positions of the top_k highest scores, best first"""
+        if len(scores) == 0:
+            return np.zeros(0, dtype=np.int64)
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        return best[np.argsort(-scores[best])]
+
+    def _top_k(self, query_vector: np.ndarray, rows: Optional[np.ndarray], top_k: int) -> np.ndarray:
+        """Rank rows (all rows if None) by cosine similarity and return the best top_k"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        if len(matrix) == 0:
+            return np.zeros(0, dtype=np.int64)
+        best = self._best(matrix @ query_vector, top_k)
+        return best if rows is None else rows[best]
+
+    def _tag_subset(self, filter_tags: Optional[List[str]]) -> Optional[TagSubset]:
+        """Rows carrying any of the filter tags (None without a filter), laid out on first use"""
+        key = tuple(sorted({str(tag).strip() for tag in filter_tags if tag})) if filter_tags else ()
+        if not key:
+            return None
+        with self._tag_subsets_lock:
+            subset = self._tag_subsets.get(key)
+        if subset is None:
+            rows = np.array(sorted(int(row) for row in self.tag_index.candidates(key)), dtype=np.int64)
+            subset = TagSubset(rows, self.matrix, self.ivf)
+            with self._tag_subsets_lock:
+                if len(self._tag_subsets) >= RAG_TAG_SUBSET_CACHE:
+                    self._tag_subsets.pop(next(iter(self._tag_subsets)))
+                self._tag_subsets[key] = subset
+        return subset
+
+    def _candidate_rows(self, query_vector: np.ndarray, subset: Optional[TagSubset]) -> Optional[np.ndarray]:
+        """Tag rows narrowed, for large corpora, to the probed IVF cells (None for all rows)"""
+        if self.ivf is None:
+            return None if subset is None else subset.rows
+        cells = self.ivf.probe_cells(query_vector, self.nprobe)
+        if subset is None:
+            return np.sort(self.ivf.rows_in(cells))
+        return subset.in_cells(cells)
+
+    def _vector_rankings(self, query_vectors: np.ndarray, subsets: List[Optional[TagSubset]],
+                         pool_sizes: List[int]) -> List[np.ndarray]:
+        """Best pool_size rows per query vector, scoring only each query's candidate rows
+
+        Filtered queries without an IVF index share one product with their
+        subset's block. The rest share one product with the union of their
+        candidate rows, or with the whole matrix if any of them is unfiltered.
+        """
+        rankings: List[Optional[np.ndarray]] = [None] * len(subsets)
+        blocks: Dict[int, List[int]] = {}
+        for column, subset in enumerate(subsets):
+            if subset is not None and subset.block is not None:
+                blocks.setdefault(id(subset), []).append(column)
+        for columns in blocks.values():
+            subset = subsets[columns[0]]
+            scores = subset.block @ query_vectors[columns].T
+            for position, column in enumerate(columns):
+                rankings[column] = subset.rows[self._best(scores[:, position], pool_sizes[column])]
+
+        rest = [column for column, ranking in enumerate(rankings) if ranking is None]
+        if rest:
+            row_sets = [self._candidate_rows(query_vectors[column], subsets[column]) for column in rest]
+            if any(rows is None for rows in row_sets):
+                union = None
+                scores = self.matrix @ query_vectors[rest].T
+            else:
+                union = np.unique(np.concatenate(row_sets))
+                scores = self.matrix[union] @ query_vectors[rest].T
+            for position, (column, rows) in enumerate(zip(rest, row_sets)):
+                if rows is None:
+                    rankings[column] = self._best(scores[:, position], pool_sizes[column])
+                else:
+                    positions = rows if union is None else np.searchsorted(union, rows)
+                    rankings[column] = rows[self._best(scores[positions, position], pool_sizes[column])]
+        return rankings
+
+    def retrieve(self, query: str, top_k: int = RAG_TOP_K, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Retrieve relevant historical context based on the query
+
+        The query joins a micro-batch with retrievals issued concurrently
+        from other threads (see retrieve_many). Lexical retrievals have no
+        embedding pass to share and run straight away.
+
+        Args:
+            query: The search query related to the current scene
+            top_k: Number of relevant passages to retrieve
+            filter_tags: Optional list of tags to filter results
+
+        Returns:
+            List of relevant historical context documents
+        """
+        log(f"[RAG] Query: {query}", "debug")
+        log(f"[RAG] Filter tags: {filter_tags}", "debug")
+        if self.mode == "lexical":
+            results = self.retrieve_many([(query, top_k, filter_tags)])[0]
+        else:
+            results = self.batcher.submit((query, top_k, filter_tags))
+
+        log(f"[RAG] Retrieved {len(results)} documents", "debug")
+        if results:
+            log(f"[RAG] First result title: {results[0]['title']}", "debug")
+        return results
+
+    def retrieve_many(self, requests: List[Tuple[str, int, Optional[List[str]]]]) -> List[List[Dict[str, Any]]]:
+        """Retrieve historical context for several queries at once
+
+        All queries are embedded in one pass and scored with as few products
+        of embedding rows and query vectors as their filters allow, each
+        restricted to the queries' candidate rows (see _vector_rankings). In hybrid mode the
+        best RAG_FUSION_CANDIDATES rows of the vector and BM25 rankings are
+        fused; in lexical mode only BM25 ranks. A query nothing matches
+        falls back to its best BM25 match anywhere (except in vector mode),
+        and only then to the nearest vector.
+
+        Args:
+            requests: (query, top_k, filter_tags) per retrieval
+
+        Returns:
+            List of relevant historical context documents per request, in order
+        """
+        try:
+            if not self.documents:
+                log("[RAG] WARNING: Numpy index is empty. Check if historical data was loaded correctly.", "warning")
+                return [[] for _ in requests]
+
+            subsets = [self._tag_subset(filter_tags) for _, _, filter_tags in requests]
+            pool_sizes = [max(top_k, RAG_FUSION_CANDIDATES) if self.mode == "hybrid" else top_k
+                          for _, top_k, _ in requests]
+            rankings: List[List[np.ndarray]] = [[] for _ in requests]
+
+            query_vectors = None
+            if self.mode != "lexical":
+                with telemetry.span("rag.embed", queries=len(requests)):
+                    query_vectors = _normalize(np.asarray(
+                        self.embeddings.embed_documents([query for query, _, _ in requests]), dtype=np.float32
+                    ))
+
+                with telemetry.span("rag.search", backend="numpy", queries=len(requests)):
+                    for ranking, best in zip(rankings, self._vector_rankings(query_vectors, subsets, pool_sizes)):
+                        ranking.append(best)
+
+            if self.mode != "vector":
+                with telemetry.span("rag.lexical_search", queries=len(requests)):
+                    for (query, _, _), pool_size, subset, ranking in zip(requests, pool_sizes, subsets, rankings):
+                        ranking.append(self.bm25.search(query, pool_size, None if subset is None else subset.rows))
+
+            results = []
+            for column, ((query, top_k, _), ranking) in enumerate(zip(requests, rankings)):
+                if len(ranking) > 1:
+                    best = reciprocal_rank_fusion([rows.tolist() for rows in ranking], RAG_RRF_K)[:top_k]
+                else:
+                    best = ranking[0][:top_k]
+                if len(best) == 0:
+                    log(f"[RAG] No results found with filter. Trying without filter...", "debug")
+                    if self.mode != "vector":
+                        best = self.bm25.search(query, 1)
+                    if len(best) == 0 and query_vectors is not None:
+                        best = self._top_k(query_vectors[column], None, 1)
+                results.append([{
+                    "title": self.documents[row]["title"],
+                    "text": self.documents[row]["text"],
+                    "tags": self.documents[row]["tags"]
+                } for row in best])
+            return results
+
+        except Exception as e:
+            log(f"Error in RAG retrieval: {e}", "error")
+            return [[] for _ in requests]
@@ -1,28 +1,57 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-import chromadb
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from langchain.vectorstores import Chroma
 from langchain.embeddings import HuggingFaceEmbeddings
 from langchain.schema import Document
 
-from rpg_game.config import VECTOR_DB_PATH, EMBEDDING_MODEL, RAG_TOP_K
+from rpg_game.config import (
+    VECTOR_DB_PATH, EMBEDDING_MODEL, RAG_TOP_K, HISTORICAL_DATA_PATH, INGEST_MANIFEST_NAME,
+    RAG_BATCH_WINDOW, RAG_BATCH_MAX, RAG_RETRIEVAL_MODE, RAG_RRF_K, RAG_FUSION_CANDIDATES
+)
+from rpg_game.concurrency.micro_batcher import MicroBatcher
+from rpg_game.rag.bm25_index import BM25Index, RETRIEVAL_MODES, corpus_fingerprint, reciprocal_rank_fusion
+from rpg_game.rag.embedding_cache import EmbeddingCache, CachedEmbeddings, LazyEmbeddings
+from rpg_game.rag.tag_index import TagIndex, tag_filter, tag_metadata, tags_from_metadata
+from rpg_game.rag.documents import document_id, document_fingerprint, load_sample_data
+from rpg_game.telemetry.telemetry import telemetry, log
 
 
 class RAGRetriever:
     """Retrieval-Augmented Generation module for historical context"""
     
-    def __init__(self, vector_db_path: str = VECTOR_DB_PATH, embedding_model: str = EMBEDDING_MODEL):
-        """Initialize the RAG retriever with vector database and embedding model"""
+    def __init__(self, vector_db_path: str = VECTOR_DB_PATH, embedding_model: str = EMBEDDING_MODEL,
+                 mode: str = RAG_RETRIEVAL_MODE):
+        """Initialize the RAG retriever with vector database and embedding model
+        
+        Args:
+            vector_db_path: Directory of the Chroma database
+            embedding_model: Sentence transformers model name
+            mode: "vector", "hybrid" (BM25 fused with vector search) or "lexical" (BM25 only)
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
         self.vector_db_path = vector_db_path
+        self.mode = mode
         
         # Create directory if it doesn't exist
         os.makedirs(vector_db_path, exist_ok=True)
         
-        # Initialize embedding model
-        self.embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
+        # Embedding model behind a content-hashed cache; the model is only
+        # loaded the first time a text misses the cache
+        self.embedding_cache = EmbeddingCache(model_name=embedding_model)
+        self.embeddings = CachedEmbeddings(
+            LazyEmbeddings(lambda: HuggingFaceEmbeddings(model_name=embedding_model)),
+            self.embedding_cache
+        )
+        # Queries from concurrent retrievals are embedded together in one pass
+        self.query_batcher = MicroBatcher(self.embeddings.embed_documents, max_batch=RAG_BATCH_MAX,
+                                          window=RAG_BATCH_WINDOW, name="rag")
+        # BM25 index over the stored documents, built on first use and
+        # dropped whenever the collection changes
+        self._bm25: Optional[BM25Index] = None
         
         # Initialize or load vector database
         self._init_vector_db()
@@ -35,22 +64,28 @@ class RAGRetriever:
                 embedding_function=self.embeddings
             )
             doc_count = self.vectordb._collection.count()
-            print(f"Loaded vector database with {doc_count} documents")
-            
-            # If no documents are found, load them from the historical data file
-            if doc_count == 0:
-                self._load_historical_data()
+            log(f"Loaded vector database with {doc_count} documents")
         except Exception as e:
             print(f"Creating new vector database: {e}")
             self.vectordb = Chroma(
                 embedding_function=self.embeddings,
                 persist_directory=self.vector_db_path
             )
-            # Load historical data into the new database
-            self._load_historical_data()
+        
+        # Index tags of the stored documents, then bring the collection in
+        # line with the historical data file (no-op if unchanged)
+        self._build_tag_index()
+        self._load_historical_data()
     
-    def _load_historical_data(self, data_path: str = './data/historical_data.json'):
-        """Load historical data from JSON file and add to vector database
+    def _build_tag_index(self) -> None:
+        """Build the in-process tag -> document id index from stored metadata"""
+        self.tag_index = TagIndex()
+        stored = self.vectordb._collection.get(include=["metadatas"])
+        for doc_id, metadata in zip(stored["ids"], stored["metadatas"]):
+            self.tag_index.add(doc_id, tags_from_metadata(metadata or {}))
+    
+    def _load_historical_data(self, data_path: str = HISTORICAL_DATA_PATH):
+        """Sync historical data from JSON file into the vector database
         
         Args:
             data_path: Path to the historical data JSON file
@@ -59,38 +94,207 @@ class RAGRetriever:
             with open(data_path, 'r') as f:
                 historical_data = json.load(f)
                 
-            print(f"Loading {len(historical_data)} documents from {data_path}")
-            self.add_documents(historical_data)
-            print(f"Successfully loaded historical data. Vector DB now has {self.vectordb._collection.count()} documents")
+            self.sync_documents(historical_data, source=os.path.basename(data_path))
+            print(f"Vector DB has {self.vectordb._collection.count()} documents")
         except Exception as e:
             print(f"Error loading historical data: {e}")
     
-    def add_documents(self, documents: List[Dict[str, Any]]):
-        """Add historical documents to the vector database
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.vector_db_path, INGEST_MANIFEST_NAME)
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the ingestion manifest (document id -> fingerprint, source -> ids)"""
+        try:
+            if os.path.exists(self._manifest_path):
+                with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                manifest.setdefault("documents", {})
+                manifest.setdefault("sources", {})
+                return manifest
+        except Exception as e:
+            print(f"Error loading ingest manifest: {e}")
+        return {"documents": {}, "sources": {}}
+    
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = self._manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path)
+    
+    def _existing_ids(self, ids: List[str]) -> set:
+        """Get which of the given ids are already stored in the collection"""
+        if not ids:
+            return set()
+        return set(self.vectordb._collection.get(ids=ids, include=[])["ids"])
+    
+    def _remove_legacy_duplicates(self, wanted_ids: set) -> int:
+        """Delete rows stored under random ids by earlier, non-idempotent ingests
+        
+        Rows whose title and text hash to a wanted document id but are stored
+        under a different id are copies of that document.
+        
+        Returns:
+            Number of rows deleted
+        """
+        stored = self.vectordb._collection.get(include=["documents", "metadatas"])
+        stale_ids = []
+        for row_id, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"]):
+            doc_id = document_id({"title": (metadata or {}).get("title", ""), "text": text or ""})
+            if doc_id in wanted_ids and row_id != doc_id:
+                stale_ids.append(row_id)
+        if stale_ids:
+            self._delete_ids(stale_ids)
+        return len(stale_ids)
+    
+    def _delete_ids(self, ids: List[str]) -> None:
+        self.vectordb.delete(ids=ids)
+        for doc_id in ids:
+            self.tag_index.remove(doc_id)
+        self._bm25 = None
+    
+    def add_documents(self, documents: List[Dict[str, Any]], source: Optional[str] = None) -> Dict[str, int]:
+        """Upsert historical documents into the vector database
+        
+        Documents are stored under a stable id (hash of title and text), so
+        adding the same document twice never creates a duplicate row, and
+        documents whose fingerprint is unchanged are skipped without embedding.
         
         Args:
             documents: List of document dictionaries with 'title', 'text', and 'tags' keys
+            source: Optional name of the corpus the documents belong to
+            
+        Returns:
+            Counts of added, updated and unchanged documents
         """
-        langchain_docs = []
-        
-        for doc in documents:
-            langchain_docs.append(
-                Document(
-                    page_content=doc["text"],
-                    metadata={
-                        "title": doc["title"],
-                        "tags": ",".join(doc.get("tags", [])),
-                    }
-                )
-            )
+        manifest = self._load_manifest()
+        known = manifest["documents"]
+        
+        # Deduplicate the input by id, keeping the last version of each document
+        by_id = {document_id(doc): doc for doc in documents}
+        changed_ids = [doc_id for doc_id, doc in by_id.items()
+                       if known.get(doc_id) != document_fingerprint(doc)]
+        
+        existing = self._existing_ids(changed_ids)
+        new_ids = [doc_id for doc_id in changed_ids if doc_id not in existing]
+        updated_ids = [doc_id for doc_id in changed_ids if doc_id in existing]
+        
+        if new_ids:
+            self.vectordb.add_documents([self._to_langchain_doc(by_id[doc_id]) for doc_id in new_ids], ids=new_ids)
+        if updated_ids:
+            self.vectordb.update_documents(updated_ids, [self._to_langchain_doc(by_id[doc_id]) for doc_id in updated_ids])
+        
+        for doc_id in changed_ids:
+            known[doc_id] = document_fingerprint(by_id[doc_id])
+            self.tag_index.add(doc_id, by_id[doc_id].get("tags", []))
+        if changed_ids:
+            self._bm25 = None
+        if source:
+            source_ids = set(manifest["sources"].get(source, []))
+            manifest["sources"][source] = sorted(source_ids | set(by_id))
+        
+        if changed_ids:
+            self.vectordb.persist()
+        if changed_ids or source:
+            self._save_manifest(manifest)
         
-        self.vectordb.add_documents(langchain_docs)
-        self.vectordb.persist()
-        print(f"Added {len(documents)} documents to vector database")
+        summary = {
+            "added": len(new_ids),
+            "updated": len(updated_ids),
+            "unchanged": len(by_id) - len(changed_ids)
+        }
+        print(f"Added {summary['added']}, updated {summary['updated']}, "
+              f"skipped {summary['unchanged']} unchanged documents in vector database")
+        return summary
+    
+    def sync_documents(self, documents: List[Dict[str, Any]], source: str) -> Dict[str, int]:
+        """Make the vector database match a corpus exactly
+        
+        Upserts changed documents, skips unchanged ones and deletes documents
+        previously ingested from the same source that are no longer present.
+        
+        Args:
+            documents: Complete list of documents in the corpus
+            source: Name of the corpus (e.g. the data file name)
+            
+        Returns:
+            Counts of added, updated, unchanged and deleted documents
+        """
+        manifest = self._load_manifest()
+        wanted_ids = {document_id(doc) for doc in documents}
+        previous_ids = set(manifest["sources"].get(source, []))
+        
+        # Ids still claimed by other sources must survive this sync
+        other_ids = set()
+        for other_source, ids in manifest["sources"].items():
+            if other_source != source:
+                other_ids.update(ids)
+        removed_ids = sorted(previous_ids - wanted_ids - other_ids)
+        
+        deleted = 0
+        if source not in manifest["sources"] or self.vectordb._collection.count() != len(manifest["documents"]):
+            # First sync for this source, or the collection drifted from the manifest
+            deleted += self._remove_legacy_duplicates(wanted_ids)
+        if removed_ids:
+            self._delete_ids(removed_ids)
+            deleted += len(removed_ids)
+        
+        if deleted or previous_ids != wanted_ids:
+            for doc_id in removed_ids:
+                manifest["documents"].pop(doc_id, None)
+            manifest["sources"][source] = sorted(wanted_ids)
+            self._save_manifest(manifest)
+        
+        summary = self.add_documents(documents)
+        if deleted:
+            self.vectordb.persist()
+            print(f"Deleted {deleted} stale documents from vector database")
+        summary["deleted"] = deleted
+        return summary
+    
+    @staticmethod
+    def _to_langchain_doc(doc: Dict[str, Any]) -> Document:
+        tags = doc.get("tags", [])
+        return Document(
+            page_content=doc["text"],
+            metadata={
+                "title": doc["title"],
+                "tags": ",".join(tags),
+                **tag_metadata(tags)
+            }
+        )
+    
+    def embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the embedding cache"""
+        return self.embedding_cache.stats()
+    
+    @property
+    def bm25(self) -> BM25Index:
+        """BM25 index of the stored documents, loaded from disk or built on first use"""
+        if self._bm25 is None:
+            manifest = self._load_manifest()
+            ids = sorted(manifest["documents"])
+            
+            def corpus() -> Tuple[List[str], List[str]]:
+                stored = self.vectordb._collection.get(ids=ids, include=["documents", "metadatas"])
+                texts = [f"{(metadata or {}).get('title', '')} {text or ''}"
+                         for text, metadata in zip(stored["documents"], stored["metadatas"])]
+                return stored["ids"], texts
+            
+            self._bm25 = BM25Index.load_or_build(
+                os.path.join(self.vector_db_path, "bm25"),
+                corpus_fingerprint((doc_id, manifest["documents"][doc_id]) for doc_id in ids),
+                corpus
+            )
+        return self._bm25
     
     def retrieve(self, query: str, top_k: int = RAG_TOP_K, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Retrieve relevant historical context based on the query
         
+        In "hybrid" mode the best RAG_FUSION_CANDIDATES documents of the
+        vector and BM25 rankings are fused by reciprocal rank fusion; in
+        "lexical" mode the query is never embedded.
+        
         Args:
             query: The search query related to the current scene
             top_k: Number of relevant passages to retrieve
@@ -99,82 +303,123 @@ class RAGRetriever:
         Returns:
             List of relevant historical context documents
         """
-        print(f"[RAG] Query: {query}")
-        print(f"[RAG] Filter tags: {filter_tags}")
+        log(f"[RAG] Query: {query}", "debug")
+        log(f"[RAG] Filter tags: {filter_tags}", "debug")
         try:
-            # Prepare filter if tags are provided
-            filter_dict = None
-            
-            # Only use filter if we have tags
-            if filter_tags and len(filter_tags) > 0:
-                # Convert all tags to strings to avoid type issues
-                string_tags = [str(tag).strip() for tag in filter_tags if tag]
-                
-                if string_tags:
-                    # Use $in operator which is supported by ChromaDB
-                    filter_dict = {"tags": {"$in": string_tags}}
+            # Convert all tags to strings to avoid type issues
+            string_tags = [str(tag).strip() for tag in filter_tags if tag] if filter_tags else []
             
-            # Retrieve documents - without filter if filter_dict is None
-            if filter_dict:
-                docs = self.vectordb.similarity_search(
-                    query=query,
-                    k=top_k,
-                    filter=filter_dict
-                )
-            else:
-                # If no valid filter, search without filter
-                docs = self.vectordb.similarity_search(
-                    query=query,
-                    k=top_k
-                )
+            candidate_ids = None
+            if string_tags:
+                # Resolve the tag filter to candidate documents before searching
+                candidate_ids = self.tag_index.candidates(string_tags)
+                log(f"[RAG] {len(candidate_ids)} candidate documents for tags", "debug")
             
-            # Format results
-            results = []
-            for doc in docs:
-                tags = doc.metadata.get("tags", "").split(",") if doc.metadata.get("tags") else []
-                results.append({
-                    "title": doc.metadata.get("title", "Unknown"),
-                    "text": doc.page_content,
-                    "tags": tags
-                })
+            pool_size = max(top_k, RAG_FUSION_CANDIDATES) if self.mode == "hybrid" else top_k
+            rankings = []
+            if self.mode != "lexical":
+                rankings.append(self._vector_hits(query, string_tags, candidate_ids, pool_size))
+            if self.mode != "vector":
+                rankings.append(self._lexical_hits(query, candidate_ids, pool_size))
+            hits = self._fuse(rankings)[:top_k]
             
-            # If no results were found with the filter, try again without a filter
-            if not results:
-                print(f"[RAG] No results found with filter. Trying without filter...")
-                # Get at least one document without any filter
-                fallback_docs = self.vectordb.similarity_search(
-                    query=query,
-                    k=1
-                )
-                
-                for doc in fallback_docs:
-                    tags = doc.metadata.get("tags", "").split(",") if doc.metadata.get("tags") else []
-                    results.append({
-                        "title": doc.metadata.get("title", "Unknown"),
-                        "text": doc.page_content,
-                        "tags": tags
-                    })
+            # If no document matches, fall back to the best lexical match
+            # anywhere (except in vector mode), and only then to the nearest vector
+            if not hits:
+                log(f"[RAG] No results found with filter. Trying without filter...", "debug")
+                if self.mode != "vector":
+                    hits = self._lexical_hits(query, None, 1)
+                if not hits and self.mode != "lexical":
+                    hits = self._vector_hits(query, [], None, 1)
+            results = [self._format_result(text, metadata) for _, text, metadata in hits]
             
-            print(f"[RAG] Retrieved {len(results)} documents")
+            log(f"[RAG] Retrieved {len(results)} documents", "debug")
             if results:
-                print(f"[RAG] First result title: {results[0]['title']}")
-                print(f"[RAG] First result text snippet: {results[0]['text'][:100]}...")
+                log(f"[RAG] First result title: {results[0]['title']}", "debug")
+                log(f"[RAG] First result text snippet: {results[0]['text'][:100]}...", "debug")
             else:
-                print("[RAG] WARNING: Still no results found. Check if historical data was loaded correctly.")
+                log("[RAG] WARNING: Still no results found. Check if historical data was loaded correctly.", "warning")
             
             return results
             
         except Exception as e:
-            print(f"Error in RAG retrieval: {e}")
+            log(f"Error in RAG retrieval: {e}", "error")
             return []
-
-
-# Helper function to load sample historical data
-def load_sample_data(file_path: str) -> List[Dict[str, Any]]:
-    """Load sample historical data from a JSON file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading sample data: {e}")
-        return []
+    
+    @staticmethod
+    def _fuse(rankings: List[List[Tuple[str, str, Dict[str, Any]]]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Merge ranked (id, text, metadata) hits by reciprocal rank fusion"""
+        if len(rankings) == 1:
+            return rankings[0]
+        by_id = {hit[0]: hit for ranking in rankings for hit in ranking}
+        fused = reciprocal_rank_fusion([[hit[0] for hit in ranking] for ranking in rankings], RAG_RRF_K)
+        return [by_id[doc_id] for doc_id in fused]
+    
+    def _lexical_hits(self, query: str, candidate_ids: Optional[set],
+                      top_k: int) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """BM25 search, restricted to a candidate set unless it is None
+        
+        Returns:
+            Up to top_k (id, text, metadata) hits, best first
+        """
+        if candidate_ids is not None and not candidate_ids:
+            return []
+        bm25 = self.bm25
+        positions = None
+        if candidate_ids is not None:
+            positions = np.array([bm25.positions[doc_id] for doc_id in candidate_ids if doc_id in bm25.positions],
+                                 dtype=np.int64)
+        with telemetry.span("rag.lexical_search", backend="chroma"):
+            ids = [bm25.ids[position] for position in bm25.search(query, top_k, positions)]
+        if not ids:
+            return []
+        
+        stored = self.vectordb._collection.get(ids=ids, include=["documents", "metadatas"])
+        found = {doc_id: (doc_id, text, metadata or {})
+                 for doc_id, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])}
+        return [found[doc_id] for doc_id in ids if doc_id in found]
+    
+    def _vector_hits(self, query: str, tags: List[str], candidate_ids: Optional[set],
+                     top_k: int) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Nearest-neighbour search in Chroma, restricted to documents carrying any of the tags
+        
+        The tag filter is passed to Chroma as a where clause on the
+        tag_<name> flags, so its index searches only the matching documents.
+        
+        Args:
+            query: The search query
+            tags: Filter tags (none for an unfiltered search)
+            candidate_ids: Documents carrying the tags per the tag index (None if unfiltered)
+            top_k: Number of results to return
+            
+        Returns:
+            Up to top_k (id, text, metadata) hits, closest first
+        """
+        if candidate_ids is not None:
+            if not candidate_ids:
+                return []
+            # Chroma refuses to return more results than there are matches
+            top_k = min(top_k, len(candidate_ids))
+        query_vector = self._embed_query(query)
+        with telemetry.span("rag.search", backend="chroma", filtered=bool(tags)):
+            found = self.vectordb._collection.query(
+                query_embeddings=[query_vector],
+                n_results=top_k,
+                where=tag_filter(tags),
+                include=["documents", "metadatas"]
+            )
+        return [(doc_id, text, metadata or {})
+                for doc_id, text, metadata in zip(found["ids"][0], found["documents"][0], found["metadatas"][0])]
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, batched with queries embedded concurrently by other threads"""
+        with telemetry.span("rag.embed"):
+            return self.query_batcher.submit(query)
+    
+    @staticmethod
+    def _format_result(text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": metadata.get("title", "Unknown"),
+            "text": text,
+            "tags": tags_from_metadata(metadata)
+        }
@@ -0,0 +1,75 @@
+from typing import Any, List, Dict, Optional, Set, Iterable
+
+
+TAG_METADATA_PREFIX = "tag_"
+
+
+def tag_metadata(tags: Iterable[str]) -> Dict[str, bool]:
+    """Per-tag metadata flags, so each tag is individually filterable in Chroma"""
+    return {f"{TAG_METADATA_PREFIX}{tag}": True for tag in tags if tag}
+
+
+def tag_filter(tags: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Chroma where clause matching documents that carry any of the tags (None for no tags)"""
+    clauses = [{key: True} for key in tag_metadata(tags)]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def tags_from_metadata(metadata: Dict) -> List[str]:
+    """Read the tag list back from a stored document's metadata"""
+    tags = metadata.get("tags", "")
+    return [tag for tag in tags.split(",") if tag] if tags else []
+
+
+class TagIndex:
+    """In-process inverted index from tag to document ids"""
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_tags: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_tags)
+
+    def add(self, doc_id: str, tags: Iterable[str]) -> None:
+        """Index a document's tags, replacing any previous entry for it
+
+        Args:
+            doc_id: Vector database id of the document
+            tags: Tags of the document
+        """
+        self.remove(doc_id)
+        tags = [str(tag).strip() for tag in tags if tag]
+        self._doc_tags[doc_id] = tags
+        for tag in tags:
+            self._postings.setdefault(tag, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document from the index"""
+        for tag in self._doc_tags.pop(doc_id, []):
+            postings = self._postings.get(tag)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[tag]
+
+    def candidates(self, tags: Iterable[str]) -> Set[str]:
+        """Get the ids of documents carrying any of the given tags
+
+        Args:
+            tags: Tags to match
+
+        Returns:
+            Set of matching document ids
+        """
+        result: Set[str] = set()
+        for tag in tags:
+            result |= self._postings.get(str(tag).strip(), set())
+        return result
+
+    def tags(self) -> List[str]:
+        """Get all indexed tags"""
+        return sorted(self._postings)
@@ -0,0 +1,205 @@
+"""Struct-of-arrays scoring store for many sessions
+
+Usage (benchmark):
+    python -m rpg_game.scoring.batch_engine --sessions 1000000
+"""
+import sys
+import time
+import argparse
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+from rpg_game.config import INITIAL_ALIGNMENT
+
+
+# np.digitize bins for the integer score thresholds used by AlignmentScore:
+# law_chaos/good_evil <= -70, -69..-30, -29..29, 30..69, >= 70
+ALIGNMENT_BINS = np.array([-69, -29, 30, 70])
+LAW_LABELS = np.array(["Chaotic", "Neutral (Chaotic leaning)", "Neutral", "Neutral (Lawful leaning)", "Lawful"])
+GOOD_LABELS = np.array(["Evil", "Neutral (Evil leaning)", "Neutral", "Neutral (Good leaning)", "Good"])
+# Combined "<law> <good>" labels, indexed by law bucket * 5 + good bucket
+ALIGNMENT_LABELS = np.array([f"{law} {good}" for law in LAW_LABELS for good in GOOD_LABELS])
+
+# trust < 10, 10..29, 30..49, 50..69, 70..89, >= 90
+TRUST_BINS = np.array([10, 30, 50, 70, 90])
+TRUST_LABELS = np.array([
+    "Distrustful", "Suspicious", "Cautious Trust", "Moderate Trust", "Strong Trust", "Unwavering Trust"
+])
+
+Indices = Union[int, Sequence[int], np.ndarray]
+Delta = Union[int, Sequence[int], np.ndarray, None]
+
+
+class BatchScoringEngine:
+    """Alignment, trust and XP for many sessions stored as NumPy columns
+
+    Each session is a row index. The same effects (typically one scene
+    action's ``score_effects``) can be applied to thousands of sessions in
+    one vectorized step, with the same clamping as ScoringEngine. Skills are
+    sparse and kept as one dict per session.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """Initialize an empty store
+
+        Args:
+            capacity: Initial number of rows to allocate (grows as needed)
+        """
+        self.size = 0
+        self.law_chaos = np.empty(capacity, dtype=np.int16)
+        self.good_evil = np.empty(capacity, dtype=np.int16)
+        self.trust = np.empty(capacity, dtype=np.int16)
+        self.xp = np.empty(capacity, dtype=np.int32)
+        self.skills: List[Dict[str, int]] = []
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.law_chaos)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name in ("law_chaos", "good_evil", "trust", "xp"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def add_sessions(self, count: int = 1) -> np.ndarray:
+        """Allocate rows for new sessions at the initial alignment
+
+        Args:
+            count: Number of sessions to add
+
+        Returns:
+            Row indices of the new sessions
+        """
+        start, end = self.size, self.size + count
+        self._grow(end)
+        self.law_chaos[start:end] = INITIAL_ALIGNMENT["law_chaos"]
+        self.good_evil[start:end] = INITIAL_ALIGNMENT["good_evil"]
+        self.trust[start:end] = INITIAL_ALIGNMENT["trust"]
+        self.xp[start:end] = 0
+        self.skills.extend({} for _ in range(count))
+        self.size = end
+        return np.arange(start, end)
+
+    def apply_deltas(self, sessions: Indices, law: Delta = None, good: Delta = None,
+                     trust: Delta = None, xp: Delta = None) -> None:
+        """Add score deltas to sessions with vectorized clamping
+
+        Each delta is either a scalar applied to every session or an array
+        with one value per session. Session indices must be unique within a
+        call, since each row is updated once.
+
+        Args:
+            sessions: Row indices to update
+            law: Law/chaos delta
+            good: Good/evil delta
+            trust: Trust delta
+            xp: Experience delta
+        """
+        sessions = np.asarray(sessions)
+        for column, delta, low, high in (
+            (self.law_chaos, law, -100, 100),
+            (self.good_evil, good, -100, 100),
+            (self.trust, trust, 0, 100),
+        ):
+            if delta is not None:
+                column[sessions] = np.clip(column[sessions].astype(np.int32) + delta, low, high)
+        if xp is not None:
+            self.xp[sessions] += np.asarray(xp, dtype=np.int32)
+
+    def apply_score_effects(self, sessions: Indices, effects: Dict[str, Any]) -> None:
+        """Apply one score_effects dictionary to many sessions
+
+        Args:
+            sessions: Row indices to update
+            effects: Dictionary of score effects (law, good, trust, xp, skills)
+        """
+        self.apply_deltas(sessions, effects.get("law"), effects.get("good"), effects.get("trust"), effects.get("xp"))
+
+        skill_effects = effects.get("skills")
+        if isinstance(skill_effects, dict) and skill_effects:
+            for session in np.atleast_1d(sessions):
+                skills = self.skills[session]
+                for skill, value in skill_effects.items():
+                    skills[skill] = skills.get(skill, 0) + value
+
+    def alignment_descriptions(self, sessions: Indices) -> np.ndarray:
+        """Alignment descriptions (e.g. "Neutral Neutral (Good leaning)") for sessions"""
+        law = np.digitize(self.law_chaos[sessions], ALIGNMENT_BINS)
+        good = np.digitize(self.good_evil[sessions], ALIGNMENT_BINS)
+        return ALIGNMENT_LABELS[law * len(GOOD_LABELS) + good]
+
+    def trust_descriptions(self, sessions: Indices) -> np.ndarray:
+        """Trust descriptions (e.g. "Moderate Trust") for sessions"""
+        return TRUST_LABELS[np.digitize(self.trust[sessions], TRUST_BINS)]
+
+    def get_current_scores(self, session: int) -> Dict[str, Any]:
+        """Get one session's scores in the same shape as ScoringEngine.get_current_scores"""
+        return {
+            "alignment": {
+                "law_chaos": int(self.law_chaos[session]),
+                "good_evil": int(self.good_evil[session]),
+                "description": str(self.alignment_descriptions(session))
+            },
+            "relationship": {
+                "trust": int(self.trust[session]),
+                "description": str(self.trust_descriptions(session))
+            },
+            "progression": {
+                "xp": int(self.xp[session]),
+                "skills": self.skills[session]
+            }
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Benchmark per-session ScoringEngine updates against BatchScoringEngine"""
+    from rpg_game.scoring.engine import ScoringEngine
+
+    parser = argparse.ArgumentParser(description="Benchmark batch score updates")
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=10_000,
+                        help="Sessions timed with ScoringEngine (extrapolated to --sessions)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    effects = [
+        {"law": int(rng.integers(-15, 16)), "good": int(rng.integers(-15, 16)),
+         "trust": int(rng.integers(-15, 16)), "xp": int(rng.integers(0, 50))}
+        for _ in range(args.ticks)
+    ]
+
+    engines = [ScoringEngine() for _ in range(args.sample)]
+    start = time.perf_counter()
+    for effect in effects:
+        for engine in engines:
+            engine.apply_score_effects("bench", effect)
+    per_session = (time.perf_counter() - start) / (args.sample * args.ticks)
+
+    store = BatchScoringEngine(args.sessions)
+    sessions = store.add_sessions(args.sessions)
+    start = time.perf_counter()
+    for effect in effects:
+        store.apply_score_effects(sessions, effect)
+    batch = (time.perf_counter() - start) / args.ticks
+
+    start = time.perf_counter()
+    store.alignment_descriptions(sessions)
+    store.trust_descriptions(sessions)
+    describe = time.perf_counter() - start
+
+    column_bytes = sum(getattr(store, name).nbytes for name in ("law_chaos", "good_evil", "trust", "xp"))
+    print(f"ScoringEngine: {per_session * 1e6:.2f} us/session/tick "
+          f"(~{per_session * args.sessions:.2f}s per tick for {args.sessions} sessions)")
+    print(f"BatchScoringEngine: {batch * 1000:.2f} ms per tick for {args.sessions} sessions "
+          f"({per_session * args.sessions / batch:.0f}x)")
+    print(f"Descriptions for {args.sessions} sessions: {describe * 1000:.2f} ms")
+    print(f"Score columns: {column_bytes / 1024 ** 2:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@ from typing import Dict, Any, List, Tuple
 from pydantic import BaseModel
 
 from rpg_game.config import INITIAL_ALIGNMENT
+from rpg_game.scoring.history import ActionHistory
 
 
 class AlignmentScore(BaseModel):
@@ -62,7 +63,7 @@ class ScoringEngine:
     def __init__(self):
         """Initialize the scoring engine with default alignment"""
         self.alignment = AlignmentScore()
-        self.action_history: List[Dict[str, Any]] = []
+        self.action_history = ActionHistory()
     
     def apply_score_effects(self, action_id: str, effects: Dict[str, int], description: str = "") -> Dict[str, Any]:
         """Apply score effects based on player action
@@ -75,6 +76,9 @@ class ScoringEngine:
         Returns:
             Updated alignment scores
         """
+        before = (self.alignment.law_chaos, self.alignment.good_evil, self.alignment.trust, self.alignment.xp)
+        new_skills = []
+        
         # Apply effects to alignment
         if "law" in effects:
             self.alignment.law_chaos = max(-100, min(100, self.alignment.law_chaos + effects["law"]))
@@ -95,15 +99,12 @@ class ScoringEngine:
                     self.alignment.skills[skill] += value
                 else:
                     self.alignment.skills[skill] = value
+                    new_skills.append(skill)
         
-        # Record action in history
-        action_record = {
-            "action_id": action_id,
-            "description": description,
-            "effects": effects,
-            "resulting_alignment": self.alignment.dict()
-        }
-        self.action_history.append(action_record)
+        # Record the deltas actually applied; snapshots are rebuilt on demand
+        after = (self.alignment.law_chaos, self.alignment.good_evil, self.alignment.trust, self.alignment.xp)
+        applied = tuple(new - old for new, old in zip(after, before))
+        self.action_history.append(action_id, description, effects, applied, new_skills)
         
         return self.get_current_scores()
     
@@ -137,4 +138,4 @@ class ScoringEngine:
         Returns:
             List of recent actions with their effects
         """
-        return self.action_history[-limit:] if self.action_history else []
+        return self.action_history.records(self.alignment.dict(), limit)
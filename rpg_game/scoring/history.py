@@ -0,0 +1,165 @@
+import json
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+
+from rpg_game.config import ACTION_HISTORY_MAX_ENTRIES
+
+
+class ActionHistory:
+    """Bounded, columnar log of player actions
+
+    Each action is stored as a row of small integers: interned ids for the
+    action id, description and effects, plus the score deltas actually
+    applied (after clamping). Alignment snapshots are not stored; the
+    alignment after any retained action is rebuilt by walking back from the
+    current alignment, so reading the last N records costs O(N).
+    """
+
+    _COLUMNS = (("action_ids", "i"), ("descriptions", "i"), ("effects", "i"),
+                ("law", "h"), ("good", "h"), ("trust", "h"), ("xp", "i"))
+
+    def __init__(self, max_entries: int = ACTION_HISTORY_MAX_ENTRIES):
+        """Initialize an empty history
+
+        Args:
+            max_entries: Recent actions to keep; older ones are dropped in one batch
+                once the log reaches twice this size
+        """
+        self.max_entries = max_entries
+        self.total = 0  # Actions ever recorded; row i is action number total - len(self) + i
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._skills: Dict[int, Tuple[Dict[str, int], List[str]]] = {}
+        for name, typecode in self._COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self) -> int:
+        return len(self.action_ids)
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def append(self, action_id: str, description: str, effects: Dict[str, Any],
+               applied: Tuple[int, int, int, int], new_skills: Optional[List[str]] = None) -> None:
+        """Record an action
+
+        Args:
+            action_id: Identifier for the action
+            description: Description of the action
+            effects: Score effects as requested by the scene
+            applied: (law, good, trust, xp) deltas actually applied after clamping
+            new_skills: Skills this action added to the player for the first time
+        """
+        self.action_ids.append(self._intern(action_id))
+        self.descriptions.append(self._intern(description))
+        self.effects.append(self._intern(json.dumps(effects, sort_keys=True)))
+        for column, delta in zip((self.law, self.good, self.trust, self.xp), applied):
+            column.append(delta)
+
+        skill_effects = effects.get("skills")
+        if isinstance(skill_effects, dict) and skill_effects:
+            self._skills[self.total] = (dict(skill_effects), list(new_skills or []))
+
+        self.total += 1
+        if len(self) >= 2 * self.max_entries:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop rows beyond max_entries and re-intern the strings still referenced"""
+        drop = len(self) - self.max_entries
+        first_kept = self.total - self.max_entries
+        strings = self._strings
+        self._strings, self._string_ids = [], {}
+        for name, typecode in self._COLUMNS:
+            column = getattr(self, name)[drop:]
+            if name in ("action_ids", "descriptions", "effects"):
+                column = array(typecode, (self._intern(strings[string_id]) for string_id in column))
+            setattr(self, name, column)
+        self._skills = {step: skills for step, skills in self._skills.items() if step >= first_kept}
+
+    def records(self, alignment: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rebuild the most recent action records, oldest first
+
+        Args:
+            alignment: Current alignment (AlignmentScore.dict())
+            limit: Number of recent records to return (all retained records if None)
+
+        Returns:
+            Records with action_id, description, effects and resulting_alignment
+        """
+        count = len(self) if limit is None else max(0, min(limit, len(self)))
+        state = dict(alignment, skills=dict(alignment.get("skills", {})))
+        records = []
+        for row in range(len(self) - 1, len(self) - 1 - count, -1):
+            records.append({
+                "action_id": self._strings[self.action_ids[row]],
+                "description": self._strings[self.descriptions[row]],
+                "effects": json.loads(self._strings[self.effects[row]]),
+                "resulting_alignment": dict(state, skills=dict(state["skills"]))
+            })
+            self._undo(row, state)
+        records.reverse()
+        return records
+
+    def _undo(self, row: int, state: Dict[str, Any]) -> None:
+        """Turn the alignment after a row into the alignment before it"""
+        state["law_chaos"] -= self.law[row]
+        state["good_evil"] -= self.good[row]
+        state["trust"] -= self.trust[row]
+        state["xp"] -= self.xp[row]
+        skills = self._skills.get(self.total - len(self) + row)
+        if skills is not None:
+            skill_effects, new_skills = skills
+            for skill, value in skill_effects.items():
+                state["skills"][skill] = state["skills"].get(skill, 0) - value
+            for skill in new_skills:
+                state["skills"].pop(skill, None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a compact JSON-compatible dictionary"""
+        data = {name: getattr(self, name).tolist() for name, _ in self._COLUMNS}
+        data.update({
+            "total": self.total,
+            "strings": self._strings,
+            "skills": {str(step): [effects, new_skills] for step, (effects, new_skills) in self._skills.items()}
+        })
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_entries: int = ACTION_HISTORY_MAX_ENTRIES) -> "ActionHistory":
+        """Restore a history serialized with to_dict"""
+        history = cls(max_entries)
+        for name, typecode in cls._COLUMNS:
+            setattr(history, name, array(typecode, data.get(name, [])))
+        history.total = data.get("total", len(history))
+        history._strings = list(data.get("strings", []))
+        history._string_ids = {value: string_id for string_id, value in enumerate(history._strings)}
+        history._skills = {
+            int(step): (effects, new_skills) for step, (effects, new_skills) in data.get("skills", {}).items()
+        }
+        return history
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]],
+                     max_entries: int = ACTION_HISTORY_MAX_ENTRIES) -> "ActionHistory":
+        """Build a history from the record list written by older save files"""
+        history = cls(max_entries)
+        previous = None
+        for record in records:
+            result = record.get("resulting_alignment", {})
+            effects = record.get("effects", {})
+            if previous is None:
+                applied = tuple(effects.get(key, 0) for key in ("law", "good", "trust", "xp"))
+                new_skills = list(result.get("skills", {}))
+            else:
+                applied = tuple(result.get(field, 0) - previous.get(field, 0)
+                                for field in ("law_chaos", "good_evil", "trust", "xp"))
+                new_skills = [skill for skill in result.get("skills", {}) if skill not in previous.get("skills", {})]
+            history.append(record.get("action_id", ""), record.get("description", ""), effects, applied, new_skills)
+            previous = result
+        return history
@@ -0,0 +1,149 @@
+"""Local JSON-over-HTTP front end for the multi-session game server
+
+Usage:
+    python -m rpg_game.server.http_server --port 8080
+    python -m rpg_game.server.http_server --stub-llm   # no API key needed
+
+Endpoints:
+    POST   /sessions                   {"player_name": "..."} -> session_id and first scene
+    GET    /sessions/<id>              current scene
+    POST   /sessions/<id>/actions      {"action_index": 0} -> action result and next scene
+    DELETE /sessions/<id>              end the session
+    GET    /stats                      server counters
+"""
+import sys
+import json
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional
+
+from rpg_game.config import SERVER_HOST, SERVER_PORT
+from rpg_game.server.session_manager import SessionManager, SessionLimitError, UnknownSessionError
+from rpg_game.telemetry.telemetry import log
+
+
+class GameRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the SessionManager attached to the server"""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def manager(self) -> SessionManager:
+        return self.server.session_manager
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _route(self) -> List[str]:
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def _handle(self, method: str) -> None:
+        parts = self._route()
+        try:
+            if method == "GET" and parts == ["stats"]:
+                self._send_json(200, self.manager.stats())
+            elif method == "POST" and parts == ["sessions"]:
+                body = self._read_json()
+                self._send_json(201, self.manager.create_session(body.get("player_name", "Player")))
+            elif method == "GET" and len(parts) == 2 and parts[0] == "sessions":
+                self._send_json(200, self.manager.get_scene(parts[1]))
+            elif method == "POST" and len(parts) == 3 and parts[0] == "sessions" and parts[2] == "actions":
+                body = self._read_json()
+                if "action_index" not in body:
+                    raise ValueError("action_index is required")
+                self._send_json(200, self.manager.take_action(
+                    parts[1], int(body["action_index"]), body.get("custom_action")
+                ))
+            elif method == "DELETE" and len(parts) == 2 and parts[0] == "sessions":
+                if self.manager.end_session(parts[1]):
+                    self._send_json(200, {"ended": parts[1]})
+                else:
+                    self._send_json(404, {"error": f"Unknown session: {parts[1]}"})
+            else:
+                self._send_json(404, {"error": "Not found"})
+        except UnknownSessionError as e:
+            self._send_json(404, {"error": str(e)})
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": f"Bad request: {e}"})
+        except SessionLimitError as e:
+            self._send_json(503, {"error": str(e)})
+        except Exception as e:
+            log(f"Error handling {method} {self.path}: {e}", "error")
+            self._send_json(500, {"error": "Internal server error"})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+def create_server(manager: SessionManager, host: str = SERVER_HOST, port: int = SERVER_PORT,
+                  verbose: bool = False) -> ThreadingHTTPServer:
+    """Create (but do not start) an HTTP server for a session manager
+
+    Args:
+        manager: Session manager holding the shared resources
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        verbose: Log every request
+
+    Returns:
+        Server; call serve_forever() to run it
+    """
+    server = ThreadingHTTPServer((host, port), GameRequestHandler)
+    server.daemon_threads = True
+    server.session_manager = manager
+    server.verbose = verbose
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run the multi-session game server")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--stub-llm", action="store_true", help="Use the offline stub LLM client")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    if args.stub_llm:
+        from rpg_game.agent.stub_client import StubLLMClient
+        from rpg_game.agent.completion_cache import CompletionCache
+        # Keep stub completions out of the on-disk cache used with the real API
+        manager = SessionManager(llm_client=StubLLMClient(), completion_cache=CompletionCache(path=None))
+    else:
+        manager = SessionManager()
+
+    manager.warm_up()
+    server = create_server(manager, args.host, args.port, args.verbose)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import os
+import time
+import uuid
+import threading
+from typing import Dict, Any, Optional
+
+from rpg_game.config import (
+    SERVER_MAX_SESSIONS, SERVER_SESSION_TTL, COMPLETION_CACHE_ENABLED, AI21_API_KEY, SINGLE_FLIGHT_ENABLED
+)
+from rpg_game.rag.factory import create_retriever
+from rpg_game.agent.llm_agent import LLMCharacterAgent, _chat_message
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.agent.resilient_client import create_llm_client
+from rpg_game.concurrency.single_flight import single_flight
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.orchestrator.scene_graph import load_scene_graph
+
+
+class UnknownSessionError(LookupError):
+    """Raised when a session id does not name a live session"""
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when a session cannot be created because the server is full"""
+
+
+class GameSession:
+    """Per-player state: one lightweight orchestrator plus bookkeeping"""
+
+    __slots__ = ("session_id", "orchestrator", "lock", "created_at", "last_active")
+
+    def __init__(self, session_id: str, orchestrator: GameOrchestrator):
+        self.session_id = session_id
+        self.orchestrator = orchestrator
+        self.lock = threading.Lock()
+        self.created_at = time.time()
+        self.last_active = self.created_at
+
+
+class SessionManager:
+    """Serves many concurrent players from one set of shared resources
+
+    The retriever (and its embedding model), the parsed scene data, the LLM
+    client and the completion cache exist once per process and are only
+    read by sessions. Each session owns just its game state, scores,
+    companion memory and conversation history. Sessions asking for the same
+    retrieval or action choices at the same moment share one upstream call.
+    """
+
+    def __init__(self, game_data_path: str = "./data/game_data.json", llm_client: Any = None,
+                 rag_retriever=None, completion_cache: Optional[CompletionCache] = None,
+                 max_sessions: int = SERVER_MAX_SESSIONS, session_ttl: float = SERVER_SESSION_TTL,
+                 coalesce: bool = SINGLE_FLIGHT_ENABLED):
+        """Initialize the shared resources
+
+        Args:
+            game_data_path: Path to the game data JSON file
+            llm_client: Client shared by all agents (a resilient AI21 client is created lazily if None)
+            rag_retriever: Retriever shared by all sessions (created lazily if None)
+            completion_cache: Completion cache shared by all agents (the default cache if None)
+            max_sessions: Maximum number of live sessions
+            session_ttl: Seconds of inactivity before a session is dropped
+            coalesce: Share concurrent identical retrievals and action choice calls between sessions
+                (an explicitly passed retriever is used as given)
+        """
+        self.game_data = load_scene_graph(game_data_path)
+
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        if completion_cache is None and COMPLETION_CACHE_ENABLED:
+            completion_cache = CompletionCache()
+        self.completion_cache = completion_cache
+        self.coalesce = coalesce
+
+        self._llm_client = llm_client
+        self._rag_retriever = rag_retriever
+        self._shared_lock = threading.Lock()
+        self._sessions: Dict[str, GameSession] = {}
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def rag_retriever(self):
+        """Shared retriever, created on first use"""
+        if self._rag_retriever is None:
+            with self._shared_lock:
+                if self._rag_retriever is None:
+                    self._rag_retriever = create_retriever(coalesce=self.coalesce)
+        return self._rag_retriever
+
+    @property
+    def llm_client(self):
+        """Shared LLM client (and its HTTP connection pool), created on first use"""
+        if self._llm_client is None:
+            with self._shared_lock:
+                if self._llm_client is None:
+                    self._llm_client = create_llm_client(os.environ.get('AI21_API_KEY', AI21_API_KEY))
+        return self._llm_client
+
+    def warm_up(self) -> None:
+        """Load the shared resources up front so the first players don't pay for it"""
+        self.rag_retriever
+        self.llm_client
+        _chat_message("", "system")
+
+    def _new_orchestrator(self) -> GameOrchestrator:
+        agent = LLMCharacterAgent(
+            api_key=os.environ.get('AI21_API_KEY', AI21_API_KEY),
+            completion_cache=self.completion_cache,
+            client=self.llm_client,
+            single_flight=single_flight,
+            coalesce=self.coalesce
+        )
+        return GameOrchestrator(
+            rag_retriever=self.rag_retriever,
+            llm_agent=agent,
+            game_data=self.game_data,
+            speculative_prefetch=False
+        )
+
+    def _get(self, session_id: str) -> GameSession:
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            raise UnknownSessionError(f"Unknown session: {session_id}")
+        session.last_active = time.time()
+        return session
+
+    def create_session(self, player_name: str = "Player") -> Dict[str, Any]:
+        """Start a new game for a player
+
+        Args:
+            player_name: Name of the player character
+
+        Returns:
+            Dictionary with the new session_id and the initial scene
+
+        Raises:
+            SessionLimitError: If the server is at max_sessions after expiring idle ones
+        """
+        with self._sessions_lock:
+            full = len(self._sessions) >= self.max_sessions
+        if full:
+            self.expire_idle_sessions()
+            with self._sessions_lock:
+                if len(self._sessions) >= self.max_sessions:
+                    raise SessionLimitError("Too many active sessions")
+
+        session = GameSession(uuid.uuid4().hex, self._new_orchestrator())
+        with session.lock:
+            scene = session.orchestrator.start_game(player_name)
+        with self._sessions_lock:
+            self._sessions[session.session_id] = session
+
+        return {"session_id": session.session_id, "scene": scene}
+
+    def get_scene(self, session_id: str) -> Dict[str, Any]:
+        """Get the current scene of a session
+
+        Raises:
+            UnknownSessionError: If there is no such session
+        """
+        session = self._get(session_id)
+        with session.lock:
+            return session.orchestrator.get_current_scene()
+
+    def take_action(self, session_id: str, action_index: int, custom_action: Optional[str] = None) -> Dict[str, Any]:
+        """Play one turn for a session
+
+        Args:
+            session_id: Session to act in
+            action_index: Index of the chosen action (0-3)
+            custom_action: Optional custom action text
+
+        Returns:
+            Dictionary with the action result and the next scene (None at the end of a path)
+
+        Raises:
+            UnknownSessionError: If there is no such session
+            ValueError: If the action index is out of range (or the session has no scene)
+        """
+        session = self._get(session_id)
+        with session.lock:
+            result = session.orchestrator.process_player_action(action_index, custom_action)
+            if "error" in result:
+                raise ValueError(result["error"])
+            next_scene = None
+            if result.get("has_next_scene"):
+                next_scene = session.orchestrator.advance_to_next_scene()
+        return {"result": result, "scene": next_scene}
+
+    def end_session(self, session_id: str) -> bool:
+        """Drop a session
+
+        Returns:
+            True if the session existed
+        """
+        with self._sessions_lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def expire_idle_sessions(self) -> int:
+        """Drop sessions idle for longer than session_ttl
+
+        Returns:
+            Number of sessions dropped
+        """
+        cutoff = time.time() - self.session_ttl
+        with self._sessions_lock:
+            expired = [session_id for session_id, session in self._sessions.items() if session.last_active < cutoff]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get server-wide counters"""
+        with self._sessions_lock:
+            active = len(self._sessions)
+        stats = {"active_sessions": active, "max_sessions": self.max_sessions}
+        if self.completion_cache is not None:
+            stats["completion_cache"] = self.completion_cache.stats()
+        if self.coalesce:
+            stats["single_flight"] = single_flight.stats()
+        return stats
@@ -0,0 +1,273 @@
+"""Fault-injection harness for the resilient LLM client
+
+Starts a local fake of the AI21 chat completions endpoint that fails, stalls
+or hangs on a configurable share of requests, points a real AI21Client (via
+create_llm_client) at it and checks that every scenario ends within its
+deadline with either a completion or a canned fallback.
+
+Usage:
+    python -m rpg_game.simulation.fault_injection
+    python -m rpg_game.simulation.fault_injection --calls 100 --scenario flaky --scenario outage
+"""
+import sys
+import json
+import time
+import uuid
+import socket
+import random
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+
+from rpg_game.config import DEFAULT_MODEL, LLM_BREAKER_THRESHOLD
+from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.agent.resilient_client import create_llm_client
+from rpg_game.behavior.controller import BehaviorController
+from rpg_game.telemetry.telemetry import percentile
+
+
+class FaultPlan:
+    """Share of requests the fake server answers with an error, a delay or not at all"""
+
+    def __init__(self, error_rate: float = 0.0, error_status: int = 503, slow_rate: float = 0.0,
+                 slow_delay: float = 1.0, hang_rate: float = 0.0, hang_delay: float = 5.0,
+                 latency: float = 0.02, seed: int = 0):
+        """Initialize the plan
+
+        Args:
+            error_rate: Share of requests answered with error_status
+            error_status: HTTP status of injected errors
+            slow_rate: Share of requests delayed by slow_delay
+            slow_delay: Extra seconds for slow requests
+            hang_rate: Share of requests held for hang_delay (past any sane timeout)
+            hang_delay: Seconds a hanging request is held
+            latency: Seconds every request takes
+            seed: Random seed
+        """
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.hang_rate = hang_rate
+        self.hang_delay = hang_delay
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> str:
+        """Pick the fate of the next request: "error", "hang", "slow" or "ok" """
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return "error"
+        if roll < self.error_rate + self.hang_rate:
+            return "hang"
+        if roll < self.error_rate + self.hang_rate + self.slow_rate:
+            return "slow"
+        return "ok"
+
+
+class _FakeCompletionHandler(BaseHTTPRequestHandler):
+    """Answers POST .../chat/completions like the AI21 API, following the server's fault plan"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"detail": "Not found"})
+            return
+
+        server = self.server
+        fate = server.plan.draw()
+        server.record(fate)
+        time.sleep(server.plan.latency)
+        if fate == "error":
+            self._send_json(server.plan.error_status, {"detail": "Injected failure"})
+            return
+        if fate == "hang":
+            time.sleep(server.plan.hang_delay)
+        elif fate == "slow":
+            time.sleep(server.plan.slow_delay)
+
+        messages = request.get("messages", [])
+        reply = server.replies.chat.completions._reply(messages)
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in messages)
+        completion_tokens = len(reply.split())
+        self._send_json(200, {
+            "id": f"chat-{uuid.uuid4().hex}",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+
+class FakeCompletionServer(ThreadingHTTPServer):
+    """Local fake of the AI21 chat completions API with injectable faults"""
+
+    daemon_threads = True
+
+    def __init__(self, plan: Optional[FaultPlan] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _FakeCompletionHandler)
+        self.plan = plan or FaultPlan()
+        self.replies = StubLLMClient(latency=0.0)
+        self.requests: Dict[str, int] = {"ok": 0, "error": 0, "slow": 0, "hang": 0}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as the client's api_host"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/studio/v1"
+
+    def record(self, fate: str) -> None:
+        with self._lock:
+            self.requests[fate] += 1
+
+    def start(self) -> "FakeCompletionServer":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-completions", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+# Client settings shared by every scenario: short timeouts so hangs are cut quickly
+HARNESS_CLIENT = {"deadline": 2.0, "attempt_timeout": 0.5, "max_retries": 2, "backoff_base": 0.05,
+                  "backoff_max": 0.2}
+
+# name -> (fault plan, client overrides, checks on the results)
+SCENARIOS = {
+    "healthy": (dict(), dict(), {"min_success": 1.0, "max_retries": 0}),
+    "flaky": (dict(error_rate=0.3), dict(), {"min_success": 0.9, "min_retries": 1}),
+    "throttled": (dict(error_rate=0.3, error_status=429), dict(), {"min_success": 0.9, "min_retries": 1}),
+    "hangs": (dict(hang_rate=0.2, hang_delay=3.0), dict(), {"min_success": 0.9, "max_p99": 2.1}),
+    "slow_tail": (dict(slow_rate=0.1, slow_delay=0.4), dict(hedge=True, hedge_min_samples=10),
+                  {"min_success": 1.0, "min_hedges": 1}),
+    "outage": (dict(error_rate=1.0, error_status=500), dict(),
+               {"max_success": 0.0, "min_trips": 1, "max_requests": LLM_BREAKER_THRESHOLD + 3}),
+    "bad_request": (dict(error_rate=1.0, error_status=400), dict(),
+                    {"max_success": 0.0, "max_retries": 0, "max_trips": 0}),
+}
+
+
+def run_scenario(name: str, calls: int, seed: int = 0) -> Dict[str, Any]:
+    """Make calls through a companion agent against a faulty fake server
+
+    Args:
+        name: Scenario name (a key of SCENARIOS)
+        calls: Number of companion replies to request
+        seed: Random seed of the fault plan
+
+    Returns:
+        Outcome counts, latency percentiles, client statistics and check failures
+    """
+    plan_options, client_options, checks = SCENARIOS[name]
+    server = FakeCompletionServer(FaultPlan(seed=seed, **plan_options)).start()
+    try:
+        client = create_llm_client("fake-key", api_host=server.url, **dict(HARNESS_CLIENT, **client_options))
+        agent = LLMCharacterAgent(api_key="fake-key", model=DEFAULT_MODEL,
+                                  completion_cache=CompletionCache(path=None), client=client)
+        agent_context = BehaviorController().get_prompt_context()
+        scene_context = {"description": "A rain-soaked road outside the abbey."}
+        canned = agent._fallback_response(agent_context)
+
+        latencies = []
+        successes = 0
+        for i in range(calls):
+            start = time.perf_counter()
+            reply = agent.generate_response(agent_context, scene_context, [], f"I speak to the monk ({i}).")
+            latencies.append(time.perf_counter() - start)
+            successes += reply != canned
+    finally:
+        server.stop()
+
+    stats = client.stats()
+    results = {
+        "success_rate": successes / calls,
+        "fallbacks": calls - successes,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "requests": sum(server.requests.values()),
+        "injected": {fate: count for fate, count in server.requests.items() if fate != "ok" and count},
+        "retries": stats["retries"],
+        "hedges": stats["hedges"],
+        "breaker_trips": stats["breaker_trips"]
+    }
+
+    failures = []
+    limits = {
+        "min_success": ("success_rate", min), "max_success": ("success_rate", max),
+        "min_retries": ("retries", min), "max_retries": ("retries", max),
+        "min_hedges": ("hedges", min), "min_trips": ("breaker_trips", min), "max_trips": ("breaker_trips", max),
+        "max_requests": ("requests", max), "max_p99": ("p99_ms", max)
+    }
+    for check, bound in checks.items():
+        field, kind = limits[check]
+        value = results[field]
+        if check == "max_p99":
+            bound *= 1000
+        if (kind is min and value < bound) or (kind is max and value > bound):
+            failures.append(f"{field}={value:.2f} violates {check}={bound}")
+    results["failures"] = failures
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run the resilient LLM client against injected faults")
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; all if omitted)")
+    args = parser.parse_args(argv)
+    # The SDK logs every injected failure
+    logging.getLogger("ai21").setLevel(logging.CRITICAL)
+
+    failed = False
+    for name in args.scenario or list(SCENARIOS):
+        results = run_scenario(name, args.calls, args.seed)
+        failures = results.pop("failures")
+        failed = failed or bool(failures)
+        summary = ", ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                            for key, value in results.items())
+        print(f"{'FAIL' if failures else 'ok':<4} {name:<12} {summary}")
+        for failure in failures:
+            print(f"     {failure}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
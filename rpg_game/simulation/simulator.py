@@ -0,0 +1,208 @@
+"""Headless playthrough simulator and throughput benchmark
+
+Plays the game without input() or the AI21 API: each session drives a
+GameOrchestrator backed by the offline stub LLM through a random (or
+scripted) path, and sessions run in parallel across a process pool.
+
+Usage:
+    python -m rpg_game.simulation.simulator --sessions 64 --turns 20 --workers 8
+    python -m rpg_game.simulation.simulator --script 1,0,2 --latency 0.2 --rag
+"""
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from rpg_game.config import STUB_LLM_LATENCY, STUB_LLM_TOKEN_LATENCY, STUB_LLM_RESPONSE_TOKENS
+from rpg_game.agent.llm_agent import LLMCharacterAgent, _chat_message
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.telemetry.telemetry import percentile
+
+STAGES = ("retrieve", "action_generation", "scoring", "behavior_update", "response")
+
+
+class NullRetriever:
+    """Retriever that returns nothing, for measuring server overhead alone"""
+
+    def retrieve(self, query: str, top_k: int = 3, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return []
+
+
+class StageTimer:
+    """Records wall time spent in wrapped methods, per stage"""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, obj: Any, method_name: str, stage: str) -> None:
+        """Time every call of obj.method_name under the given stage"""
+        method = getattr(obj, method_name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.durations[stage].append(time.perf_counter() - start)
+
+        setattr(obj, method_name, timed)
+
+
+def simulate_session(session_index: int, turns: int, script: Optional[List[int]] = None, seed: int = 0,
+                     latency: float = STUB_LLM_LATENCY, token_latency: float = STUB_LLM_TOKEN_LATENCY,
+                     response_tokens: int = STUB_LLM_RESPONSE_TOKENS, use_rag: bool = False,
+                     prefetch: bool = False, game_data_path: str = "./data/game_data.json") -> Dict[str, Any]:
+    """Play one headless session
+
+    Args:
+        session_index: Index of the session (mixed into the random seed)
+        turns: Maximum number of turns to play
+        script: Action indices to play in order (repeated); random choices if None
+        seed: Base random seed
+        latency: Stub LLM latency per completion in seconds
+        token_latency: Stub LLM latency per generated word in seconds
+        response_tokens: Words per stub companion reply
+        use_rag: Use the real retriever (otherwise one that returns nothing)
+        prefetch: Enable speculative prefetch of successor scenes
+        game_data_path: Path to the game data JSON file
+
+    Returns:
+        Dictionary with turns played, elapsed time, per-stage durations and memory growth
+    """
+    rng = random.Random(seed * 1_000_003 + session_index)
+    timer = StageTimer()
+
+    retriever = None if use_rag else NullRetriever()
+    agent = LLMCharacterAgent(
+        api_key="offline",
+        completion_cache=CompletionCache(path=None),
+        client=StubLLMClient(latency=latency, token_latency=token_latency, response_tokens=response_tokens)
+    )
+    game = GameOrchestrator(game_data_path, rag_retriever=retriever, llm_agent=agent, speculative_prefetch=prefetch)
+    timer.wrap(game.rag_retriever, "retrieve", "retrieve")
+    timer.wrap(agent, "generate_action_choices", "action_generation")
+    timer.wrap(agent, "generate_response", "response")
+
+    # Import the chat message type now so its one-off cost isn't timed or counted
+    _chat_message("", "system")
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    scene = game.start_game(f"Simulated {session_index}")
+    # start_game creates fresh scoring and behavior components
+    timer.wrap(game.scoring_engine, "apply_score_effects", "scoring")
+    timer.wrap(game.behavior_controller, "update_agent_state", "behavior_update")
+
+    played = 0
+    path = [game.current_scene_id]
+    for turn in range(turns):
+        actions = scene.get("actions", [])
+        if not actions:
+            break
+        action_index = script[turn % len(script)] if script else rng.randrange(len(actions))
+        result = game.process_player_action(min(action_index, len(actions) - 1))
+        played += 1
+        if not result.get("has_next_scene"):
+            break
+        scene = game.advance_to_next_scene()
+        path.append(game.current_scene_id)
+
+    elapsed = time.perf_counter() - start
+    final_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if game.prefetcher is not None:
+        game.prefetcher.shutdown()
+
+    return {
+        "turns": played,
+        "elapsed": elapsed,
+        "stages": dict(timer.durations),
+        "memory_growth": final_memory - baseline,
+        "peak_memory": peak_memory - baseline,
+        "path": path,
+        "llm_calls": agent.client.calls
+    }
+
+
+def run_simulation(sessions: int, turns: int, workers: int, **session_kwargs) -> Dict[str, Any]:
+    """Play sessions across a process pool and aggregate their results
+
+    Args:
+        sessions: Number of sessions to play
+        turns: Maximum turns per session
+        workers: Worker processes
+        **session_kwargs: Passed to simulate_session
+
+    Returns:
+        Aggregated throughput, stage latencies and memory figures
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate_session, i, turns, **session_kwargs) for i in range(sessions)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    total_turns = sum(result["turns"] for result in results)
+    stages = {}
+    for stage in STAGES:
+        durations = [duration for result in results for duration in result["stages"].get(stage, [])]
+        stages[stage] = {
+            "calls": len(durations),
+            "total_seconds": sum(durations),
+            "p50_ms": percentile(durations, 50) * 1000,
+            "p99_ms": percentile(durations, 99) * 1000
+        }
+
+    return {
+        "sessions": sessions,
+        "turns": total_turns,
+        "elapsed_seconds": elapsed,
+        "turns_per_second": total_turns / elapsed if elapsed else 0.0,
+        "session_turns_per_second": total_turns / sum(result["elapsed"] for result in results),
+        "stages": stages,
+        "kb_memory_growth_per_session": sum(result["memory_growth"] for result in results) / sessions / 1024,
+        "kb_peak_memory_per_session": max(result["peak_memory"] for result in results) / 1024,
+        "llm_calls": sum(result["llm_calls"] for result in results)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run headless playthroughs with a stub LLM")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--script", help="Comma-separated action indices to play (random if omitted)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=STUB_LLM_LATENCY, help="Stub LLM latency per completion (seconds)")
+    parser.add_argument("--token-latency", type=float, default=STUB_LLM_TOKEN_LATENCY, help="Stub LLM latency per word")
+    parser.add_argument("--response-tokens", type=int, default=STUB_LLM_RESPONSE_TOKENS, help="Words per stub reply")
+    parser.add_argument("--rag", action="store_true", help="Use the real retriever in every worker")
+    parser.add_argument("--prefetch", action="store_true", help="Enable speculative scene prefetch")
+    args = parser.parse_args(argv)
+
+    script = [int(action) for action in args.script.split(",")] if args.script else None
+    results = run_simulation(
+        args.sessions, args.turns, args.workers, script=script, seed=args.seed, latency=args.latency,
+        token_latency=args.token_latency, response_tokens=args.response_tokens, use_rag=args.rag,
+        prefetch=args.prefetch
+    )
+
+    stages = results.pop("stages")
+    for name, value in results.items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+    print("\nStage latency:")
+    for stage, figures in stages.items():
+        print(f"  {stage:<18} calls={figures['calls']:<6} total={figures['total_seconds']:.2f}s "
+              f"p50={figures['p50_ms']:.2f}ms p99={figures['p99_ms']:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
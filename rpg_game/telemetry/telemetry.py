@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from rpg_game.config import TELEMETRY_ENABLED, LOG_LEVEL, TELEMETRY_SPAN_BUFFER, TELEMETRY_BUCKETS
+
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _label_key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _NoopSpan:
+    """Span returned while telemetry is disabled; does nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Timed stage of work; use through Telemetry.span as a context manager"""
+
+    __slots__ = ("telemetry", "name", "attributes", "parent", "start", "wall_start")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attributes: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[str] = None
+
+    def __enter__(self) -> "Span":
+        stack = self.telemetry._stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        duration = time.perf_counter() - self.start
+        self.telemetry._stack().pop()
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.telemetry._finish(self, duration)
+        return False
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+
+class InMemoryExporter:
+    """Keeps the most recent finished spans in memory"""
+
+    def __init__(self, max_spans: int = TELEMETRY_SPAN_BUFFER):
+        self.spans: deque = deque(maxlen=max_spans)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        self.spans.append(span)
+
+    def flush(self, telemetry: "Telemetry") -> None:
+        pass
+
+
+class JSONLinesExporter:
+    """Appends every finished span to a JSON Lines file"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def flush(self, telemetry: "Telemetry") -> None:
+        with self._lock:
+            self._file.flush()
+
+
+class PrometheusTextExporter:
+    """Writes all counters and histograms in the Prometheus text format on flush
+
+    Point a node_exporter textfile collector (or anything else that reads
+    the exposition format) at the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, span: Dict[str, Any]) -> None:
+        pass
+
+    def flush(self, telemetry: "Telemetry") -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(telemetry.prometheus_text())
+        os.replace(temp_path, self.path)
+
+
+class Telemetry:
+    """Spans, counters, histograms and a leveled logger behind one switch
+
+    While disabled, span() returns a shared no-op context manager and the
+    metric methods return immediately, so instrumented code pays only an
+    attribute check. Logging has its own level and works either way.
+    """
+
+    def __init__(self, enabled: bool = TELEMETRY_ENABLED, log_level: str = LOG_LEVEL,
+                 buckets: Tuple[float, ...] = TELEMETRY_BUCKETS):
+        """Initialize telemetry
+
+        Args:
+            enabled: Record spans and metrics
+            log_level: Minimum level printed by log()
+            buckets: Histogram bucket upper bounds
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.exporters: List[Any] = []
+        self.set_log_level(log_level)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters: Dict[LabelKey, float] = {}
+        self._histograms: Dict[LabelKey, List[Any]] = {}
+
+    def set_log_level(self, level: str) -> None:
+        """Change the minimum level printed by log()"""
+        self.log_level = LOG_LEVELS[level.lower()]
+
+    def log(self, message: str, level: str = "info") -> None:
+        """Print a message if its level is enabled"""
+        if LOG_LEVELS[level] >= self.log_level:
+            print(message)
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, **attributes):
+        """Time a stage of work
+
+        Args:
+            name: Stage name, e.g. "scene.retrieve"
+            **attributes: Extra fields recorded with the span
+
+        Returns:
+            Context manager yielding the span (a no-op when disabled)
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def _finish(self, span: Span, duration: float) -> None:
+        self.observe("span_duration_seconds", duration, span=span.name)
+        if not self.exporters:
+            return
+        record = {
+            "name": span.name,
+            "parent": span.parent,
+            "start": span.wall_start,
+            "duration": duration,
+            "thread": threading.current_thread().name,
+            "attributes": span.attributes
+        }
+        for exporter in self.exporters:
+            try:
+                exporter.export(record)
+            except Exception as e:
+                self.log(f"Error exporting span: {e}", "error")
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        key = _label_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record a value in a histogram"""
+        if not self.enabled:
+            return
+        key = _label_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][bisect.bisect_left(self.buckets, value)] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def flush(self) -> None:
+        """Flush every exporter (writes files such as the Prometheus text file)"""
+        for exporter in self.exporters:
+            try:
+                exporter.flush(self)
+            except Exception as e:
+                self.log(f"Error flushing telemetry exporter: {e}", "error")
+
+    def reset(self) -> None:
+        """Clear all counters and histograms"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get counters and histogram summaries
+
+        Returns:
+            Dictionary with "counters" and "histograms", keyed by name and labels
+        """
+        def label_name(key: LabelKey) -> str:
+            name, labels = key
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        with self._lock:
+            return {
+                "counters": {label_name(key): value for key, value in self._counters.items()},
+                "histograms": {
+                    label_name(key): {"count": count, "sum": total, "mean": total / count if count else 0.0}
+                    for key, (_, total, count) in self._histograms.items()
+                }
+            }
+
+    def prometheus_text(self) -> str:
+        """Render counters and histograms in the Prometheus text exposition format"""
+        def labels_text(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(labels) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+            return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = f"rpg_{name}_total"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{labels_text(labels)} {value}")
+
+            for (name, labels), (bucket_counts, total, count) in sorted(self._histograms.items()):
+                metric = f"rpg_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric}_bucket{labels_text(labels, ('le', le))} {cumulative}")
+                lines.append(f"{metric}_sum{labels_text(labels)} {total}")
+                lines.append(f"{metric}_count{labels_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide instance used by the instrumented modules
+telemetry = Telemetry()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def log(message: str, level: str = "info") -> None:
+    """Print a message through the process-wide telemetry logger"""
+    telemetry.log(message, level)
@@ -0,0 +1,101 @@
+import copy
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.stub_client import StubLLMClient
+
+# Two-scene story: the gate has no predefined actions, so they are generated
+GAME_DATA = {
+    "starting_scene": "gate",
+    "scenes": {
+        "gate": {
+            "title": "The Village Gate",
+            "description": "A guard blocks the village gate.",
+            "location": "Village Gate",
+            "rag_context_query": "medieval village gate, guards",
+            "rag_filter_tags": ["village", "law"],
+            "next_scene_map": {"0": "chapel", "1": "chapel", "2": "chapel", "3": "chapel"},
+            "score_effects": {"0": {"law": -5, "good": 0, "trust": -5, "xp": 2}}
+        },
+        "chapel": {
+            "title": "The Chapel",
+            "description": "Candles burn before the altar.",
+            "location": "Village Chapel",
+            "rag_context_query": "medieval church altar",
+            "rag_filter_tags": ["religion"],
+            "actions": ["Pray", "Search the altar", "Ring the bell", "Leave"],
+            "next_scene_map": {},
+            "score_effects": {}
+        }
+    }
+}
+
+
+class CountingRetriever:
+    """Retriever that records every query and returns one passage about it"""
+
+    def __init__(self):
+        self.calls: List[Any] = []
+
+    def retrieve(self, query: str, top_k: int = 3, filter_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        self.calls.append((query, top_k, filter_tags))
+        return [{"title": f"About {query}", "text": f"Facts about {query}.", "tags": list(filter_tags or [])}]
+
+
+@pytest.fixture
+def game_data() -> Dict[str, Any]:
+    return copy.deepcopy(GAME_DATA)
+
+
+@pytest.fixture
+def retriever() -> CountingRetriever:
+    return CountingRetriever()
+
+
+@pytest.fixture
+def stub_client() -> StubLLMClient:
+    return StubLLMClient(latency=0, token_latency=0, response_tokens=5)
+
+
+@pytest.fixture
+def agent(stub_client) -> LLMCharacterAgent:
+    """Agent on the stub client with a private in-memory completion cache"""
+    return LLMCharacterAgent(api_key="test", client=stub_client, completion_cache=CompletionCache(path=None))
+
+
+class CountingEncoder:
+    """SyntheticEncoder without delays that counts the texts it embeds"""
+
+    def __init__(self, dim: int = 16):
+        from benchmarks.batch_benchmark import SyntheticEncoder
+        self._encoder = SyntheticEncoder(dim=dim, call_seconds=0, text_seconds=0)
+        self.texts: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.texts.extend(texts)
+        return self._encoder.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def encoder() -> CountingEncoder:
+    return CountingEncoder()
+
+
+@pytest.fixture
+def numpy_retriever_factory(tmp_path, encoder):
+    """Build NumpyRetrievers over one index directory with the counting encoder and no embedding cache"""
+    from rpg_game.rag.numpy_retriever import NumpyRetriever
+
+    def build(**kwargs):
+        kwargs.setdefault("mode", "vector")
+        kwargs.setdefault("batch_window", 0)
+        return NumpyRetriever(index_path=str(tmp_path / "index"), embedding_model="synthetic", encoder=encoder,
+                              embedding_cache_dir=None, **kwargs)
+
+    return build
@@ -0,0 +1,91 @@
+import copy
+import random
+
+from rpg_game.scoring.engine import ScoringEngine
+from rpg_game.scoring.history import ActionHistory
+
+SKILLS = ["archery", "diplomacy", "herbalism"]
+
+
+def _play(engine, actions, seed=0):
+    """Apply random actions and return the records the old list-based history stored"""
+    rng = random.Random(seed)
+    snapshots = []
+    for step in range(actions):
+        effects = {"law": rng.randint(-60, 60), "good": rng.randint(-60, 60), "trust": rng.randint(-60, 60),
+                   "xp": rng.randint(0, 20)}
+        if rng.random() < 0.4:
+            effects["skills"] = {rng.choice(SKILLS): rng.randint(-2, 3)}
+        action_id = f"scene{step % 4}_action_{rng.randint(0, 3)}"
+        description = rng.choice(["Talk to the guard", "Climb the wall", "Pray", "Leave"])
+        engine.apply_score_effects(action_id, effects, description)
+        snapshots.append({"action_id": action_id, "description": description, "effects": effects,
+                          "resulting_alignment": copy.deepcopy(engine.alignment.dict())})
+    return snapshots
+
+
+def test_records_match_per_action_snapshots():
+    engine = ScoringEngine()
+    snapshots = _play(engine, 60)
+
+    assert engine.action_history.records(engine.alignment.dict()) == snapshots
+    assert engine.get_action_history(5) == snapshots[-5:]
+    # The random walk hits every bound and adds skills both new and existing
+    laws = [snapshot["resulting_alignment"]["law_chaos"] for snapshot in snapshots]
+    trusts = [snapshot["resulting_alignment"]["trust"] for snapshot in snapshots]
+    assert {-100, 100} <= set(laws) and {0, 100} <= set(trusts)
+    assert set(snapshots[-1]["resulting_alignment"]["skills"]) == set(SKILLS)
+
+
+def test_clamped_deltas_and_skills_are_undone_exactly():
+    engine = ScoringEngine()
+    engine.apply_score_effects("a", {"law": 500, "trust": -500, "skills": {"archery": 2}}, "Charge")
+    engine.apply_score_effects("b", {"law": 10, "trust": 5, "skills": {"archery": 1, "diplomacy": 0}}, "Parley")
+    engine.apply_score_effects("c", {"law": -30, "good": 7}, "Flee")
+
+    first, second, third = engine.get_action_history(3)
+
+    assert first["resulting_alignment"]["law_chaos"] == 100
+    assert first["resulting_alignment"]["trust"] == 0
+    assert first["resulting_alignment"]["skills"] == {"archery": 2}
+    assert second["resulting_alignment"]["law_chaos"] == 100
+    assert second["resulting_alignment"]["skills"] == {"archery": 3, "diplomacy": 0}
+    assert third["resulting_alignment"]["law_chaos"] == 70
+
+
+def test_compaction_keeps_the_retained_records_unchanged():
+    engine = ScoringEngine()
+    engine.action_history = ActionHistory(max_entries=5)
+    snapshots = []
+    for seed in range(4):
+        snapshots += _play(engine, 7, seed)
+        history = engine.action_history
+        assert len(history) < 2 * history.max_entries
+        assert history.total == len(snapshots)
+        assert history.records(engine.alignment.dict()) == snapshots[-len(history):]
+
+    # Strings of dropped rows are not kept after re-interning
+    history = engine.action_history
+    referenced = {history._strings[string_id]
+                  for column in (history.action_ids, history.descriptions, history.effects) for string_id in column}
+    assert set(history._strings) == referenced
+
+
+def test_round_trips_through_to_dict():
+    engine = ScoringEngine()
+    snapshots = _play(engine, 25)
+
+    restored = ActionHistory.from_dict(engine.action_history.to_dict())
+
+    assert restored.records(engine.alignment.dict()) == snapshots
+
+
+def test_old_save_records_are_rebuilt_exactly():
+    engine = ScoringEngine()
+    snapshots = _play(engine, 40, seed=3)
+    current = snapshots[-1]["resulting_alignment"]
+
+    history = ActionHistory.from_records(copy.deepcopy(snapshots))
+
+    assert history.records(current) == snapshots
+    assert history.records(current, limit=3) == snapshots[-3:]
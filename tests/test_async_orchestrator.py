@@ -0,0 +1,125 @@
+import time
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from rpg_game.agent.async_agent import AsyncLLMCharacterAgent
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.behavior.controller import BehaviorController
+from rpg_game.orchestrator.async_orchestrator import AsyncGameOrchestrator
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+
+SCENE_CONTEXT = {"title": "The Village Gate", "description": "A guard blocks the gate.", "location": "Village Gate"}
+
+
+def _async_agent(client=None):
+    client = client or StubLLMClient(latency=0, token_latency=0, response_tokens=5, asynchronous=True)
+    return AsyncLLMCharacterAgent(api_key="test", client=client, completion_cache=CompletionCache(path=None))
+
+
+class FailingCompletions:
+    async def create(self, **kwargs):
+        raise RuntimeError("upstream down")
+
+
+class EmptyStreamCompletions:
+    async def create(self, **kwargs):
+        async def chunks():
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))])
+        return chunks()
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def test_async_turns_match_sync_turns(game_data, retriever, agent):
+    sync_game = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                                 speculative_prefetch=False)
+    async_game = AsyncGameOrchestrator(rag_retriever=retriever, llm_agent=_async_agent(), game_data=game_data,
+                                       speculative_prefetch=True)
+
+    async def play_async():
+        scenes = [await async_game.start_game("Tester")]
+        result = await async_game.process_player_action(0)
+        scenes.append(await async_game.advance_to_next_scene())
+        return scenes, result
+
+    sync_scenes = [sync_game.start_game("Tester")]
+    sync_result = sync_game.process_player_action(0)
+    sync_scenes.append(sync_game.advance_to_next_scene())
+    async_scenes, async_result = asyncio.run(play_async())
+
+    assert async_scenes == sync_scenes
+    assert async_result == sync_result
+    assert async_game.current_scene_id == sync_game.current_scene_id == "chapel"
+    assert async_game.llm_agent.conversation_history == sync_game.llm_agent.conversation_history
+
+
+class SlowChapelRetriever:
+    """Retriever that takes a while for the chapel, so its render is still running when a stream closes"""
+
+    def retrieve(self, query, top_k=3, filter_tags=None):
+        if "church" in query:
+            time.sleep(0.2)
+        return []
+
+
+@pytest.mark.parametrize("events_read", [1, 2])
+def test_stream_closed_early_still_ends_the_turn(game_data, events_read):
+    game = AsyncGameOrchestrator(rag_retriever=SlowChapelRetriever(), llm_agent=_async_agent(), game_data=game_data,
+                                 speculative_prefetch=True)
+
+    async def run():
+        await game.start_game("Tester")
+        stream = game.process_player_action_stream(0)
+        events = [await stream.__anext__() for _ in range(events_read)]
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()]
+        return events, leftover
+
+    events, leftover = asyncio.run(run())
+    assert [event["type"] for event in events] == ["action", "token"][:events_read]
+    # The next scene's render is cancelled rather than left running
+    assert leftover == []
+    assert game.current_scene_id == "chapel"
+    assert game.turn == 1
+    assert game.scoring_engine.alignment.law_chaos == -5
+
+
+def test_async_orchestrator_uses_the_agent_it_is_given(game_data, retriever):
+    agent = _async_agent()
+    game = AsyncGameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data)
+    assert game.llm_agent is agent
+    assert game.prefetcher is None
+
+
+def test_failed_calls_fall_back_to_canned_replies():
+    agent = _async_agent(_client(FailingCompletions()))
+    agent_context = BehaviorController().get_prompt_context()
+
+    async def run():
+        reply = await agent.generate_response(agent_context, SCENE_CONTEXT, [], "I wait")
+        actions = await agent.generate_action_choices(agent_context, SCENE_CONTEXT, [])
+        streamed = [text async for text in agent.aiter_response(agent_context, SCENE_CONTEXT, [], "I leave")]
+        return reply, actions, streamed
+
+    reply, actions, streamed = asyncio.run(run())
+    assert reply == agent._fallback_response(agent_context)
+    assert actions == agent._fallback_action_choices(agent_context, SCENE_CONTEXT)
+    assert streamed == [agent._fallback_response(agent_context)]
+    assert len(agent.conversation_history) == 4
+
+
+def test_stream_without_text_records_nothing():
+    agent = _async_agent(_client(EmptyStreamCompletions()))
+    agent_context = BehaviorController().get_prompt_context()
+
+    async def run():
+        return [text async for text in agent.aiter_response(agent_context, SCENE_CONTEXT, [], "I wait")]
+
+    assert asyncio.run(run()) == []
+    assert agent.conversation_history == []
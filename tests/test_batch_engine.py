@@ -0,0 +1,75 @@
+import numpy as np
+
+from rpg_game.scoring.batch_engine import BatchScoringEngine
+from rpg_game.scoring.engine import ScoringEngine
+
+
+def _assert_parity(store, sessions, engines):
+    for session, engine in zip(sessions, engines):
+        assert store.get_current_scores(session) == engine.get_current_scores(), f"Mismatch for session {session}"
+
+
+def test_random_effects_match_scoring_engine():
+    rng = np.random.default_rng(0)
+    store = BatchScoringEngine(capacity=4)
+    sessions = store.add_sessions(50)
+    engines = [ScoringEngine() for _ in sessions]
+
+    for tick in range(40):
+        effects = {"law": int(rng.integers(-40, 41)), "good": int(rng.integers(-40, 41)),
+                   "trust": int(rng.integers(-40, 41)), "xp": int(rng.integers(0, 50))}
+        # Each tick touches a different subset of sessions
+        chosen = np.flatnonzero(rng.random(len(sessions)) < 0.5)
+        store.apply_score_effects(sessions[chosen], effects)
+        for session in chosen:
+            engines[session].apply_score_effects(f"tick{tick}", effects)
+
+    _assert_parity(store, sessions, engines)
+
+
+def test_scores_clamp_at_the_bounds():
+    store = BatchScoringEngine()
+    sessions = store.add_sessions(2)
+    engines = [ScoringEngine() for _ in sessions]
+
+    for effects in ({"law": 150, "good": -150, "trust": 250}, {"law": -30, "good": 30, "trust": -300},
+                    {"law": -500, "good": 500}):
+        store.apply_score_effects(sessions, effects)
+        for engine in engines:
+            engine.apply_score_effects("extreme", effects)
+        _assert_parity(store, sessions, engines)
+
+    assert store.get_current_scores(0)["alignment"]["law_chaos"] == -100
+    assert store.get_current_scores(0)["alignment"]["good_evil"] == 100
+    assert store.get_current_scores(0)["relationship"]["trust"] == 0
+
+
+def test_per_session_deltas_clamp_independently():
+    store = BatchScoringEngine()
+    sessions = store.add_sessions(3)
+
+    store.apply_deltas(sessions, law=[-200, 10, 200], trust=[-100, 5, 100], xp=[1, 2, 3])
+
+    assert store.law_chaos[sessions].tolist() == [-100, 10, 100]
+    assert store.trust[sessions].tolist() == [0, 55, 100]
+    assert store.xp[sessions].tolist() == [1, 2, 3]
+
+
+def test_skill_effects_add_new_and_raise_existing_skills():
+    store = BatchScoringEngine()
+    sessions = store.add_sessions(3)
+    engines = [ScoringEngine() for _ in sessions]
+
+    steps = [(sessions[:2], {"xp": 5, "skills": {"archery": 1}}),
+             (sessions, {"skills": {"archery": 2, "diplomacy": 1}}),
+             (sessions[2:], {"skills": {"diplomacy": -1}})]
+    for chosen, effects in steps:
+        store.apply_score_effects(chosen, effects)
+        for session in chosen:
+            engines[session].apply_score_effects("train", effects)
+
+    _assert_parity(store, sessions, engines)
+    assert store.skills[0] == {"archery": 3, "diplomacy": 1}
+    assert store.skills[2] == {"archery": 2, "diplomacy": 0}
+    # Sessions never share a skills dict
+    assert store.skills[0] is not store.skills[1]
@@ -0,0 +1,71 @@
+import time
+import threading
+
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.agent.llm_agent import LLMCharacterAgent
+from rpg_game.agent.stub_client import StubLLMClient
+from rpg_game.behavior.controller import BehaviorController
+from rpg_game.concurrency.single_flight import SingleFlight
+from rpg_game.rag.coalescing import CoalescingRetriever
+
+SCENE_CONTEXT = {"title": "The Village Gate", "description": "A guard blocks the gate.", "location": "Village Gate"}
+
+
+class SlowRetriever:
+    """Retriever answering every query with its own name after a delay"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+
+    def retrieve(self, query, top_k=3, filter_tags=None):
+        self.calls += 1
+        time.sleep(0.1)
+        return [{"title": self.name, "text": query, "tags": []}]
+
+
+def _concurrently(*calls):
+    results = [None] * len(calls)
+
+    def run(i, call):
+        results[i] = call()
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_queries_on_one_retriever_share_a_search():
+    retriever = SlowRetriever("chronicle")
+    coalescing = CoalescingRetriever(retriever, SingleFlight())
+
+    results = _concurrently(*[lambda: coalescing.retrieve("castle siege", filter_tags=["war"])] * 4)
+
+    assert retriever.calls == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_different_retrievers_do_not_share_results():
+    single_flight = SingleFlight()
+    first = CoalescingRetriever(SlowRetriever("first"), single_flight)
+    second = CoalescingRetriever(SlowRetriever("second"), single_flight)
+
+    results = _concurrently(lambda: first.retrieve("castle siege"), lambda: second.retrieve("castle siege"))
+
+    assert [result[0]["title"] for result in results] == ["first", "second"]
+
+
+def test_agents_on_different_clients_do_not_share_action_calls():
+    single_flight = SingleFlight()
+    clients = [StubLLMClient(latency=0.1, token_latency=0), StubLLMClient(latency=0.1, token_latency=0)]
+    agents = [LLMCharacterAgent(api_key="test", client=client, completion_cache=CompletionCache(path=None),
+                                single_flight=single_flight) for client in clients]
+    agent_context = BehaviorController().get_prompt_context()
+
+    _concurrently(*[lambda agent=agent: agent.generate_action_choices(agent_context, SCENE_CONTEXT, [])
+                    for agent in agents])
+
+    assert [client.calls for client in clients] == [1, 1]
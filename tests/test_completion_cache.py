@@ -0,0 +1,139 @@
+import sqlite3
+
+import pytest
+
+from rpg_game.agent import completion_cache as completion_cache_module
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.behavior.controller import BehaviorController
+
+SCENE_CONTEXT = {"description": "A guard blocks the gate.", "location": "Village Gate", "time_of_day": "morning"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(completion_cache_module.time, "time", clock)
+    return clock
+
+
+def _last_access(path, key):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT last_access FROM completions WHERE key = ?", (key,)).fetchone()[0]
+
+
+def _rows(path):
+    with sqlite3.connect(path) as db:
+        return [key for key, in db.execute("SELECT key FROM completions ORDER BY key")]
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = CompletionCache(path=path, ttl=60)
+    cache.set("default", "a")
+    cache.set("short", "b", ttl=5)
+
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("default") == "a"
+    assert CompletionCache(path=path).get("short") is None
+
+    clock.now += 60
+    assert cache.get("default") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_memory_tier_evicts_the_least_recently_used(clock):
+    cache = CompletionCache(path=None, memory_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_disk_tier_evicts_expired_then_least_recently_used_rows(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = CompletionCache(path=path, max_entries=10)
+    for i in range(10):
+        clock.now += 1
+        writer.set(f"key{i}", i, ttl=5 if i == 9 else None)
+
+    # key9 expires; a disk hit from another instance marks key0 as recently used
+    clock.now += 10
+    reader = CompletionCache(path=path, access_batch=1)
+    assert reader.get("key0") == 0
+
+    writer.set("key10", 10)
+    assert len(_rows(path)) == 10
+    writer.set("key11", 11)
+
+    # Over the limit: the oldest rows are trimmed to 90% of max_entries
+    assert _rows(path) == sorted(["key0", "key3", "key4", "key5", "key6", "key7", "key8", "key10", "key11"])
+
+
+def test_row_count_is_kept_without_counting_on_every_set(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = CompletionCache(path=path, max_entries=100)
+    for i in range(5):
+        cache.set(f"key{i}", i)
+    cache.set("key0", "replaced")
+
+    assert cache._row_count == len(_rows(path)) == 5
+    assert CompletionCache(path=path)._row_count == 5
+
+
+def test_disk_hits_write_last_access_in_batches(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = CompletionCache(path=path)
+    for key in ("a", "b", "c", "d"):
+        writer.set(key, key.upper())
+
+    cache = CompletionCache(path=path, access_batch=3)
+    clock.now += 1
+    assert (cache.get("a"), cache.get("b")) == ("A", "B")
+    assert [_last_access(path, key) for key in "ab"] == [1000.0, 1000.0]
+
+    cache.get("c")
+    assert [_last_access(path, key) for key in "abc"] == [1001.0, 1001.0, 1001.0]
+
+    clock.now += 1
+    cache.get("d")
+    assert _last_access(path, "d") == 1000.0
+    cache.flush()
+    assert _last_access(path, "d") == 1002.0
+
+
+def test_values_round_trip_through_sqlite(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    value = ["Talk to the guard", "Climb the wall", {"nested": [1, 2.5, None]}, "Leave"]
+    CompletionCache(path=path).set("key", value)
+
+    cache = CompletionCache(path=path)
+    assert cache.get("key") == value
+    assert cache.stats()["hits"] == 1
+    # Served from memory afterwards
+    assert cache.stats()["memory_entries"] == 1
+
+
+def test_cached_action_choices_are_copies(agent):
+    agent_context = BehaviorController().get_prompt_context()
+    first = agent.generate_action_choices(agent_context, SCENE_CONTEXT, [])
+    expected = list(first)
+
+    first.append("Mutated by the caller")
+    second = agent.generate_action_choices(agent_context, SCENE_CONTEXT, [])
+    second.pop()
+    third = agent.generate_action_choices(agent_context, SCENE_CONTEXT, [])
+
+    assert third == expected
@@ -0,0 +1,111 @@
+import threading
+
+from rpg_game.agent.conversation_memory import ConversationMemory, extractive_summary
+from rpg_game.agent.llm_agent import LLMCharacterAgent, _chat_message
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+
+
+def _messages(count, start=0):
+    return [_chat_message(f"message {i}", "user" if i % 2 == 0 else "assistant") for i in range(start, start + count)]
+
+
+def _contents(messages):
+    return [message.content for message in messages]
+
+
+class RecordingSummarizer:
+    """Summarizer that records the messages of each fold"""
+
+    def __init__(self, release=None):
+        self.release = release
+        self.entered = threading.Event()
+        self.calls = []
+
+    def __call__(self, summary, messages, max_tokens):
+        self.entered.set()
+        if self.release is not None:
+            self.release.wait(5)
+        self.calls.append(_contents(messages))
+        return " | ".join(filter(None, [summary] + _contents(messages)))
+
+
+def test_overflow_evicts_down_to_half_capacity():
+    summarizer = RecordingSummarizer()
+    memory = ConversationMemory(max_messages=4, summarizer=summarizer, background=False)
+    for message in _messages(5):
+        memory.append(message)
+
+    assert _contents(memory.recent()) == ["message 3", "message 4"]
+    assert summarizer.calls == [["message 0", "message 1", "message 2"]]
+    assert memory.summary == "message 0 | message 1 | message 2"
+    assert memory.backlog() == []
+
+
+def test_evictions_during_a_running_fold_join_the_next_one():
+    release = threading.Event()
+    summarizer = RecordingSummarizer(release)
+    memory = ConversationMemory(max_messages=2, summarizer=summarizer)
+    messages = _messages(9)
+    for message in messages[:3]:
+        memory.append(message)
+    assert summarizer.entered.wait(5)
+    for message in messages[3:]:
+        memory.append(message)
+    # The first fold is blocked; later evictions wait in the backlog
+    assert _contents(memory.backlog()) == _contents(_messages(8))
+    release.set()
+
+    assert memory.wait(5)
+    assert summarizer.calls == [["message 0", "message 1"], _contents(_messages(6, start=2))]
+    assert memory.folds == 2
+    assert _contents(memory.recent()) == ["message 8"]
+
+
+def test_failed_or_empty_summaries_fall_back_to_the_extractive_one():
+    def failing(summary, messages, max_tokens):
+        raise RuntimeError("summarizer down")
+
+    for summarizer in (failing, lambda summary, messages, max_tokens: ""):
+        memory = ConversationMemory(max_messages=2, summary_tokens=200, summarizer=summarizer, background=False)
+        for message in _messages(3):
+            memory.append(message)
+        assert memory.summary == extractive_summary("", _messages(2), 200)
+        assert memory.summary.splitlines() == ["Player: message 0", "Companion: message 1"]
+
+
+def test_restore_folds_the_backlog_and_keeps_the_messages():
+    summarizer = RecordingSummarizer()
+    memory = ConversationMemory(max_messages=4, summarizer=summarizer, background=False)
+    memory.restore(_messages(2, start=2), "earlier", _messages(2))
+
+    assert _contents(memory.recent()) == ["message 2", "message 3"]
+    assert summarizer.calls == [["message 0", "message 1"]]
+    assert memory.summary == "earlier | message 0 | message 1"
+    assert memory.unsummarized() == memory.recent()
+
+
+def test_loading_a_save_never_calls_the_summarizer(tmp_path, game_data, retriever, stub_client):
+    save_path = str(tmp_path / "save.json")
+    game = GameOrchestrator(rag_retriever=retriever, llm_agent=LLMCharacterAgent(
+        api_key="test", client=stub_client, completion_cache=CompletionCache(path=None)
+    ), game_data=game_data, speculative_prefetch=False)
+    game.start_game("Tester")
+    assert game.save_game(save_path)
+    # Enough exchanges after the snapshot to overflow the memory while they are replayed
+    for i in range(6):
+        game.event_log.record({"type": "agent_message", "player_message": f"I ask {i}", "response": f"Reply {i}"})
+    assert game.save_game(save_path)
+
+    summarizer = RecordingSummarizer()
+    agent = LLMCharacterAgent(api_key="test", client=stub_client, completion_cache=CompletionCache(path=None))
+    agent.memory = ConversationMemory(max_messages=4, summarizer=summarizer)
+    loaded = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                              speculative_prefetch=False)
+    assert loaded.load_game(save_path)
+    assert agent.memory.wait(5)
+
+    assert summarizer.calls == []
+    assert _contents(agent.memory.recent())[-2:] == ["I ask 5", "Reply 5"]
+    assert "Player: I ask 0" in agent.memory.summary
+    assert agent.memory.backlog() == []
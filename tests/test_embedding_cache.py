@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from rpg_game.rag.embedding_cache import EmbeddingCache
+
+
+def _vector(seed: int, dim: int = 8):
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32).tolist()
+
+
+def test_hits_and_misses(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path))
+    assert cache.get("bells") is None
+    cache.put_many(["bells"], [_vector(1)])
+    assert np.allclose(cache.get("bells"), _vector(1))
+
+    reopened = EmbeddingCache("model", cache_dir=str(tmp_path))
+    assert np.allclose(reopened.get("bells"), _vector(1))
+    assert reopened.get("knights") is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 1)
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["misses"]) == (1, 1)
+
+
+def test_caches_sharing_a_directory_keep_their_own_rows(tmp_path):
+    first = EmbeddingCache("model", cache_dir=str(tmp_path))
+    second = EmbeddingCache("model", cache_dir=str(tmp_path))
+    first.put_many(["a", "b"], [_vector(1), _vector(2)])
+    second.put_many(["c"], [_vector(3)])
+    first.put_many(["d"], [_vector(4)])
+
+    reopened = EmbeddingCache("model", cache_dir=str(tmp_path))
+    for seed, text in enumerate("abcd", start=1):
+        assert np.allclose(reopened.get(text), _vector(seed)), text
+
+
+def test_torn_append_is_not_misread(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path))
+    cache.put_many(["a"], [_vector(1)])
+    # A crash after writing part of a row and before logging it
+    with open(os.path.join(cache._dir, "vectors.f32"), 'ab') as f:
+        f.write(b"\0" * 10)
+    cache.put_many(["b"], [_vector(2)])
+
+    reopened = EmbeddingCache("model", cache_dir=str(tmp_path))
+    assert np.allclose(reopened.get("a"), _vector(1))
+    assert np.allclose(reopened.get("b"), _vector(2))
+
+
+def test_log_entries_past_the_matrix_are_dropped(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path))
+    cache.put_many(["a"], [_vector(1)])
+    with open(os.path.join(cache._dir, "index.log"), 'a', encoding='utf-8') as f:
+        f.write("deadbeef 7\n")
+
+    reopened = EmbeddingCache("model", cache_dir=str(tmp_path))
+    assert reopened.stats()["disk_entries"] == 1
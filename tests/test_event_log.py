@@ -0,0 +1,61 @@
+from rpg_game.orchestrator.event_log import EventLog
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+
+
+def _event(i):
+    return {"type": "score_changed", "turn": i}
+
+
+def test_unsaved_game_queues_nothing():
+    log = EventLog(snapshot_interval=10)
+    for i in range(3000):
+        log.record(_event(i))
+    assert log.pending == []
+
+
+def test_queue_is_bounded_and_overflow_forces_a_snapshot(tmp_path):
+    save_path = str(tmp_path / "save.json")
+    log = EventLog(snapshot_interval=10)
+    assert log.save(save_path, lambda: {"turn": 0}) == "snapshot"
+
+    for i in range(3000):
+        log.record(_event(i))
+        assert len(log.pending) <= log.snapshot_interval
+    assert log.save(save_path, lambda: {"turn": 3000}) == "snapshot"
+
+    state, events = EventLog().load(save_path)
+    assert state["turn"] == 3000
+    assert events == []
+
+
+def test_events_under_the_interval_are_appended_and_replayed(tmp_path):
+    save_path = str(tmp_path / "save.json")
+    log = EventLog(snapshot_interval=10)
+    log.save(save_path, lambda: {"turn": 0})
+
+    for i in range(4):
+        log.record(_event(i))
+    assert log.save(save_path, lambda: {"turn": 4}) == "append"
+    for i in range(4, 10):
+        log.record(_event(i))
+    assert log.save(save_path, lambda: {"turn": 10}) == "append"
+
+    state, events = EventLog().load(save_path)
+    assert state["turn"] == 0
+    assert events == [_event(i) for i in range(10)]
+
+
+def test_saved_game_round_trips(tmp_path, game_data, retriever, agent):
+    save_path = str(tmp_path / "save.json")
+    game = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data, speculative_prefetch=False)
+    game.start_game("Tester")
+    assert game.save_game(save_path)
+    game.process_player_action(0)
+    game.advance_to_next_scene()
+    assert game.save_game(save_path)
+
+    loaded = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                              speculative_prefetch=False)
+    assert loaded.load_game(save_path)
+    assert loaded.current_scene_id == game.current_scene_id == "chapel"
+    assert loaded.scoring_engine.get_current_scores() == game.scoring_engine.get_current_scores()
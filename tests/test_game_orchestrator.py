@@ -0,0 +1,75 @@
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+
+
+def _orchestrator(game_data, retriever, agent, **kwargs):
+    return GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                            speculative_prefetch=kwargs.pop("speculative_prefetch", False), **kwargs)
+
+
+def _count_action_generation(agent):
+    calls = []
+    generate = agent.generate_action_choices
+
+    def counting(**kwargs):
+        calls.append(kwargs)
+        return generate(**kwargs)
+
+    agent.generate_action_choices = counting
+    return calls
+
+
+def test_turn_retrieves_once_and_generates_actions_at_most_once(game_data, retriever, agent):
+    orchestrator = _orchestrator(game_data, retriever, agent)
+    action_calls = _count_action_generation(agent)
+
+    scene = orchestrator.start_game("Tester")
+    assert orchestrator.get_current_scene()["actions"] == scene["actions"]
+    result = orchestrator.process_player_action(0)
+    assert result["has_next_scene"]
+    assert len(retriever.calls) == 1
+    assert len(action_calls) == 1
+
+    next_scene = orchestrator.advance_to_next_scene()
+    assert next_scene["scene_id"] == "chapel"
+    assert len(retriever.calls) == 2
+    # The chapel has predefined actions
+    assert len(action_calls) == 1
+
+
+def test_action_uses_the_choices_the_player_was_shown(game_data, retriever, agent):
+    orchestrator = _orchestrator(game_data, retriever, agent)
+    scene = orchestrator.start_game("Tester")
+
+    result = orchestrator.process_player_action(2)
+
+    assert result["action_taken"] == scene["actions"][2]
+
+
+def test_prefetched_render_is_used(game_data, retriever, agent):
+    orchestrator = _orchestrator(game_data, retriever, agent, speculative_prefetch=True)
+    orchestrator.start_game("Tester")
+    # The chapel is rendered in the background while the player decides; take() waits for it
+    orchestrator.process_player_action(0)
+
+    next_scene = orchestrator.advance_to_next_scene()
+
+    assert next_scene["scene_id"] == "chapel"
+    assert orchestrator.prefetch_stats()["hits"] == 1
+    assert [call[0] for call in retriever.calls].count("medieval church altar") == 1
+
+
+def test_stream_closed_after_the_action_event_still_ends_the_turn(game_data, retriever, agent):
+    orchestrator = _orchestrator(game_data, retriever, agent)
+    orchestrator.start_game("Tester")
+
+    stream = orchestrator.process_player_action_stream(0)
+    assert next(stream)["type"] == "action"
+    stream.close()
+
+    assert orchestrator.current_scene_id == "chapel"
+    assert orchestrator.turn == 1
+    assert orchestrator.scoring_engine.alignment.law_chaos == -5
+
+    events = list(orchestrator.process_player_action_stream(0))
+    assert events[-1]["result"]["action_taken"] == "Pray"
+    assert orchestrator.scoring_engine.alignment.law_chaos == -5
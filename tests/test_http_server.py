@@ -0,0 +1,100 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from rpg_game.agent.completion_cache import CompletionCache
+from rpg_game.server.http_server import create_server
+from rpg_game.server.session_manager import SessionLimitError, SessionManager, UnknownSessionError
+
+
+@pytest.fixture
+def server(tmp_path, game_data, retriever, stub_client):
+    game_data_path = tmp_path / "game_data.json"
+    game_data_path.write_text(json.dumps(game_data))
+    manager = SessionManager(str(game_data_path), llm_client=stub_client, rag_retriever=retriever,
+                             completion_cache=CompletionCache(path=None))
+    server = create_server(manager, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, method, path, body=None):
+    host, port = server.server_address[:2]
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=data, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_session_round_trip(server):
+    status, created = _request(server, "POST", "/sessions", {"player_name": "Tester"})
+    assert status == 201
+    session_id = created["session_id"]
+    status, turn = _request(server, "POST", f"/sessions/{session_id}/actions", {"action_index": 0})
+    assert status == 200
+    assert turn["scene"]["scene_id"] == "chapel"
+
+
+def test_unknown_session_is_404(server):
+    assert _request(server, "GET", "/sessions/missing") == (404, {"error": "Unknown session: missing"})
+    with pytest.raises(UnknownSessionError):
+        server.session_manager.get_scene("missing")
+
+
+def test_internal_key_error_is_500(server):
+    _, created = _request(server, "POST", "/sessions", {"player_name": "Tester"})
+
+    def broken(session_id):
+        raise KeyError("scene_id")
+
+    server.session_manager.get_scene = broken
+    status, body = _request(server, "GET", f"/sessions/{created['session_id']}")
+    assert status == 500
+    assert body == {"error": "Internal server error"}
+
+
+def test_full_server_is_503(server):
+    server.session_manager.max_sessions = 1
+    assert _request(server, "POST", "/sessions", {"player_name": "Tester"})[0] == 201
+
+    assert _request(server, "POST", "/sessions", {"player_name": "Late"}) == (503, {"error": "Too many active sessions"})
+    with pytest.raises(SessionLimitError):
+        server.session_manager.create_session("Late")
+
+
+def test_other_runtime_errors_are_500(server):
+    def broken(player_name):
+        raise RuntimeError("cannot start thread")
+
+    server.session_manager.create_session = broken
+    assert _request(server, "POST", "/sessions", {"player_name": "Tester"}) == (500, {"error": "Internal server error"})
+
+
+def test_out_of_range_action_is_400(server):
+    _, created = _request(server, "POST", "/sessions", {"player_name": "Tester"})
+    session_id = created["session_id"]
+
+    status, body = _request(server, "POST", f"/sessions/{session_id}/actions", {"action_index": 4})
+
+    assert status == 400
+    assert body == {"error": "Bad request: Invalid action index"}
+    assert _request(server, "GET", f"/sessions/{session_id}")[1]["scene_id"] == "gate"
+
+
+def test_sessions_share_action_calls_only_when_coalescing(tmp_path, game_data, retriever, stub_client):
+    game_data_path = tmp_path / "game_data.json"
+    game_data_path.write_text(json.dumps(game_data))
+    for coalesce in (True, False):
+        manager = SessionManager(str(game_data_path), llm_client=stub_client, rag_retriever=retriever,
+                                 completion_cache=CompletionCache(path=None), coalesce=coalesce)
+        agent = manager._new_orchestrator().llm_agent
+        assert (agent.single_flight is not None) == coalesce
@@ -0,0 +1,70 @@
+import json
+
+from rpg_game.config import HISTORICAL_DATA_PATH
+from rpg_game.rag.ingest import StreamingIngestor
+from benchmarks.startup_benchmark import run_launches
+
+
+def _historical_data():
+    with open(HISTORICAL_DATA_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_repeated_launches_do_no_embedding_work(numpy_retriever_factory, encoder):
+    first = numpy_retriever_factory()
+    embedded = len(encoder.texts)
+    assert len(first.documents) == len(_historical_data())
+
+    second = numpy_retriever_factory()
+
+    assert len(second.documents) == len(first.documents)
+    assert len(encoder.texts) == embedded
+
+
+def test_sync_upserts_changed_and_deletes_removed_documents(numpy_retriever_factory, encoder):
+    retriever = numpy_retriever_factory()
+    documents = _historical_data()
+    changed = dict(documents[0], tags=documents[0]["tags"] + ["extra"])
+    embedded = len(encoder.texts)
+
+    summary = retriever.sync_documents([changed] + documents[2:], source="historical_data.json")
+
+    assert summary == {"added": 0, "updated": 1, "unchanged": len(documents) - 2, "deleted": 1}
+    assert len(retriever.documents) == len(documents) - 1
+    # Tags are not embedded, so the update needs no embedding
+    assert len(encoder.texts) == embedded
+
+
+def test_adding_the_same_documents_twice_creates_no_duplicates(numpy_retriever_factory):
+    retriever = numpy_retriever_factory()
+    corpus = [{"title": "Tithes", "text": "A tenth of the harvest went to the church.", "tags": ["religion"]}]
+
+    assert retriever.add_documents(corpus, source="extra")["added"] == 1
+    assert retriever.add_documents(corpus * 2, source="extra")["unchanged"] == 1
+    assert len(retriever.documents) == len(_historical_data()) + 1
+
+
+def test_startup_benchmark_stays_flat(tmp_path):
+    launches = run_launches("numpy", 3, str(tmp_path), encoder="synthetic")
+
+    assert len({launch["documents"] for launch in launches}) == 1
+    assert [launch["embedded"] for launch in launches[1:]] == [0, 0]
+
+
+def test_streamed_jsonl_corpus_is_ingested_once(tmp_path, numpy_retriever_factory, encoder):
+    retriever = numpy_retriever_factory()
+    corpus = [{"title": f"Charter {i}", "text": f"Charter {i} granted a market to the town.", "tags": ["trade"]}
+              for i in range(5)]
+    corpus_path = tmp_path / "corpus.jsonl"
+    lines = [json.dumps(doc) for doc in corpus] + ["", json.dumps({"title": "No text"})]
+    corpus_path.write_text("\n".join(lines) + "\n")
+    ingestor = StreamingIngestor(retriever, batch_size=2)
+
+    first = ingestor.ingest(str(corpus_path), source="corpus.jsonl")
+    assert (first["documents"], first["batches"], first["added"]) == (5, 3, 5)
+    embedded = len(encoder.texts)
+
+    second = ingestor.ingest(str(corpus_path), source="corpus.jsonl")
+    assert (second["added"], second["updated"], second["unchanged"]) == (0, 0, 5)
+    assert len(retriever.documents) == len(_historical_data()) + 5
+    assert len(encoder.texts) == embedded
@@ -0,0 +1,87 @@
+import time
+import threading
+
+import pytest
+
+from rpg_game.concurrency.micro_batcher import MicroBatcher
+
+
+class RecordingFn:
+    """Batched function that doubles its items and records each batch"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(sorted(items))
+        if self.error is not None:
+            raise self.error
+        return [item * 2 for item in items]
+
+
+def _submit_concurrently(batcher, items):
+    """Submit each item from its own thread; returns each item's result or raised error"""
+    outcomes = {}
+    start = threading.Barrier(len(items))
+
+    def call(item):
+        start.wait()
+        try:
+            outcomes[item] = batcher.submit(item)
+        except Exception as e:
+            outcomes[item] = e
+
+    threads = [threading.Thread(target=call, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_full_batch_runs_without_waiting_for_the_window():
+    fn = RecordingFn()
+    batcher = MicroBatcher(fn, max_batch=3, window=30.0)
+
+    started = time.monotonic()
+    outcomes = _submit_concurrently(batcher, [1, 2, 3])
+
+    assert time.monotonic() - started < 5
+    assert outcomes == {1: 2, 2: 4, 3: 6}
+    assert fn.batches == [[1, 2, 3]]
+    assert batcher.stats() == {"batches": 1, "items": 3, "mean_batch_size": 3.0}
+
+
+def test_partial_batch_runs_when_the_window_closes():
+    fn = RecordingFn()
+    batcher = MicroBatcher(fn, max_batch=10, window=0.5)
+
+    started = time.monotonic()
+    outcomes = _submit_concurrently(batcher, [1, 2])
+
+    assert time.monotonic() - started >= 0.5
+    assert outcomes == {1: 2, 2: 4}
+    assert fn.batches == [[1, 2]]
+
+    started = time.monotonic()
+    assert batcher.submit(5) == 10
+    assert time.monotonic() - started >= 0.5
+    assert batcher.stats()["batches"] == 2
+
+
+@pytest.mark.parametrize("fn, error_type", [
+    (RecordingFn(RuntimeError("backend down")), RuntimeError),
+    # Too few results is a failure of the whole batch too
+    (lambda items: items[:1], ValueError),
+])
+def test_batch_failure_reaches_every_caller(fn, error_type):
+    batcher = MicroBatcher(fn, max_batch=3, window=30.0)
+
+    outcomes = _submit_concurrently(batcher, [1, 2, 3])
+
+    errors = list(outcomes.values())
+    assert len(errors) == 3
+    assert all(isinstance(error, error_type) for error in errors)
+    # Every caller sees the one error the batch raised
+    assert errors[0] is errors[1] is errors[2]
@@ -0,0 +1,106 @@
+import numpy as np
+
+from rpg_game.rag.numpy_retriever import NumpyRetriever
+
+QUERIES = [
+    ("medieval church bells, 13th century England", 3, ["religion", "village"]),
+    ("knights and their training", 2, None),
+    ("forest folklore", 5, ["nature"]),
+    ("no document carries this tag", 3, ["missing"]),
+]
+
+
+def _exact_top_k(retriever: NumpyRetriever, encoder, query: str, top_k: int, filter_tags):
+    """Brute-force cosine ranking over the documents carrying any of the tags"""
+    vector = np.asarray(encoder._encoder.embed_documents([query])[0], dtype=np.float32)
+    vector /= np.linalg.norm(vector)
+    rows = [row for row, doc in enumerate(retriever.documents)
+            if not filter_tags or set(doc["tags"]) & set(filter_tags)]
+    if not rows:
+        rows = list(range(len(retriever.documents)))
+        top_k = 1
+    scores = np.asarray(retriever.matrix)[rows] @ vector
+    return [retriever.documents[rows[i]]["title"] for i in np.argsort(-scores)[:top_k]]
+
+
+def test_top_k_matches_brute_force(numpy_retriever_factory, encoder):
+    retriever = numpy_retriever_factory()
+
+    for query, top_k, filter_tags in QUERIES:
+        titles = [doc["title"] for doc in retriever.retrieve(query, top_k=top_k, filter_tags=filter_tags)]
+        assert titles == _exact_top_k(retriever, encoder, query, top_k, filter_tags), query
+
+
+def test_batched_retrieval_matches_single_queries(numpy_retriever_factory):
+    retriever = numpy_retriever_factory()
+
+    batched = retriever.retrieve_many(QUERIES)
+
+    assert batched == [retriever.retrieve_many([request])[0] for request in QUERIES]
+
+
+def test_ivf_probing_every_cell_is_exact(numpy_retriever_factory, encoder):
+    exact = numpy_retriever_factory()
+    filler = [{"title": f"Chronicle {i}", "text": f"Entry {i} of the parish chronicle.", "tags": ["village"]}
+              for i in range(200)]
+    exact.add_documents(filler, source="filler")
+
+    ivf = numpy_retriever_factory(ann_min_corpus_size=100, nprobe=1000)
+
+    assert ivf.ivf is not None and exact.ivf is None
+    for query, top_k, filter_tags in QUERIES:
+        assert ivf.retrieve(query, top_k, filter_tags) == exact.retrieve(query, top_k, filter_tags), query
+
+
+def test_index_is_memory_mapped_after_reload(numpy_retriever_factory):
+    numpy_retriever_factory()
+
+    reloaded = numpy_retriever_factory()
+
+    assert isinstance(reloaded.matrix, np.memmap)
+    assert reloaded.matrix.dtype == np.float32
+
+
+def _titles(retriever: NumpyRetriever, rows) -> list:
+    return [retriever.documents[row]["title"] for row in rows]
+
+
+def test_vector_mode_builds_no_bm25_index(numpy_retriever_factory, tmp_path):
+    retriever = numpy_retriever_factory(mode="vector")
+
+    for query, top_k, filter_tags in QUERIES:
+        retriever.retrieve(query, top_k, filter_tags)
+
+    assert retriever._bm25 is None
+    assert not (tmp_path / "index" / "bm25").exists()
+
+
+def test_lexical_mode_ranks_by_bm25_without_embedding(numpy_retriever_factory, encoder):
+    retriever = numpy_retriever_factory(mode="lexical")
+    embedded = len(encoder.texts)
+
+    titles = [doc["title"] for doc in retriever.retrieve("knights and their training", top_k=2)]
+    fallback = [doc["title"] for doc in retriever.retrieve("knights training", top_k=3, filter_tags=["missing"])]
+
+    assert titles == _titles(retriever, retriever.bm25.search("knights and their training", 2))
+    assert fallback == _titles(retriever, retriever.bm25.search("knights training", 1))
+    assert len(encoder.texts) == embedded
+
+
+def test_hybrid_mode_fuses_vector_and_bm25_rankings(numpy_retriever_factory, encoder):
+    from rpg_game.config import RAG_FUSION_CANDIDATES, RAG_RRF_K
+    from rpg_game.rag.bm25_index import reciprocal_rank_fusion
+
+    retriever = numpy_retriever_factory(mode="hybrid")
+    query, top_k = "knights and their training", 3
+    pool_size = max(top_k, RAG_FUSION_CANDIDATES)
+    vector = np.asarray(encoder._encoder.embed_documents([query])[0], dtype=np.float32)
+    vector_rows = np.argsort(-(np.asarray(retriever.matrix) @ (vector / np.linalg.norm(vector))))[:pool_size]
+    lexical_rows = retriever.bm25.search(query, pool_size)
+    expected = reciprocal_rank_fusion([vector_rows.tolist(), lexical_rows.tolist()], RAG_RRF_K)[:top_k]
+
+    titles = [doc["title"] for doc in retriever.retrieve(query, top_k=top_k)]
+    fallback = [doc["title"] for doc in retriever.retrieve("knights training", top_k=3, filter_tags=["missing"])]
+
+    assert titles == _titles(retriever, expected)
+    assert fallback == _titles(retriever, retriever.bm25.search("knights training", 1))
@@ -0,0 +1,53 @@
+import threading
+
+from rpg_game.config import PREFETCH_WORKERS
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.orchestrator.prefetch import ScenePrefetcher
+
+
+def test_prefetchers_share_one_bounded_pool():
+    def render(key, snapshot):
+        return threading.current_thread().name
+
+    prefetchers = [ScenePrefetcher(render) for _ in range(10)]
+    for prefetcher in prefetchers:
+        prefetcher.speculate(["a", "b", "c"])
+
+    threads = {prefetcher.take(key) for prefetcher in prefetchers for key in ("a", "b", "c")}
+    assert all(name.startswith("scene-prefetch") for name in threads)
+    assert len(threads) <= PREFETCH_WORKERS
+
+
+def test_render_reads_the_snapshot_taken_when_speculation_starts():
+    snapshot = {"mood": "calm"}
+    prefetcher = ScenePrefetcher(lambda key, state: (key, dict(state)))
+    prefetcher.speculate(["chapel"], snapshot)
+
+    assert prefetcher.take("chapel") == ("chapel", {"mood": "calm"})
+
+
+def test_speculative_render_does_not_see_the_companion_change(game_data, retriever, agent):
+    del game_data["scenes"]["chapel"]["actions"]
+    release = threading.Event()
+    contexts = []
+    generate = agent.generate_action_choices
+
+    def gated(**kwargs):
+        if kwargs["scene_context"]["location"] == "Village Chapel":
+            release.wait(5)
+            contexts.append(kwargs["agent_context"])
+        return generate(**kwargs)
+
+    agent.generate_action_choices = gated
+    orchestrator = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data,
+                                    speculative_prefetch=True)
+    orchestrator.start_game("Tester")
+    # The chapel render is now waiting; the companion's memory changes under it
+    orchestrator.behavior_controller.memory.recent_actions.append("Drew a sword")
+    orchestrator.behavior_controller.memory.mood = "angry"
+    release.set()
+
+    orchestrator.prefetcher.take(("chapel", "morning"))
+
+    assert "Drew a sword" not in contexts[0]["recent_actions"]
+    assert contexts[0]["mood"] != "angry"
@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import pytest
+
+from rpg_game.agent.prompt_builder import PromptBuilder, estimate_tokens, truncate_to_tokens
+from rpg_game.behavior.controller import BehaviorController
+
+SCENE_CONTEXT = {"description": "A guard blocks the village gate.", "location": "Village Gate",
+                 "time_of_day": "morning"}
+PLAYER_MESSAGE = "I ask the guard to let us through"
+
+
+def _passage(i, sentences=30):
+    text = " ".join(f"In the year {1300 + i} the reeve of the manor collected tithe number {n}." for n in range(sentences))
+    return {"title": f"Manor record {i}", "text": text, "tags": ["village"]}
+
+
+def _history(count, words=40):
+    return [SimpleNamespace(role="user" if i % 2 == 0 else "assistant",
+                            content=f"Message {i}: " + " ".join(["word"] * words)) for i in range(count)]
+
+
+def _prompt_tokens(system_prompt, messages):
+    return (estimate_tokens(system_prompt) + sum(estimate_tokens(message.content) for message in messages)
+            + estimate_tokens(PLAYER_MESSAGE))
+
+
+@pytest.mark.parametrize("budget", [300, 600, 1200])
+def test_reply_prompt_stays_within_the_budget(budget):
+    builder = PromptBuilder(budget=budget, history_messages=10)
+    agent_context = BehaviorController().get_prompt_context()
+
+    system_prompt, messages = builder.response_prompt(agent_context, SCENE_CONTEXT, [_passage(i) for i in range(5)],
+                                                      _history(30), PLAYER_MESSAGE)
+
+    assert _prompt_tokens(system_prompt, messages) <= budget
+    # Both variable sections still get a share
+    assert "Historical context:" in system_prompt
+    assert messages
+
+
+@pytest.mark.parametrize("budget", [250, 800])
+def test_action_prompt_stays_within_the_budget(budget):
+    builder = PromptBuilder(action_budget=budget)
+
+    system_prompt = builder.action_prompt(SCENE_CONTEXT, [_passage(i) for i in range(5)])
+
+    assert estimate_tokens(system_prompt) <= budget
+    assert "Manor record 0" in system_prompt
+
+
+def test_fixed_segments_are_never_trimmed():
+    builder = PromptBuilder(budget=10)
+    agent_context = BehaviorController().get_prompt_context()
+
+    system_prompt, messages = builder.response_prompt(agent_context, SCENE_CONTEXT, [_passage(0)], _history(4),
+                                                      PLAYER_MESSAGE, summary="We crossed the river together.")
+
+    assert system_prompt.startswith(builder.persona_prefix(agent_context)[0])
+    assert SCENE_CONTEXT["description"] in system_prompt
+    assert "We crossed the river together." in system_prompt
+    # The variable sections are what gives way
+    assert "Historical context:" not in system_prompt
+    assert messages == []
+
+
+def test_history_keeps_its_reserved_half_before_passages():
+    builder = PromptBuilder(budget=700, history_messages=10)
+    agent_context = BehaviorController().get_prompt_context()
+    history = _history(10)
+
+    system_prompt, messages = builder.response_prompt(agent_context, SCENE_CONTEXT,
+                                                      [_passage(i) for i in range(5)], history, PLAYER_MESSAGE)
+
+    fixed = _prompt_tokens(builder.response_prompt(agent_context, SCENE_CONTEXT, [], [], PLAYER_MESSAGE)[0], [])
+    available = builder.budget - fixed
+    history_tokens = sum(estimate_tokens(message.content) for message in messages)
+    # Whole messages up to half of the room left; the passages take the rest
+    assert available // 2 - estimate_tokens(history[-1].content) < history_tokens <= available // 2
+    # Newest messages are kept, oldest dropped, with no gaps
+    assert messages == history[-len(messages):]
+
+
+def test_passages_give_unused_room_back_to_the_history():
+    builder = PromptBuilder(budget=700, history_messages=10)
+    agent_context = BehaviorController().get_prompt_context()
+    history = _history(10)
+
+    _, with_passages = builder.response_prompt(agent_context, SCENE_CONTEXT, [_passage(0, sentences=1)], history,
+                                               PLAYER_MESSAGE)
+    _, without_passages = builder.response_prompt(agent_context, SCENE_CONTEXT, [], history, PLAYER_MESSAGE)
+
+    assert len(with_passages) > 5
+    assert len(without_passages) >= len(with_passages)
+
+
+def test_passages_are_cut_to_sentences_in_order_then_dropped():
+    builder = PromptBuilder(action_budget=260, min_passage_tokens=24)
+    passages = [_passage(i, sentences=8) for i in range(4)]
+
+    system_prompt = builder.action_prompt(SCENE_CONTEXT, passages)
+
+    lines = system_prompt.split("Historical context:\n")[1].splitlines()
+    titles = [line.split(":")[0] for line in lines]
+    # Earlier (more relevant) passages are kept whole; the last one that fits is cut, later ones dropped
+    assert titles == [f"- Manor record {i}" for i in range(len(lines))]
+    assert lines[0] == f"- {passages[0]['title']}: {passages[0]['text']}"
+    cut = lines[-1].split(": ", 1)[1]
+    assert cut != passages[len(lines) - 1]["text"] and passages[len(lines) - 1]["text"].startswith(cut)
+    assert cut.endswith(".")
+    assert "Manor record 3" not in system_prompt
+
+
+def test_truncate_falls_back_to_a_token_cut():
+    text = "An unbroken run of words with no sentence end at all in sight"
+
+    assert truncate_to_tokens("Short. Text.", 10) == "Short. Text."
+    assert truncate_to_tokens(text, 5) == "An unbroken run of…"
+    assert truncate_to_tokens(text, 0) == ""
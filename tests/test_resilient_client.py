@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from rpg_game.agent.resilient_client import (
+    AsyncResilientClient, CircuitBreaker, LLMUnavailableError, ResilientClient
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class ScriptedClient:
+    """Client whose create calls raise the scripted errors in order, then succeed"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))])
+
+
+class AsyncScriptedClient(ScriptedClient):
+    """Async counterpart of ScriptedClient"""
+
+    async def create(self, **kwargs):
+        return ScriptedClient.create(self, **kwargs)
+
+
+async def _no_sleep(seconds):
+    pass
+
+
+def _resilient(client, reset_after=0.0):
+    return ResilientClient(client, max_retries=0, breaker=CircuitBreaker(threshold=1, reset_after=reset_after),
+                           sleep=lambda seconds: None)
+
+
+def _call(resilient):
+    return resilient.chat.completions.create(messages=[], model="test")
+
+
+def test_outage_opens_the_circuit():
+    client = ScriptedClient(StatusError(503))
+    resilient = _resilient(client, reset_after=60.0)
+    with pytest.raises(LLMUnavailableError):
+        _call(resilient)
+    assert resilient.breaker.state == "open"
+    with pytest.raises(LLMUnavailableError):
+        _call(resilient)
+    assert client.calls == 1
+
+
+def test_client_error_on_a_half_open_trial_closes_the_circuit():
+    client = ScriptedClient(StatusError(503), StatusError(400))
+    resilient = _resilient(client)
+    with pytest.raises(LLMUnavailableError):
+        _call(resilient)
+    assert resilient.breaker.state == "half_open"
+
+    with pytest.raises(LLMUnavailableError):
+        _call(resilient)
+    assert resilient.breaker.state == "closed"
+    assert _call(resilient).choices[0].message.content == "ok"
+    assert client.calls == 3
+
+
+def test_outage_on_a_half_open_trial_reopens_the_circuit():
+    client = ScriptedClient(StatusError(503), StatusError(503))
+    resilient = _resilient(client)
+    with pytest.raises(LLMUnavailableError):
+        _call(resilient)
+    with pytest.raises(LLMUnavailableError):
+        _call(resilient)
+    assert resilient.breaker.trips == 1
+    assert _call(resilient).choices[0].message.content == "ok"
+
+
+@pytest.mark.parametrize("status_code, calls", [(503, 2), (400, 1)])
+def test_async_client_retries_only_retryable_errors(status_code, calls):
+    client = AsyncScriptedClient(StatusError(status_code))
+    resilient = AsyncResilientClient(client, max_retries=1, breaker=CircuitBreaker(threshold=5), sleep=_no_sleep)
+
+    async def call():
+        return await resilient.chat.completions.create(messages=[], model="test")
+
+    if status_code == 503:
+        assert asyncio.run(call()).choices[0].message.content == "ok"
+    else:
+        with pytest.raises(LLMUnavailableError):
+            asyncio.run(call())
+    assert client.calls == calls
+    assert resilient.stats()["retries"] == calls - 1
+    assert resilient.breaker.state == "closed"
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from rpg_game.orchestrator import scene_context
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.orchestrator.scene_context import build_scene_contexts, load_scene_contexts
+from rpg_game.orchestrator.scene_graph import load_scene_graph
+
+GATE = ("gate", "morning")
+
+
+class BakingRetriever:
+    """Retriever used at build time, whose passages are told apart from live ones"""
+
+    def retrieve(self, query, top_k=3, filter_tags=None):
+        return [{"title": "Baked", "text": f"Baked facts about {query}.", "tags": list(filter_tags or [])}]
+
+
+@pytest.fixture
+def baked(tmp_path, monkeypatch, game_data):
+    """Game data and corpus files with their scene contexts baked"""
+    game_data_path = tmp_path / "game_data.json"
+    game_data_path.write_text(json.dumps(game_data))
+    corpus_path = tmp_path / "historical_data.json"
+    corpus_path.write_text(json.dumps([{"title": "Gate", "text": "Guards kept the gate."}]))
+    monkeypatch.setattr(scene_context, "HISTORICAL_DATA_PATH", str(corpus_path))
+    cache_dir = str(tmp_path / "cache")
+    build_scene_contexts(str(game_data_path), cache_dir, retriever=BakingRetriever())
+    return game_data_path, corpus_path, cache_dir
+
+
+def _game(baked, retriever, agent):
+    game_data_path, corpus_path, cache_dir = baked
+    graph = load_scene_graph(str(game_data_path), cache_dir=None)
+    graph.contexts = load_scene_contexts(str(game_data_path), str(corpus_path), cache_dir)
+    return GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=graph, speculative_prefetch=False)
+
+
+def test_baked_context_is_served_without_retrieval(baked, retriever, agent):
+    historical_context, _ = _game(baked, retriever, agent)._prepare_scene(GATE)
+
+    assert [passage["title"] for passage in historical_context] == ["Baked"]
+    assert retriever.calls == []
+
+
+def test_changed_scene_query_is_retrieved_live(baked, retriever, agent):
+    game = _game(baked, retriever, agent)
+    game.scenes["gate"]["rag_context_query"] = "medieval town walls"
+
+    historical_context, _ = game._prepare_scene(GATE)
+
+    assert retriever.calls == [("medieval town walls", 3, ["village", "law"])]
+    assert [passage["title"] for passage in historical_context] == ["About medieval town walls"]
+    # The other scene still uses its baked entry
+    assert [passage["title"] for passage in game._prepare_scene(("chapel", "morning"))[0]] == ["Baked"]
+
+
+def test_changed_game_data_discards_the_baked_contexts(baked, retriever, agent, game_data):
+    game_data_path, _, _ = baked
+    game_data["scenes"]["gate"]["description"] = "The gate stands open."
+    game_data_path.write_text(json.dumps(game_data))
+
+    historical_context, _ = _game(baked, retriever, agent)._prepare_scene(GATE)
+
+    assert retriever.calls == [("medieval village gate, guards", 3, ["village", "law"])]
+    assert historical_context[0]["title"] != "Baked"
+
+
+def test_changed_corpus_discards_the_baked_contexts(baked, retriever, agent):
+    _, corpus_path, _ = baked
+    corpus_path.write_text(json.dumps([{"title": "Gate", "text": "The gate was rebuilt in stone."}]))
+
+    game = _game(baked, retriever, agent)
+    historical_context, _ = game._prepare_scene(GATE)
+
+    assert game.scene_graph.contexts == {}
+    assert retriever.calls == [("medieval village gate, guards", 3, ["village", "law"])]
+    assert historical_context[0]["title"] != "Baked"
@@ -0,0 +1,56 @@
+import json
+
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from rpg_game.orchestrator.scene_graph import compile_scene_graph, load_scene_graph
+
+
+def test_start_is_the_starting_scene(game_data):
+    graph = compile_scene_graph(game_data)
+    assert graph.start == "gate"
+    assert graph.problems == []
+
+
+def test_missing_starting_scene_falls_back_to_the_first_scene(game_data, retriever, agent):
+    game_data["starting_scene"] = "moat"
+    graph = compile_scene_graph(game_data)
+    assert graph.start == "gate"
+    assert graph.problems == ["Starting scene 'moat' is missing"]
+
+    game = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=graph, speculative_prefetch=False)
+    assert game.start_game("Tester")["scene_id"] == "gate"
+
+
+def test_unset_starting_scene_falls_back_to_the_first_scene(game_data):
+    del game_data["starting_scene"]
+    assert compile_scene_graph(game_data).start == "gate"
+
+
+def test_cached_graph_matches_the_compiled_one(tmp_path, game_data):
+    game_data_path = tmp_path / "game_data.json"
+    game_data_path.write_text(json.dumps(game_data))
+    cache_dir = str(tmp_path / "cache")
+
+    compiled = load_scene_graph(str(game_data_path), cache_dir=cache_dir)
+    cached = load_scene_graph(str(game_data_path), cache_dir=cache_dir)
+    assert cached is not compiled
+    assert (cached.start, cached.by_key, cached.problems) == (compiled.start, compiled.by_key, compiled.problems)
+
+
+def test_reentering_a_visited_scene_records_nothing(game_data, retriever, agent):
+    game = GameOrchestrator(rag_retriever=retriever, llm_agent=agent, game_data=game_data, speculative_prefetch=False)
+    events = []
+    emit = game._emit
+
+    def recording(event_type, **data):
+        events.append(event_type)
+        return emit(event_type, **data)
+
+    game._emit = recording
+    game.start_game("Tester")
+    # A visited scene is found through the bitset, even if the save-file list is out of sync
+    game.game_state["visited_scenes"] = []
+    game._scene_cache.clear()
+    game.get_current_scene()
+
+    assert events.count("scene_entered") == 1
+    assert game._visited == game.scene_graph.bit("gate")
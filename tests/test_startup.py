@@ -0,0 +1,32 @@
+import json
+import subprocess
+import sys
+
+from rpg_game.orchestrator.game_orchestrator import GameOrchestrator
+from benchmarks.launch_benchmark import (
+    HEAVY_MODULES, ORCHESTRATOR_MODULE, measure_launch, parse_importtime
+)
+
+
+def test_importing_the_orchestrator_skips_heavy_dependencies():
+    script = f"import sys, json, {ORCHESTRATOR_MODULE}; print(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    loaded = set(json.loads(completed.stdout))
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_orchestrator_builds_its_retriever_on_first_use(game_data, agent):
+    game = GameOrchestrator(llm_agent=agent, game_data=game_data, speculative_prefetch=False)
+    assert game._rag_retriever is None
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   json.decoder\n"
+              "import time:       300 |        420 | json\n")
+    assert parse_importtime(stderr) == [("json.decoder", 120, 120), ("json", 300, 420)]
+
+
+def test_launch_renders_the_first_scene(tmp_path):
+    launch = measure_launch("numpy", "synthetic", str(tmp_path / "index"), "./data/game_data.json")
+    assert launch["first_scene_seconds"] >= launch["import_seconds"] > 0
@@ -0,0 +1,140 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from rpg_game.config import HISTORICAL_DATA_PATH
+from rpg_game.rag.documents import document_id
+from benchmarks.filter_benchmark import run_scenes, scene_queries
+from rpg_game.rag.tag_index import TagIndex, tag_filter, tag_metadata, tags_from_metadata
+
+
+def _historical_index() -> TagIndex:
+    index = TagIndex()
+    with open(HISTORICAL_DATA_PATH, 'r', encoding='utf-8') as f:
+        for doc in json.load(f):
+            index.add(document_id(doc), doc["tags"])
+    return index
+
+
+def test_candidates_match_any_tag_and_follow_updates():
+    index = TagIndex()
+    index.add("a", ["religion", "village"])
+    index.add("b", ["village"])
+    index.add("c", ["nature"])
+
+    assert index.candidates(["village"]) == {"a", "b"}
+    assert index.candidates(["religion", "nature"]) == {"a", "c"}
+    assert index.candidates(["unknown"]) == set()
+
+    index.add("a", ["nature"])
+    index.remove("c")
+    assert index.candidates(["religion"]) == set()
+    assert index.candidates(["nature"]) == {"a"}
+    assert index.tags() == ["nature", "village"]
+
+
+def test_tags_round_trip_through_metadata():
+    metadata = {"tags": "religion,village", **tag_metadata(["religion", "village"])}
+
+    assert tags_from_metadata(metadata) == ["religion", "village"]
+    assert metadata["tag_religion"] is True
+
+
+def test_tag_filter_is_a_chroma_where_clause():
+    assert tag_filter([]) is None
+    assert tag_filter(["religion"]) == {"tag_religion": True}
+    assert tag_filter(["religion", "village"]) == {"$or": [{"tag_religion": True}, {"tag_village": True}]}
+
+
+def test_every_scene_filter_resolves_to_candidates():
+    index = _historical_index()
+
+    for scene in scene_queries("./data/game_data.json"):
+        assert index.candidates(scene["filter_tags"]), scene["scene_id"]
+
+
+def test_every_scene_is_retrieved_without_the_fallback(numpy_retriever_factory):
+    retriever = numpy_retriever_factory()
+
+    rows = run_scenes(retriever, scene_queries("./data/game_data.json"), repeats=1)
+
+    assert rows and all(row["tags_matched"] for row in rows)
+
+
+@pytest.mark.parametrize("ann_min_corpus_size", [5000, 10])
+def test_filtered_search_scores_only_tagged_rows(numpy_retriever_factory, encoder, ann_min_corpus_size):
+    retriever = numpy_retriever_factory(ann_min_corpus_size=ann_min_corpus_size)
+    requests = [("bell tower of the church", 3, ["religion"]), ("bell tower of the church", 3, None),
+                ("village market", 2, ["religion", "trade"])]
+
+    results = retriever.retrieve_many(requests)
+
+    for (query, top_k, filter_tags), found in zip(requests, results):
+        assert len(found) == top_k
+        if filter_tags:
+            assert all(set(doc["tags"]) & set(filter_tags) for doc in found)
+    if retriever.ivf is None:
+        # Without the IVF index narrowing is exact: same rows as scoring the whole matrix
+        query_vector = np.asarray(encoder.embed_query("bell tower of the church"), dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector)
+        tagged = retriever._tag_subset(["religion"]).rows
+        best = tagged[np.argsort(-(np.asarray(retriever.matrix) @ query_vector)[tagged])[:3]]
+        assert [doc["title"] for doc in results[0]] == [retriever.documents[row]["title"] for row in best]
+
+
+class FakeCollection:
+    """Chroma collection that answers queries by evaluating the where clause on stored metadata"""
+
+    def __init__(self, documents):
+        self.stored = {document_id(doc): (doc["text"], {"title": doc["title"], "tags": ",".join(doc["tags"]),
+                                                        **tag_metadata(doc["tags"])})
+                       for doc in documents}
+        self.wheres = []
+
+    @staticmethod
+    def _matches(metadata, where):
+        if where is None:
+            return True
+        if "$or" in where:
+            return any(FakeCollection._matches(metadata, clause) for clause in where["$or"])
+        return all(metadata.get(key) == value for key, value in where.items())
+
+    def query(self, query_embeddings, n_results, where=None, include=None):
+        self.wheres.append(where)
+        hits = [(doc_id, text, metadata) for doc_id, (text, metadata) in self.stored.items()
+                if self._matches(metadata, where)][:n_results]
+        return {"ids": [[hit[0] for hit in hits]], "documents": [[hit[1] for hit in hits]],
+                "metadatas": [[hit[2] for hit in hits]]}
+
+
+def test_chroma_search_passes_the_tag_filter_as_a_where_clause():
+    retriever_module = pytest.importorskip("rpg_game.rag.retriever")
+    documents = [
+        {"title": "Tithes", "text": "A tenth of the harvest went to the church.", "tags": ["religion"]},
+        {"title": "Fairs", "text": "Merchants came to the village fair.", "tags": ["trade", "village"]},
+        {"title": "Bells", "text": "The bell called the village to mass.", "tags": ["religion", "village"]},
+    ]
+    retriever = object.__new__(retriever_module.RAGRetriever)
+    retriever.mode = "vector"
+    retriever.vectordb = SimpleNamespace(_collection=FakeCollection(documents))
+    retriever.query_batcher = SimpleNamespace(submit=lambda query: [0.0])
+    retriever.tag_index = TagIndex()
+    for doc in documents:
+        retriever.tag_index.add(document_id(doc), doc["tags"])
+
+    religion = retriever.retrieve("church", top_k=3, filter_tags=["religion"])
+    either = retriever.retrieve("fair", top_k=3, filter_tags=["trade", "religion"])
+    nothing = retriever.retrieve("castle", top_k=3, filter_tags=["castle"])
+
+    assert retriever.vectordb._collection.wheres == [
+        {"tag_religion": True},
+        {"$or": [{"tag_trade": True}, {"tag_religion": True}]},
+        # An unmatched filter skips the filtered search and falls back to the nearest vector
+        None,
+    ]
+    assert [doc["title"] for doc in religion] == ["Tithes", "Bells"]
+    assert [doc["title"] for doc in either] == ["Tithes", "Fairs", "Bells"]
+    assert religion[1]["tags"] == ["religion", "village"]
+    assert len(nothing) == 1
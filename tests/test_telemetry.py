@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from rpg_game.telemetry import telemetry as telemetry_module
+from rpg_game.telemetry.telemetry import InMemoryExporter, PrometheusTextExporter, Telemetry, log
+
+
+@pytest.fixture
+def recorder():
+    recorder = Telemetry(enabled=True, log_level="info", buckets=(0.001, 0.1))
+    recorder.exporters.append(InMemoryExporter())
+    return recorder
+
+
+def _spans(recorder):
+    return {span["name"]: span for span in recorder.exporters[0].spans}
+
+
+def test_spans_are_timed_and_nested(recorder):
+    with recorder.span("turn"):
+        with recorder.span("scene.retrieve", scene_id="gate") as span:
+            time.sleep(0.02)
+            span.set("documents", 3)
+
+    spans = _spans(recorder)
+    inner, outer = spans["scene.retrieve"], spans["turn"]
+    assert (inner["parent"], outer["parent"]) == ("turn", None)
+    assert inner["attributes"] == {"scene_id": "gate", "documents": 3}
+    assert 0.02 <= inner["duration"] <= outer["duration"]
+    assert outer["start"] <= inner["start"]
+
+    histograms = recorder.snapshot()["histograms"]
+    assert histograms["span_duration_seconds{span=scene.retrieve}"]["count"] == 1
+    assert histograms["span_duration_seconds{span=scene.retrieve}"]["sum"] == inner["duration"]
+    # 0.02s lands in the 0.1 bucket, not the 0.001 one
+    text = recorder.prometheus_text()
+    assert 'rpg_span_duration_seconds_bucket{span="scene.retrieve",le="0.001"} 0' in text
+    assert 'rpg_span_duration_seconds_bucket{span="scene.retrieve",le="0.1"} 1' in text
+
+
+def test_failed_span_records_the_error_and_reraises(recorder):
+    with pytest.raises(ValueError):
+        with recorder.span("llm.call", kind="actions"):
+            raise ValueError("bad reply")
+    with recorder.span("after"):
+        pass
+
+    spans = _spans(recorder)
+    assert spans["llm.call"]["attributes"] == {"kind": "actions", "error": "ValueError"}
+    # The failed span was popped, so the next one is not its child
+    assert spans["after"]["parent"] is None
+
+
+def test_counters_add_up_per_label_set(recorder, tmp_path):
+    recorder.count("scene_renders", source="prefetch")
+    recorder.count("scene_renders", source="prefetch")
+    recorder.count("scene_renders", 3, source="render")
+
+    assert recorder.snapshot()["counters"] == {
+        "scene_renders{source=prefetch}": 2, "scene_renders{source=render}": 3
+    }
+
+    path = tmp_path / "metrics.prom"
+    recorder.exporters.append(PrometheusTextExporter(str(path)))
+    recorder.flush()
+    text = path.read_text()
+    assert "# TYPE rpg_scene_renders_total counter" in text
+    assert 'rpg_scene_renders_total{source="render"} 3' in text
+
+    recorder.reset()
+    assert recorder.snapshot() == {"counters": {}, "histograms": {}}
+
+
+def test_disabled_telemetry_records_nothing():
+    recorder = Telemetry(enabled=False)
+    recorder.exporters.append(InMemoryExporter())
+
+    with recorder.span("turn") as span:
+        span.set("ignored", True)
+    recorder.count("scene_renders")
+
+    assert recorder.snapshot() == {"counters": {}, "histograms": {}}
+    assert list(recorder.exporters[0].spans) == []
+
+
+def test_log_prints_only_enabled_levels(recorder, capsys, monkeypatch):
+    recorder.log("retrieving", "debug")
+    recorder.log("loaded index")
+    recorder.set_log_level("WARNING")
+    recorder.log("still loading", "info")
+    recorder.log("slow retrieval", "warning")
+    recorder.log("retrieval failed", "error")
+    recorder.set_log_level("off")
+    recorder.log("silenced", "error")
+
+    assert capsys.readouterr().out.splitlines() == ["loaded index", "slow retrieval", "retrieval failed"]
+
+    # The module-level log() goes through the process-wide instance
+    monkeypatch.setattr(telemetry_module.telemetry, "log_level", telemetry_module.LOG_LEVELS["error"])
+    log("hidden", "warning")
+    log("shown", "error")
+    assert capsys.readouterr().out.splitlines() == ["shown"]